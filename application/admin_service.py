@@ -6,18 +6,22 @@ operations. Each service is its own class so handlers receive exactly
 the dependency they need and tests can mock precisely.
 
 Services here:
-  GetCategorizedProjectsService – full master report data
+  GetCategorizedProjectsService – master report page + category counts
   GetPendingProjectsService     – projects awaiting review
   GetOngoingProjectsService     – accepted + awaiting-verification projects
   GetProjectHistoryService      – finished / denied projects
   GetAllPaymentsService         – all payment records (for history view)
+
+The list services also expose ``execute_page(after=, before=)``, which
+returns a single keyset-paged :class:`~domain.pagination.Page`.
   GetStatsService               – aggregate statistics
   MaintenanceService            – enable / disable maintenance mode
   GetAllUserIdsService          – user-id list for broadcast
 """
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from domain.enums import ProjectStatus
+from domain.pagination import Page
 from infrastructure.repositories import (
     PaymentRepository,
     ProjectRepository,
@@ -26,14 +30,23 @@ from infrastructure.repositories import (
 )
 
 
+_ONGOING_STATUSES = [ProjectStatus.ACCEPTED, ProjectStatus.AWAITING_VERIFICATION]
+_HISTORY_STATUSES = [
+    ProjectStatus.FINISHED,
+    ProjectStatus.DENIED_ADMIN,
+    ProjectStatus.DENIED_STUDENT,
+    ProjectStatus.REJECTED_PAYMENT,
+]
+
+
 class GetCategorizedProjectsService:
-    """Returns all projects grouped into display categories."""
+    """Returns one page of the master report plus per-category counts."""
 
     def __init__(self, project_repo: ProjectRepository) -> None:
         self._repo = project_repo
 
-    async def execute(self) -> Dict[str, List[Dict[str, Any]]]:
-        return await self._repo.get_all_categorized()
+    async def execute(self, page: int = 0) -> Page:
+        return await self._repo.get_master_report(page=page)
 
 
 class GetPendingProjectsService:
@@ -45,6 +58,13 @@ class GetPendingProjectsService:
     async def execute(self) -> List[Dict[str, Any]]:
         return await self._repo.get_projects_by_status([ProjectStatus.PENDING])
 
+    async def execute_page(
+        self, *, after: Optional[str] = None, before: Optional[str] = None
+    ) -> Page:
+        return await self._repo.get_projects_page(
+            [ProjectStatus.PENDING], after=after, before=before
+        )
+
 
 class GetOngoingProjectsService:
     """Returns accepted and awaiting-verification (in-progress) projects."""
@@ -53,8 +73,13 @@ class GetOngoingProjectsService:
         self._repo = project_repo
 
     async def execute(self) -> List[Dict[str, Any]]:
-        return await self._repo.get_projects_by_status(
-            [ProjectStatus.ACCEPTED, ProjectStatus.AWAITING_VERIFICATION]
+        return await self._repo.get_projects_by_status(_ONGOING_STATUSES)
+
+    async def execute_page(
+        self, *, after: Optional[str] = None, before: Optional[str] = None
+    ) -> Page:
+        return await self._repo.get_projects_page(
+            _ONGOING_STATUSES, after=after, before=before
         )
 
 
@@ -65,13 +90,13 @@ class GetProjectHistoryService:
         self._repo = project_repo
 
     async def execute(self) -> List[Dict[str, Any]]:
-        return await self._repo.get_projects_by_status(
-            [
-                ProjectStatus.FINISHED,
-                ProjectStatus.DENIED_ADMIN,
-                ProjectStatus.DENIED_STUDENT,
-                ProjectStatus.REJECTED_PAYMENT,
-            ]
+        return await self._repo.get_projects_by_status(_HISTORY_STATUSES)
+
+    async def execute_page(
+        self, *, after: Optional[str] = None, before: Optional[str] = None
+    ) -> Page:
+        return await self._repo.get_projects_page(
+            _HISTORY_STATUSES, after=after, before=before
         )
 
 
@@ -84,6 +109,11 @@ class GetAllPaymentsService:
     async def execute(self) -> List[Dict[str, Any]]:
         return await self._repo.get_all()
 
+    async def execute_page(
+        self, *, after: Optional[str] = None, before: Optional[str] = None
+    ) -> Page:
+        return await self._repo.get_page(after=after, before=before)
+
 
 class GetStatsService:
     """Returns the aggregate project statistics dict."""
@@ -7,6 +7,7 @@ joining, and handling join decisions with automatic quota management.
 from typing import Any, Dict, List, Optional
 
 from domain.enums import TeamRequestStatus, MatchStatus
+from infrastructure.projections import CARD
 from infrastructure.repositories.matchmaking import TeamRequestRepository
 
 
@@ -88,7 +89,7 @@ class JoinTeamService:
         Returns the team request document.
         Raises ValueError with a message key on validation failure.
         """
-        team = await self._repo.get_by_id(request_id)
+        team = await self._repo.get_by_id(request_id, profile=CARD)
         if not team:
             raise ValueError("not_found")
         if team["status"] != TeamRequestStatus.OPEN.value:
@@ -121,7 +122,7 @@ class HandleJoinDecisionService:
 
         Returns dict with 'team', 'is_full' keys.
         """
-        team_check = await self._repo.get_by_id(request_id)
+        team_check = await self._repo.get_by_id(request_id, profile=CARD)
         if len(team_check["current_members"]) >= team_check["required_members"]:
             raise ValueError("team_full")
             
@@ -155,20 +156,20 @@ class ManageTeamService:
         self._repo = team_request_repo
 
     async def close_team(self, request_id: int, host_id: int) -> None:
-        team = await self._repo.get_by_id(request_id)
+        team = await self._repo.get_by_id(request_id, profile=CARD)
         if not team or team["host_id"] != host_id:
             raise ValueError("not_authorized")
         await self._repo.close_request(request_id)
         await self._repo.reject_all_pending_joins(request_id)
 
     async def delete_team(self, request_id: int, host_id: int) -> None:
-        team = await self._repo.get_by_id(request_id)
+        team = await self._repo.get_by_id(request_id, profile=CARD)
         if not team or team["host_id"] != host_id:
             raise ValueError("not_authorized")
         await self._repo.delete_request(request_id)
 
     async def withdraw_join(self, request_id: int, seeker_id: int) -> None:
-        team = await self._repo.get_by_id(request_id)
+        team = await self._repo.get_by_id(request_id, profile=CARD)
         if not team:
             raise ValueError("not_found")
         await self._repo.remove_join_request(request_id, seeker_id)
@@ -15,6 +15,8 @@ from dataclasses import dataclass
 from typing import Optional
 
 from domain.enums import ProjectStatus
+from domain.money import parse_price
+from infrastructure.projections import CARD
 from infrastructure.repositories import ProjectRepository
 from utils.constants import MSG_PERMISSION_DENIED
 
@@ -43,7 +45,7 @@ class SendOfferResult:
     user_id: int
     proj_id: int
     subject: str    # raw
-    price: str      # raw
+    price: int      # whole SYP
     delivery: str   # raw
     notes: str      # raw
 
@@ -106,27 +108,30 @@ class SendOfferService:
     Returns the notification payload for the student.
 
     Raises:
-        ValueError: if project not found.
+        ValueError: if project not found or the price is not a number.
     """
 
     def __init__(self, project_repo: ProjectRepository) -> None:
         self._repo = project_repo
 
     async def execute(
-        self, proj_id: int, price: str, delivery: str, notes: str
+        self, proj_id: int, price: int, delivery: str, notes: str
     ) -> SendOfferResult:
-        project = await self._repo.get_project_by_id(proj_id)
+        project = await self._repo.get_project_by_id(proj_id, profile=CARD)
         if not project:
             raise ValueError(f"Project #{proj_id} not found.")
+        amount = parse_price(price)
+        if amount is None:
+            raise ValueError(f"Invalid price: {price!r}")
 
-        await self._repo.update_offer(proj_id, price, delivery)
+        await self._repo.update_offer(proj_id, amount, delivery)
         await self._repo.update_status(proj_id, ProjectStatus.OFFERED)
 
         return SendOfferResult(
             user_id=project["user_id"],
             proj_id=proj_id,
             subject=project["subject_name"],
-            price=price,
+            price=amount,
             delivery=delivery,
             notes=notes,
         )
@@ -149,7 +154,7 @@ class FinishProjectService:
         self._repo = project_repo
 
     async def execute(self, proj_id: int) -> FinishProjectResult:
-        project = await self._repo.get_project_by_id(proj_id)
+        project = await self._repo.get_project_by_id(proj_id, profile=CARD)
         if not project:
             raise ValueError(f"Project #{proj_id} not found.")
 
@@ -183,7 +188,7 @@ class DenyProjectService:
 
     async def execute_admin_deny(self, proj_id: int) -> DenyResult:
         await self._repo.update_status(proj_id, ProjectStatus.DENIED_ADMIN)
-        project = await self._repo.get_project_by_id(proj_id)
+        project = await self._repo.get_project_by_id(proj_id, profile=CARD)
         return DenyResult(
             proj_id=proj_id,
             is_admin_deny=True,
@@ -191,7 +196,7 @@ class DenyProjectService:
         )
 
     async def execute_student_deny(self, proj_id: int, user_id: int) -> DenyResult:
-        project = await self._repo.get_project_by_id(proj_id)
+        project = await self._repo.get_project_by_id(proj_id, profile=CARD)
         if not project or project["user_id"] != user_id:
             raise PermissionError(MSG_PERMISSION_DENIED)
         await self._repo.update_status(proj_id, ProjectStatus.DENIED_STUDENT)
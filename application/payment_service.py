@@ -12,6 +12,7 @@ from typing import Optional
 
 from domain.entities import CommissionLog
 from domain.enums import PaymentStatus, ProjectStatus
+from infrastructure.projections import CARD
 from infrastructure.repositories import PaymentRepository, ProjectRepository
 
 
@@ -119,7 +120,7 @@ class ConfirmPaymentService(BasePaymentService):
         await self._payment_repo.update_status(payment_id, PaymentStatus.ACCEPTED)
         await self._project_repo.update_status(proj_id, ProjectStatus.ACCEPTED)
 
-        project = await self._project_repo.get_project_by_id(proj_id)
+        project = await self._project_repo.get_project_by_id(proj_id, profile=CARD)
         student_id = project["user_id"]
         price = float(project.get("price") or 0)
 
@@ -176,7 +177,7 @@ class RejectPaymentService(BasePaymentService):
         # Reset to OFFERED so student can re-upload
         await self._project_repo.update_status(proj_id, ProjectStatus.OFFERED)
 
-        project = await self._project_repo.get_project_by_id(proj_id)
+        project = await self._project_repo.get_project_by_id(proj_id, profile=CARD)
         price = float(project.get("price") or 0) if project else 0.0
         return PaymentActionResult(
             payment_id=payment_id,
@@ -13,6 +13,8 @@ from typing import Any, Dict, List, Optional
 
 from domain.entities import parse_deadline
 from domain.enums import ProjectStatus
+from domain.pagination import Page
+from infrastructure.projections import CARD
 from infrastructure.repositories import ProjectRepository
 from utils.constants import MSG_PERMISSION_DENIED
 
@@ -85,7 +87,7 @@ class GetStudentProjectDetailService:
         self._repo = project_repo
 
     async def execute(self, proj_id: int, user_id: int) -> Dict[str, Any]:
-        project = await self._repo.get_project_by_id(proj_id)
+        project = await self._repo.get_project_by_id(proj_id, profile=CARD)
         if not project or project["user_id"] != user_id:
             raise PermissionError(MSG_PERMISSION_DENIED)
         return project
@@ -118,6 +120,13 @@ class GetStudentProjectsService:
             _ALL_PROJECT_STATUSES, user_id=user_id
         )
 
+    async def execute_page(
+        self, user_id: int, *, after: Optional[str] = None, before: Optional[str] = None
+    ) -> Page:
+        return await self._repo.get_projects_page(
+            _ALL_PROJECT_STATUSES, user_id=user_id, after=after, before=before
+        )
+
 
 # ---------------------------------------------------------------------------
 # GetStudentOffersService
@@ -134,6 +143,13 @@ class GetStudentOffersService:
             [ProjectStatus.OFFERED], user_id=user_id
         )
 
+    async def execute_page(
+        self, user_id: int, *, after: Optional[str] = None, before: Optional[str] = None
+    ) -> Page:
+        return await self._repo.get_projects_page(
+            [ProjectStatus.OFFERED], user_id=user_id, after=after, before=before
+        )
+
 
 # ---------------------------------------------------------------------------
 
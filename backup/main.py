@@ -4,7 +4,8 @@ backup/main.py
 Entrypoint for the backup container.
 
 Startup sequence:
-  1. Load BackupSettings from environment variables
+  1. Load BackupSettings from environment variables and open the shared
+     Telegram HTTP client (utils/telegram_http.py)
   2. Run one backup immediately — validates the full pipeline on every deploy
   3. Schedule recurring backups every BACKUP_INTERVAL_HOURS (default: 6)
   4. Keep the asyncio event loop alive
@@ -16,6 +17,7 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 from backup.config import BackupSettings
 from backup.runner import run_backup
+from utils.telegram_http import telegram_http
 
 logger = structlog.get_logger(__name__)
 
@@ -28,6 +30,8 @@ async def main() -> None:
         db=settings.DB_NAME,
         interval_hours=settings.BACKUP_INTERVAL_HOURS,
     )
+    # One pooled session for every admin notification this process sends.
+    telegram_http.start(settings.BOT_TOKEN)
 
     # ── 2. Run immediately on startup ──────────────────────────────────────────
     # This lets you verify the full pipeline works the moment you deploy,
@@ -61,6 +65,8 @@ async def main() -> None:
     except (KeyboardInterrupt, SystemExit):
         logger.info("Backup service shutting down")
         scheduler.shutdown(wait=False)
+    finally:
+        await telegram_http.close()
 
 
 if __name__ == "__main__":
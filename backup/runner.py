@@ -6,58 +6,46 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
-import aiohttp
 import structlog
 
 from backup.config import BackupSettings
+from utils.telegram_http import telegram_http
 
 log = structlog.get_logger(__name__)
 
 
 async def _notify_admins(
-    bot_token: str, admin_ids: list[int], text: str, document_path: Optional[Path] = None
+    admin_ids: list[int], text: str, document_path: Optional[Path] = None
 ) -> None:
-    """Sends a Telegram message (and optionally a document) to all admin IDs."""
-    if document_path:
-        url = f"https://api.telegram.org/bot{bot_token}/sendDocument"
-    else:
-        url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
-
-    async with aiohttp.ClientSession() as session:
-        for admin_id in admin_ids:
-            try:
-                data = aiohttp.FormData()
-                data.add_field("chat_id", str(admin_id))
-                data.add_field("parse_mode", "HTML")
-
-                if document_path:
-                    data.add_field("caption", text)
-                    # We must open the file independently per-admin to ensure the stream is fresh
-                    with document_path.open("rb") as f:
-                        data.add_field("document", f, filename=document_path.name)
-                        async with session.post(url, data=data) as resp:
-                            if resp.status != 200:
-                                resp_text = await resp.text()
-                                log.warning(
-                                    "Failed to notify admin with document",
-                                    admin_id=admin_id,
-                                    status=resp.status,
-                                    text=resp_text,
-                                )
-                else:
-                    data.add_field("text", text)
-                    async with session.post(url, data=data) as resp:
-                        if resp.status != 200:
-                            resp_text = await resp.text()
-                            log.warning(
-                                "Failed to notify admin with message",
-                                admin_id=admin_id,
-                                status=resp.status,
-                                text=resp_text,
-                            )
-
-            except Exception as e:  # noqa: BLE001
-                log.warning("Admin notification exception", admin_id=admin_id, error=str(e))
+    """
+    Sends a Telegram message (and optionally a document) to all admin IDs
+    through the shared ``telegram_http`` client started in ``backup.main``.
+    """
+    for admin_id in admin_ids:
+        try:
+            if document_path:
+                # Multipart upload; the client reopens the file for every request.
+                reply = await telegram_http.call(
+                    "sendDocument",
+                    {"chat_id": admin_id, "parse_mode": "HTML", "caption": text},
+                    files={"document": document_path},
+                )
+            else:
+                reply = await telegram_http.call(
+                    "sendMessage",
+                    {"chat_id": admin_id, "parse_mode": "HTML", "text": text},
+                )
+            if not reply.get("ok"):
+                log.warning(
+                    "Failed to notify admin",
+                    admin_id=admin_id,
+                    document=bool(document_path),
+                    status=reply.get("error_code"),
+                    text=reply.get("description"),
+                )
+
+        except Exception as e:  # noqa: BLE001
+            log.warning("Admin notification exception", admin_id=admin_id, error=str(e))
 
 
 def _human_size(path: Path) -> str:
@@ -133,7 +121,6 @@ async def run_backup(settings: BackupSettings) -> None:
             f"⏱ Duration: <b>{duration}s</b>"
         )
         await _notify_admins(
-            bot_token=settings.BOT_TOKEN,
             admin_ids=settings.admin_id_list,
             text=success_msg,
             document_path=archive_path,
@@ -150,7 +137,6 @@ async def run_backup(settings: BackupSettings) -> None:
         )
         # Attempt to notify admins of the failure (no document)
         await _notify_admins(
-            bot_token=settings.BOT_TOKEN,
             admin_ids=settings.admin_id_list,
             text=failure_msg,
         )
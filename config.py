@@ -24,6 +24,29 @@ class Settings(BaseSettings):
         description="MongoDB Connection URI"
     )
     DB_NAME: str = Field(default="svu_helper_bot", description="Database Name")
+    # Motor client tuning (see infrastructure/mongo_db.py)
+    MONGO_MAX_POOL_SIZE: int = Field(
+        default=50, description="Max connections per MongoDB server"
+    )
+    MONGO_MIN_POOL_SIZE: int = Field(
+        default=0, description="Connections kept open while idle"
+    )
+    MONGO_MAX_IDLE_TIME_MS: int = Field(
+        default=300000, description="Close pooled connections idle this long"
+    )
+    MONGO_CONNECT_TIMEOUT_MS: int = Field(
+        default=10000, description="TCP connect timeout"
+    )
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = Field(
+        default=10000, description="Fail fast when no suitable server is reachable"
+    )
+    MONGO_SOCKET_TIMEOUT_MS: Optional[int] = Field(
+        default=None, description="Per-operation socket timeout (None = no limit)"
+    )
+    MONGO_COMPRESSORS: str = Field(
+        default="zstd,zlib",
+        description="Wire compressors in order of preference ('' disables)",
+    )
     REDIS_URI: str = Field(
         default="redis://localhost:6379/0",
         validation_alias=AliasChoices("REDIS_URL", "REDIS_URI"),
@@ -50,9 +73,104 @@ class Settings(BaseSettings):
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=1440, description="Token expiration time in minutes")
     # Set this to your Railway public domain, e.g. https://svu-helper.up.railway.app
     DASHBOARD_CORS_ORIGIN: Optional[str] = Field(default=None, description="Allowed CORS origin for dashboard (Railway public URL)")
+    DASHBOARD_TOTALS_TTL_SECONDS: float = Field(
+        default=30.0,
+        gt=0,
+        description="How long a project list total is reused per filter",
+    )
+
+    # Webhook Configuration
+    # When WEBHOOK_URL is set the bot receives updates on the keep-alive server
+    # instead of long polling, e.g. https://svu-helper-bot.up.railway.app
+    WEBHOOK_URL: Optional[str] = Field(
+        default=None, description="Public base URL for Telegram webhooks"
+    )
+    WEBHOOK_SECRET: Optional[str] = Field(
+        default=None, description="Secret token used in the webhook path and header"
+    )
+    WEBHOOK_QUEUE_SIZE: int = Field(
+        default=1000, description="Max updates buffered before answering 503"
+    )
+    WEBHOOK_MAX_TASKS: int = Field(
+        default=1000,
+        ge=1,
+        description="Max webhook updates in progress or waiting on a user lane",
+    )
+
+    # Prometheus metrics: served on their own listener, not the public PORT
+    # server, so handler names and traffic stay private. Scrape it from inside
+    # the host / private network; METRICS_PORT=0 turns it off.
+    METRICS_HOST: str = Field(
+        default="127.0.0.1", description="Interface the /metrics listener binds to"
+    )
+    METRICS_PORT: int = Field(
+        default=9100, ge=0, description="Port for GET /metrics, 0 disables it"
+    )
+
+    # Throttling (per-user token bucket; costs per action live in
+    # middlewares/throttling.py)
+    THROTTLE_CAPACITY: float = Field(
+        default=5.0, description="Max burst of tokens per user"
+    )
+    THROTTLE_REFILL_PER_SECOND: float = Field(
+        default=2.0, description="Tokens regained per second"
+    )
+
+    # ID Allocation
+    ID_BLOCK_SIZE: int = Field(
+        default=50, ge=1, description="Sequence IDs reserved per counters round trip"
+    )
+
+    # Audit Log (write-behind, time-series collection)
+    AUDIT_BATCH_SIZE: int = Field(
+        default=100, ge=1, description="Audit events per insert_many"
+    )
+    AUDIT_FLUSH_INTERVAL: float = Field(
+        default=2.0, gt=0, description="Max seconds an audit event waits in memory"
+    )
+    AUDIT_BUFFER_SIZE: int = Field(
+        default=10000,
+        ge=1,
+        description="Audit events buffered before new ones are dropped",
+    )
+    AUDIT_RETENTION_DAYS: int = Field(
+        default=365, ge=1, description="Audit events expire after this many days"
+    )
+
+    # Dashboard daily rollups (project_daily_stats)
+    STATS_RECONCILE_HOUR: int = Field(
+        default=3, ge=0, le=23, description="UTC hour of the nightly rollup reconcile"
+    )
+
+    # Update Execution
+    MAX_CONCURRENT_UPDATES: int = Field(
+        default=100, description="Max handlers running at once across all users"
+    )
+
+    # Callback Tracing (admin /trace and /traces commands)
+    CALLBACK_TRACE_SAMPLE_RATE: float = Field(
+        default=0.01, ge=0.0, le=1.0, description="Fraction of callbacks recorded"
+    )
+    CALLBACK_TRACE_BUFFER_SIZE: int = Field(
+        default=200, description="Recent callback traces kept in memory"
+    )
 
     # Logging Configuration
     LOG_FILE: str = Field(default="bot.log", description="Log file path")
+    LOG_QUEUE_SIZE: int = Field(
+        default=10000, description="Records buffered for the background log writer"
+    )
+    LOG_SAMPLE_RATE: float = Field(
+        default=0.1,
+        ge=0.0,
+        le=1.0,
+        description="Share of updates whose per-update info logs are kept",
+    )
+    LOG_INFO_RATE_LIMIT: int = Field(
+        default=200,
+        ge=0,
+        description="Max info/debug events per second (0 = unlimited)",
+    )
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -67,6 +185,12 @@ class Settings(BaseSettings):
             raise ValueError("JWT_SECRET_KEY must be provided if DASHBOARD_USER is enabled")
         return self
 
+    @model_validator(mode="after")
+    def check_webhook_secret(self):
+        if self.WEBHOOK_URL and not self.WEBHOOK_SECRET:
+            raise ValueError("WEBHOOK_SECRET must be provided if WEBHOOK_URL is set")
+        return self
+
     @functools.cached_property
     def admin_ids(self) -> List[int]:
         """Parses the comma-separated ADMIN_IDS string into a list of integers."""
@@ -1,10 +1,10 @@
-import aiohttp
 import structlog
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
 
 from dashboard_api.api.dependencies import get_current_user
 from dashboard_api.services.telegram_service import TelegramService
+from utils.telegram_http import telegram_http
 
 logger = structlog.get_logger(__name__)
 
@@ -15,12 +15,13 @@ router = APIRouter(
 )
 
 async def _stream_file(url: str):
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as response:
-            if response.status != 200:
-                raise HTTPException(status_code=response.status, detail="Failed to fetch file from Telegram")
-            async for chunk in response.content.iter_chunked(8192):
-                yield chunk
+    async with telegram_http.session.get(url) as response:
+        if response.status != 200:
+            raise HTTPException(
+                status_code=response.status, detail="Failed to fetch file from Telegram"
+            )
+        async for chunk in response.content.iter_chunked(8192):
+            yield chunk
 
 @router.get("/{file_id}")
 async def get_file(file_id: str):
@@ -1,10 +1,19 @@
 import structlog
 from typing import Optional, List
+from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, Query, BackgroundTasks, HTTPException
+from fastapi.responses import StreamingResponse
 
 from dashboard_api.api.dependencies import get_current_user, get_project_repo
 from dashboard_api.schemas.projects import PaginatedProjectsResponse, OfferRequest, ActionResponse, ProjectDetailsResponse, ProjectResponse
-from dashboard_api.services.projects_service import get_projects_page, get_project_details, get_urgent_projects_list
+from dashboard_api.repositories.projects_repo import EXPORT_FIELDS
+from dashboard_api.services.projects_service import (
+    get_projects_page,
+    get_project_details,
+    get_urgent_projects_list,
+    invalidate_project_totals,
+    stream_projects_export,
+)
 
 from application.offer_service import SendOfferService, FinishProjectService, DenyProjectService
 from dashboard_api.services.telegram_service import TelegramService
@@ -39,14 +48,102 @@ async def list_projects(
     sort_order: str = Query("desc", regex="^(asc|desc)$"),
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
-    export_all: bool = Query(False)
+    after: Optional[str] = Query(
+        None, description="next_cursor of the previous response"
+    ),
+    before: Optional[str] = Query(
+        None, description="prev_cursor of the previous response"
+    ),
+):
+    """
+    Returns a paginated list of projects.
+    Moving to an adjacent page with ``after`` / ``before`` costs the same on
+    any page; ``page`` alone is an offset and is meant for jumps.
+    Requires authentication.
+    """
+    logger.info(
+        "Fetching projects",
+        page=page,
+        size=size,
+        status=status,
+        student_id=student_id,
+        sort=sort_by,
+        order=sort_order,
+        keyset=bool(after or before),
+    )
+    return await get_projects_page(
+        page,
+        size,
+        status,
+        student_id,
+        sort_by,
+        sort_order,
+        start_date,
+        end_date,
+        after,
+        before,
+    )
+
+
+_EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+@router.get("/export")
+async def export_projects(
+    format: str = Query("csv", regex="^(csv|ndjson)$"),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated columns; defaults to all exportable fields"
+    ),
+    status: Optional[str] = Query(None),
+    student_id: Optional[int] = Query(None),
+    sort_by: str = Query("created_at"),
+    sort_order: str = Query("desc", regex="^(asc|desc)$"),
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None)
 ):
     """
-    Returns a paginated list of projects (or all projects if export_all is true).
+    Streams every project matching the list filters as CSV or NDJSON.
+    Rows are written as they are read from the database, so the export
+    size does not affect the API's memory.
     Requires authentication.
     """
-    logger.info("Fetching projects", page=page, size=size, status=status, student_id=student_id, sort=sort_by, order=sort_order)
-    return await get_projects_page(page, size, status, student_id, sort_by, sort_order, start_date, end_date, export_all)
+    selected = (
+        [f.strip() for f in fields.split(",") if f.strip()]
+        if fields
+        else list(EXPORT_FIELDS)
+    )
+    unknown = sorted(set(selected) - set(EXPORT_FIELDS))
+    if not selected or unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown export fields: {', '.join(unknown) or '(none given)'}",
+        )
+
+    logger.info(
+        "Exporting projects",
+        format=format,
+        fields=selected,
+        status=status,
+        student_id=student_id,
+    )
+    filename = f"projects_export_{datetime.now(timezone.utc):%Y-%m-%d}.{format}"
+    return StreamingResponse(
+        stream_projects_export(
+            format,
+            selected,
+            status,
+            student_id,
+            sort_by,
+            sort_order,
+            start_date,
+            end_date,
+        ),
+        media_type=_EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 @router.get("/urgent", response_model=List[ProjectResponse])
 async def get_urgent(project_repo: ProjectRepository = Depends(get_project_repo)):
@@ -81,20 +178,22 @@ async def send_offer(
     """Sends an offer to the student and updates the project status."""
     db = await get_db()
     project_repo = ProjectRepository(db)
-    audit_repo = AuditRepository(db)
+    audit = AuditService(AuditRepository(db))
     telegram_service = TelegramService()
     
     try:
         service = SendOfferService(project_repo)
         result = await service.execute(
             proj_id=proj_id,
-            price=str(request.price),
+            price=request.price,
             delivery=request.delivery,
             notes=request.notes or ""
         )
     except Exception as e:
         logger.error("Error sending offer", proj_id=proj_id, error=str(e))
         raise HTTPException(status_code=400, detail=str(e))
+
+    invalidate_project_totals()
         
     dashboard_username = current_user
     
@@ -109,9 +208,7 @@ async def send_offer(
         notes=result.notes
     )
     
-    background_tasks.add_task(
-        safe_background_task,
-        AuditService(audit_repo).log_event,
+    await audit.log_event(
         user_id=0,
         role="dashboard_admin",
         event_type=AuditEventType.OFFER_SENT,
@@ -119,9 +216,7 @@ async def send_offer(
         metadata={"dashboard_user": dashboard_username}
     )
     
-    background_tasks.add_task(
-        safe_background_task,
-        AuditService(audit_repo).log_event,
+    await audit.log_event(
         user_id=0,
         role="dashboard_admin",
         event_type=AuditEventType.PROJECT_STATUS_CHANGED,
@@ -140,7 +235,7 @@ async def deny_project(
     """Denies a project from the admin side."""
     db = await get_db()
     project_repo = ProjectRepository(db)
-    audit_repo = AuditRepository(db)
+    audit = AuditService(AuditRepository(db))
     telegram_service = TelegramService()
     
     try:
@@ -149,6 +244,8 @@ async def deny_project(
     except Exception as e:
         logger.error("Error denying project", proj_id=proj_id, error=str(e))
         raise HTTPException(status_code=400, detail=str(e))
+
+    invalidate_project_totals()
         
     dashboard_username = current_user
     
@@ -160,9 +257,7 @@ async def deny_project(
             proj_id=proj_id
         )
         
-    background_tasks.add_task(
-        safe_background_task,
-        AuditService(audit_repo).log_event,
+    await audit.log_event(
         user_id=0,
         role="dashboard_admin",
         event_type=AuditEventType.PROJECT_STATUS_CHANGED,
@@ -181,7 +276,7 @@ async def finish_project(
     """Marks a project as finished."""
     db = await get_db()
     project_repo = ProjectRepository(db)
-    audit_repo = AuditRepository(db)
+    audit = AuditService(AuditRepository(db))
     telegram_service = TelegramService()
     
     try:
@@ -190,6 +285,8 @@ async def finish_project(
     except Exception as e:
         logger.error("Error finishing project", proj_id=proj_id, error=str(e))
         raise HTTPException(status_code=400, detail=str(e))
+
+    invalidate_project_totals()
         
     dashboard_username = current_user
     
@@ -201,9 +298,7 @@ async def finish_project(
         subject=result.subject
     )
     
-    background_tasks.add_task(
-        safe_background_task,
-        AuditService(audit_repo).log_event,
+    await audit.log_event(
         user_id=0,
         role="dashboard_admin",
         event_type=AuditEventType.PROJECT_STATUS_CHANGED,
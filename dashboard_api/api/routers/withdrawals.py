@@ -4,14 +4,13 @@ Dashboard Withdrawals Router
 Endpoints for viewing and managing student referral withdrawal requests.
 Sends Telegram notifications directly via Bot API (no bot process dependency).
 """
+import asyncio
 import structlog
-import aiohttp
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
 
-from config import settings
 from dashboard_api.api.dependencies import get_current_user
 from dashboard_api.repositories.withdrawals_repo import (
     get_all_requests,
@@ -19,6 +18,7 @@ from dashboard_api.repositories.withdrawals_repo import (
     mark_request_paid,
     reject_request,
 )
+from utils.telegram_http import telegram_http
 
 logger = structlog.get_logger(__name__)
 
@@ -39,14 +39,19 @@ class MarkPaidRequest(BaseModel):
 
 async def _send_telegram(user_id: int, text: str) -> None:
     """Fire-and-forget Telegram message sent directly via Bot API."""
-    url = f"https://api.telegram.org/bot{settings.BOT_TOKEN}/sendMessage"
     payload = {"chat_id": user_id, "text": text, "parse_mode": "Markdown"}
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload, timeout=aiohttp.ClientTimeout(total=8)) as resp:
-                if resp.status != 200:
-                    body = await resp.text()
-                    logger.warning("Telegram send failed", user_id=user_id, status=resp.status, body=body)
+        # Awaited inside the request: keep the old 8 s bound, retries included.
+        reply = await asyncio.wait_for(
+            telegram_http.call("sendMessage", payload), timeout=8
+        )
+        if not reply.get("ok"):
+            logger.warning(
+                "Telegram send failed",
+                user_id=user_id,
+                status=reply.get("error_code"),
+                body=reply.get("description"),
+            )
     except Exception as exc:
         logger.warning("Telegram send exception", user_id=user_id, error=str(exc))
 
@@ -3,10 +3,13 @@ import structlog
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 
 from config import settings
+from infrastructure.audit_writer import audit_writer
+from utils.telegram_http import telegram_http
 
 
 # Import routers
@@ -27,16 +30,20 @@ _DIST_DIR = os.path.join(os.path.dirname(__file__), "..", "dashboard_ui", "dist"
 async def lifespan(app: FastAPI):
     # Startup — just establish the DB handle; index creation is the bot's responsibility.
     logger.info("Starting Dashboard API, connecting to MongoDB...")
+    # Shared pooled session for every direct Bot API call (notifications, file proxy).
+    telegram_http.start(settings.BOT_TOKEN)
     try:
         from infrastructure.mongo_db import get_db
-        await get_db()
+        audit_writer.start(await get_db())
         logger.info("Dashboard API connected to MongoDB")
     except Exception as exc:
         logger.error("Dashboard API failed to connect to MongoDB at startup", error=str(exc))
         # Don't crash — requests will fail gracefully via get_db() per-request
     yield
-    # Shutdown (nothing to tear down for Motor — the client manages its own pool)
+    # Shutdown: write out buffered audit events (Motor manages its own pool).
     logger.info("Dashboard API shutting down")
+    await audit_writer.stop()
+    await telegram_http.close()
 
 app = FastAPI(
     title="SVU Helper Dashboard API",
@@ -64,6 +71,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compresses JSON and streamed exports (chunk by chunk) for clients that
+# send Accept-Encoding: gzip.
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # ── API Routers ────────────────────────────────────────────
 app.include_router(auth_router)
 app.include_router(stats_router)
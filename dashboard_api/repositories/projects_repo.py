@@ -1,6 +1,13 @@
-from typing import List, Dict, Any, Optional
+from typing import Any, AsyncIterator, Dict, Optional, Sequence, Tuple
 from datetime import datetime, timezone
+import asyncio
+import base64
+
+from bson import json_util
+
+from domain.pagination import Page
 from infrastructure.mongo_db import get_db
+from infrastructure.projections import LIST, projection
 import structlog
 
 logger = structlog.get_logger(__name__)
@@ -19,13 +26,23 @@ def _parse_date(date_str: str) -> Optional[datetime]:
         logger.error("Failed to parse date", error=str(e), date_str=date_str)
         return None
 
-async def count_projects(
-    status_filter: Optional[str] = None, 
+
+# Fields the export endpoint may select; ``EXPORT_FIELDS`` order is the
+# default column order.
+EXPORT_FIELDS = (
+    "id", "user_id", "username", "user_full_name", "subject_name", "tutor_name",
+    "deadline", "status", "price", "currency", "delivery_date", "created_at",
+)
+
+_SORT_FIELDS = ["created_at", "price", "status", "user_id", "id"]
+
+
+def _build_query(
+    status_filter: Optional[str] = None,
     search_student_id: Optional[int] = None,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None
-) -> int:
-    db = await get_db()
+) -> Dict[str, Any]:
     query = {}
     if status_filter:
         query["status"] = status_filter
@@ -43,47 +60,169 @@ async def count_projects(
                 query["created_at"]["$lte"] = datetime.combine(dt.date(), datetime.max.time(), tzinfo=timezone.utc)
         if not query["created_at"]:
             del query["created_at"]
-    
-    return await db.projects.count_documents(query)
+    return query
+
+
+def _sort_spec(sort_by: str, sort_order: str) -> Tuple[str, int]:
+    # Ensure safe sort field
+    if sort_by not in _SORT_FIELDS:
+        sort_by = "created_at"
+    return sort_by, -1 if sort_order == "desc" else 1
+
+
+def encode_project_cursor(sort_by: str, doc: Dict[str, Any]) -> str:
+    """Opaque cursor for ``doc``'s position in a list sorted on ``sort_by``."""
+    raw = json_util.dumps([doc.get(sort_by), doc["id"]])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
 
-async def get_paginated_projects(
-    skip: int, 
-    limit: int, 
-    status_filter: Optional[str] = None, 
+
+def decode_project_cursor(cursor: Optional[str]) -> Optional[Tuple[Any, int]]:
+    """``(sort value, id)`` of a cursor; ``None`` if empty or malformed."""
+    if not cursor:
+        return None
+    try:
+        value, proj_id = json_util.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        return None
+    return (value, proj_id) if isinstance(proj_id, int) else None
+
+
+def _keyset_match(sort_by: str, op: str, key: Tuple[Any, int]) -> Dict[str, Any]:
+    """Documents past ``key`` in ``op`` ("$gt"/"$lt") order on (sort_by, id)."""
+    value, proj_id = key
+    if sort_by == "id":
+        return {"id": {op: proj_id}}
+    tie = {sort_by: value, "id": {op: proj_id}}
+    # Missing / null values sort before everything else but match no range operator.
+    if value is None:
+        return {"$or": [tie, {sort_by: {"$ne": None}}]} if op == "$gt" else tie
+    beyond = {sort_by: {op: value}}
+    if op == "$lt":
+        return {"$or": [beyond, tie, {sort_by: None}]}
+    return {"$or": [beyond, tie]}
+
+
+async def find_projects_page(
+    size: int,
+    status_filter: Optional[str] = None,
     search_student_id: Optional[int] = None,
     sort_by: str = "created_at",
     sort_order: str = "desc",
     start_date: Optional[str] = None,
-    end_date: Optional[str] = None
-) -> List[Dict[str, Any]]:
+    end_date: Optional[str] = None,
+    *,
+    page: int = 1,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    with_total: bool = True
+) -> Page:
+    """
+    One page of the dashboard project list, ordered on ``(sort_by, id)``.
+
+    ``after`` / ``before`` (cursors from a previous page) seek straight to
+    the adjacent page through the index; without one, ``page`` is used as
+    an offset. ``total`` is only counted when ``with_total`` is set — on an
+    offset read it comes back from the same ``$facet`` round trip as the
+    page itself.
+    """
     db = await get_db()
-    query = {}
-    if status_filter:
-        query["status"] = status_filter
-    if search_student_id:
-        query["user_id"] = search_student_id
-    if start_date or end_date:
-        query["created_at"] = {}
-        if start_date:
-            dt = _parse_date(start_date)
-            if dt:
-                query["created_at"]["$gte"] = dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt
-        if end_date:
-            dt = _parse_date(end_date)
-            if dt:
-                query["created_at"]["$lte"] = datetime.combine(dt.date(), datetime.max.time(), tzinfo=timezone.utc)
-        if not query["created_at"]:
-            del query["created_at"]
-            
-    sort_direction = -1 if sort_order == "desc" else 1
-    # Ensure safe sort field
-    valid_sort_fields = ["created_at", "price", "status", "user_id", "id"]
-    if sort_by not in valid_sort_fields:
-        sort_by = "created_at"
-        
-    cursor = db.projects.find(query).sort(sort_by, sort_direction).skip(skip)
-    if limit > 0:
-        cursor = cursor.limit(limit)
-        
-    # to_list requires a length, if no limit we can use None or a large number
-    return await cursor.to_list(length=None)
+    query = _build_query(status_filter, search_student_id, start_date, end_date)
+    sort_by, direction = _sort_spec(sort_by, sort_order)
+    after_key, before_key = decode_project_cursor(after), decode_project_cursor(before)
+    key = before_key or after_key
+    if before_key:
+        # Previous page: walk back from the cursor, then restore display order.
+        direction = -direction
+    op = "$gt" if direction == 1 else "$lt"
+    sort = (
+        {sort_by: direction, "id": direction} if sort_by != "id" else {"id": direction}
+    )
+    skip = 0 if key else (page - 1) * size
+    fields = projection("projects", LIST)
+
+    total = 0
+    if key is None and with_total:
+        rows = await db.projects.aggregate([
+            {"$match": query},
+            {"$sort": sort},
+            {"$facet": {
+                "items": [{"$skip": skip}, {"$limit": size + 1}, {"$project": fields}],
+                "total": [{"$count": "n"}],
+            }},
+        ]).to_list(length=1)
+        docs = rows[0]["items"] if rows else []
+        total = rows[0]["total"][0]["n"] if rows and rows[0]["total"] else 0
+    else:
+        match = {"$and": [query, _keyset_match(sort_by, op, key)]} if key else query
+        find = (
+            db.projects.find(match, fields)
+            .sort(list(sort.items()))
+            .skip(skip)
+            .limit(size + 1)
+        )
+        if with_total:
+            total, docs = await asyncio.gather(
+                db.projects.count_documents(query), find.to_list(length=size + 1)
+            )
+        else:
+            docs = await find.to_list(length=size + 1)
+
+    more = len(docs) > size
+    items = docs[:size]
+    if before_key:
+        items.reverse()
+        has_prev, has_next = more, True
+    else:
+        has_prev, has_next = key is not None or skip > 0, more
+
+    if not items and key:
+        # Everything beyond the cursor is gone (status changes); start over.
+        first = await find_projects_page(
+            size,
+            status_filter,
+            search_student_id,
+            sort_by,
+            sort_order,
+            start_date,
+            end_date,
+            with_total=with_total,
+        )
+        first.restarted = True
+        return first
+    return Page(
+        items=items,
+        total=total,
+        next_cursor=(
+            encode_project_cursor(sort_by, items[-1]) if has_next and items else None
+        ),
+        prev_cursor=(
+            encode_project_cursor(sort_by, items[0]) if has_prev and items else None
+        ),
+    )
+
+
+async def iter_projects(
+    fields: Sequence[str] = EXPORT_FIELDS,
+    status_filter: Optional[str] = None,
+    search_student_id: Optional[int] = None,
+    sort_by: str = "created_at",
+    sort_order: str = "desc",
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    batch_size: int = 500
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yields every matching project, projected to ``fields``, pulling
+    ``batch_size`` documents per round trip — memory stays flat however
+    many projects match.
+    """
+    db = await get_db()
+    query = _build_query(status_filter, search_student_id, start_date, end_date)
+    projection = {"_id": 0, **{f: 1 for f in fields}}
+    cursor = (
+        db.projects.find(query, projection)
+        .sort(*_sort_spec(sort_by, sort_order))
+        .batch_size(batch_size)
+    )
+    async for doc in cursor:
+        yield doc
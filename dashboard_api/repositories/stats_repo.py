@@ -1,10 +1,13 @@
 from typing import List, Dict, Any, Optional
-from infrastructure.mongo_db import get_db
-from datetime import datetime, timezone
+from infrastructure.mongo_db import get_analytics_db
+from infrastructure.rollups import UNKNOWN_DAY
+from datetime import datetime
 import structlog
 
 logger = structlog.get_logger(__name__)
 
+REVENUE_STATUSES = ["finished", "accepted"]
+
 def _parse_date(date_str: str) -> Optional[datetime]:
     if not date_str: return None
     date_str = date_str.strip().split('T')[0]
@@ -19,116 +22,61 @@ def _parse_date(date_str: str) -> Optional[datetime]:
         logger.error("Failed to parse date", error=str(e), date_str=date_str)
         return None
 
-async def aggregate_project_volume(start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Dict[str, Any]]:
-    db = await get_db()
-    match = {}
-    if start_date or end_date:
-        match["created_at"] = {}
-        if start_date:
-            dt = _parse_date(start_date)
-            if dt:
-                match["created_at"]["$gte"] = dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt
-        if end_date:
-            dt = _parse_date(end_date)
-            if dt:
-                match["created_at"]["$lte"] = datetime.combine(dt.date(), datetime.max.time(), tzinfo=timezone.utc)
-        if not match["created_at"]:
-            del match["created_at"]
-    
-    pipeline = []
-    if match:
-        pipeline.append({"$match": match})
-        
-    pipeline.extend([
-        {
-            "$group": {
-                "_id": {
-                    "$dateToString": {
-                        "format": "%Y-%m-%d", 
-                        "date": {"$toDate": "$created_at"},
-                        "onNull": "unknown"
-                    }
-                },
-                "count": {"$sum": 1}
-            }
-        },
-        {"$sort": {"_id": 1}}
-    ])
-    cursor = db.projects.aggregate(pipeline)
-    return await cursor.to_list(length=None)
 
-async def aggregate_conversion_rates(start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Dict[str, Any]]:
-    db = await get_db()
-    match = {}
-    if start_date or end_date:
-        match["created_at"] = {}
-        if start_date:
-            dt = _parse_date(start_date)
-            if dt:
-                match["created_at"]["$gte"] = dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt
-        if end_date:
-            dt = _parse_date(end_date)
-            if dt:
-                match["created_at"]["$lte"] = datetime.combine(dt.date(), datetime.max.time(), tzinfo=timezone.utc)
-        if not match["created_at"]:
-            del match["created_at"]
-            
-    pipeline = []
-    if match:
-        pipeline.append({"$match": match})
-        
-    pipeline.append({
-        "$group": {
-            "_id": "$status",
-            "count": {"$sum": 1}
-        }
-    })
-    cursor = db.projects.aggregate(pipeline)
-    return await cursor.to_list(length=None)
+def _day_match(start_date: Optional[str], end_date: Optional[str]) -> Dict[str, Any]:
+    """``$match`` on the rollup ``day`` key (``YYYY-MM-DD`` strings sort by date)."""
+    day: Dict[str, str] = {}
+    start = _parse_date(start_date) if start_date else None
+    end = _parse_date(end_date) if end_date else None
+    if start:
+        day["$gte"] = start.strftime("%Y-%m-%d")
+    if end:
+        day["$lte"] = end.strftime("%Y-%m-%d")
+    if day:
+        day["$ne"] = UNKNOWN_DAY  # sorts after every date
+    return {"day": day} if day else {}
 
-async def aggregate_revenue_over_time(start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Dict[str, Any]]:
-    """Revenue grouped by day.  Handles price stored as string OR number."""
-    db = await get_db()
-    _price_as_num = {
-        "$convert": {"input": "$price", "to": "double", "onError": 0, "onNull": 0}
-    }
-    match = {
-        "status": {"$in": ["finished", "accepted"]}
-    }
-    if start_date or end_date:
-        match["created_at"] = {}
-        if start_date:
-            dt = _parse_date(start_date)
-            if dt:
-                match["created_at"]["$gte"] = dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt
-        if end_date:
-            dt = _parse_date(end_date)
-            if dt:
-                match["created_at"]["$lte"] = datetime.combine(dt.date(), datetime.max.time(), tzinfo=timezone.utc)
-        if not match["created_at"]:
-            del match["created_at"]
-            
+
+async def _rollup_series(
+    match: Dict[str, Any], group_by: str, field: str
+) -> List[Dict[str, Any]]:
+    """Sums ``field`` of the matching rollup buckets per ``group_by`` value."""
+    db = await get_analytics_db()
     pipeline = [
         {"$match": match},
-        {
-            "$group": {
-                "_id": {
-                    "$dateToString": {
-                        "format": "%Y-%m-%d", 
-                        "date": {"$toDate": "$created_at"},
-                        "onNull": "unknown"
-                    }
-                },
-                "revenue": {"$sum": _price_as_num}
-            }
-        },
-        {"$sort": {"_id": 1}}
+        {"$group": {"_id": f"${group_by}", field: {"$sum": f"${field}"}}},
+        {"$sort": {"_id": 1}},
     ]
-    cursor = db.projects.aggregate(pipeline)
+    if field == "count":
+        # Buckets emptied by status changes linger until the nightly reconcile.
+        pipeline.insert(2, {"$match": {"count": {"$gt": 0}}})
+    cursor = db.project_daily_stats.aggregate(pipeline)
     return await cursor.to_list(length=None)
 
+
+async def aggregate_project_volume(
+    start_date: Optional[str] = None, end_date: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Projects created per day, from the ``project_daily_stats`` rollup."""
+    return await _rollup_series(_day_match(start_date, end_date), "day", "count")
+
+
+async def aggregate_conversion_rates(
+    start_date: Optional[str] = None, end_date: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Current status of the projects created in the range, from the rollup."""
+    return await _rollup_series(_day_match(start_date, end_date), "status", "count")
+
+
+async def aggregate_revenue_over_time(
+    start_date: Optional[str] = None, end_date: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Accepted/finished revenue by creation day, from the rollup."""
+    match = {"status": {"$in": REVENUE_STATUSES}, **_day_match(start_date, end_date)}
+    return await _rollup_series(match, "day", "revenue")
+
 async def aggregate_top_referrers(limit: int = 5) -> List[Dict[str, Any]]:
-    db = await get_db()
+    db = await get_analytics_db()
     pipeline = [
         {"$match": {"referred_by": {"$ne": None}}},
         {"$group": {"_id": "$referred_by", "count": {"$sum": 1}}},
@@ -154,14 +102,11 @@ async def aggregate_top_referrers(limit: int = 5) -> List[Dict[str, Any]]:
 
 async def aggregate_total_revenue() -> float:
     """Returns the grand-total revenue across all accepted/finished projects."""
-    db = await get_db()
-    _price_as_num = {
-        "$convert": {"input": "$price", "to": "double", "onError": 0, "onNull": 0}
-    }
+    db = await get_analytics_db()
     pipeline = [
-        {"$match": {"status": {"$in": ["finished", "accepted"]}}},
-        {"$group": {"_id": None, "total": {"$sum": _price_as_num}}},
+        {"$match": {"status": {"$in": REVENUE_STATUSES}}},
+        {"$group": {"_id": None, "total": {"$sum": "$revenue"}}},
     ]
-    cursor = db.projects.aggregate(pipeline)
+    cursor = db.project_daily_stats.aggregate(pipeline)
     result = await cursor.to_list(length=1)
     return result[0]["total"] if result else 0.0
@@ -12,6 +12,7 @@ class ProjectResponse(BaseModel):
     deadline: str
     status: str
     price: Optional[int] = None
+    currency: Optional[str] = None
     created_at: datetime
     
     model_config = ConfigDict(from_attributes=True)
@@ -35,6 +36,9 @@ class PaginatedProjectsResponse(BaseModel):
     page: int
     size: int
     pages: int
+    # Keyset cursors for the adjacent pages (pass as ``after`` / ``before``).
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
 
 from pydantic import BaseModel, ConfigDict, field_validator
 from domain.entities import parse_deadline
@@ -1,8 +1,14 @@
-from typing import Optional, Any, Dict
+from typing import Optional, Any, AsyncIterator, Dict, Sequence
+from datetime import datetime
+import csv
+import io
+import json
 import math
 import structlog
+from cachetools import TTLCache
 
-from dashboard_api.repositories.projects_repo import count_projects, get_paginated_projects
+from config import settings
+from dashboard_api.repositories.projects_repo import find_projects_page, iter_projects
 from dashboard_api.schemas.projects import PaginatedProjectsResponse, ProjectResponse, ProjectDetailsResponse, PaymentResponse
 from typing import List
 from infrastructure.repositories.project import ProjectRepository
@@ -12,27 +18,26 @@ from fastapi import HTTPException
 logger = structlog.get_logger(__name__)
 
 
-def _safe_price(value: Any) -> Optional[int]:
-    """Coerce price to int — handles string ('150'), float, None, or missing."""
-    if value is None:
-        return None
-    try:
-        return int(float(str(value)))
-    except (ValueError, TypeError):
-        return None
-
-
 def _to_project_response(doc: Dict[str, Any]) -> Optional[ProjectResponse]:
     """Convert a raw MongoDB document to a ProjectResponse, skipping _id."""
     try:
         clean = {k: v for k, v in doc.items() if k != "_id"}
-        clean["price"] = _safe_price(clean.get("price"))
         return ProjectResponse(**clean)
     except Exception as exc:
         logger.warning("Skipping malformed project document", error=str(exc), doc_id=doc.get("id"))
         return None
 
 
+# Total match count per filter signature. Paging and re-sorting reuse it
+# instead of counting again; dashboard writes clear it and the TTL bounds
+# how stale it gets after changes made from the bot.
+_totals: TTLCache = TTLCache(maxsize=1024, ttl=settings.DASHBOARD_TOTALS_TTL_SECONDS)
+
+
+def invalidate_project_totals() -> None:
+    _totals.clear()
+
+
 async def get_projects_page(
     page: int,
     size: int,
@@ -42,26 +47,37 @@ async def get_projects_page(
     sort_order: str = "desc",
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    export_all: bool = False
+    after: Optional[str] = None,
+    before: Optional[str] = None
 ) -> PaginatedProjectsResponse:
-    if export_all:
-        skip = 0
-        size = 0 # 0 limit means no limit in our repo layer
-    else:
-        skip = (page - 1) * size
+    signature = (status_filter, search_student_id, start_date, end_date)
+    total = _totals.get(signature)
 
-    total = await count_projects(status_filter, search_student_id, start_date, end_date)
-    items_raw = await get_paginated_projects(skip, size, status_filter, search_student_id, sort_by, sort_order, start_date, end_date)
+    result = await find_projects_page(
+        size,
+        status_filter,
+        search_student_id,
+        sort_by,
+        sort_order,
+        start_date,
+        end_date,
+        page=page, after=after, before=before, with_total=total is None,
+    )
+    if total is None:
+        total = _totals[signature] = result.total
 
-    items = [r for doc in items_raw if (r := _to_project_response(doc)) is not None]
-    pages = math.ceil(total / size) if size > 0 else 0
+    items = [r for doc in result.items if (r := _to_project_response(doc)) is not None]
+    pages = math.ceil(total / size)
 
     return PaginatedProjectsResponse(
         items=items,
         total=total,
-        page=page,
+        # A stale cursor falls back to the first page; say so, so the UI relabels it.
+        page=1 if result.restarted else page,
         size=size,
         pages=pages,
+        next_cursor=result.next_cursor,
+        prev_cursor=result.prev_cursor,
     )
 
 async def get_project_details(
@@ -74,8 +90,7 @@ async def get_project_details(
         raise HTTPException(status_code=404, detail="Project not found")
 
     clean = {k: v for k, v in doc.items() if k != "_id"}
-    clean["price"] = _safe_price(clean.get("price"))
-    
+
     payment_doc = await payment_repo.get_payment_by_project_id(proj_id)
     payment_response = None
     if payment_doc:
@@ -89,3 +104,60 @@ async def get_urgent_projects_list(project_repo: ProjectRepository) -> List[Proj
     items_raw = await project_repo.get_urgent_projects()
     items = [r for doc in items_raw if (r := _to_project_response(doc)) is not None]
     return items
+
+
+# Rows are buffered up to this many characters before a chunk is sent, so
+# the response (and GZip) sees a few large writes rather than one per row.
+_EXPORT_CHUNK_CHARS = 64 * 1024
+
+
+def _export_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def stream_projects_export(
+    fmt: str,
+    fields: Sequence[str],
+    status_filter: Optional[str] = None,
+    search_student_id: Optional[int] = None,
+    sort_by: str = "created_at",
+    sort_order: str = "desc",
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+) -> AsyncIterator[str]:
+    """
+    Encodes the matching projects as ``"csv"`` (header row first) or
+    ``"ndjson"`` (one object per line) while they are read from the
+    cursor; only ``fields`` are fetched and written.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    if writer:
+        writer.writerow(fields)
+
+    async for doc in iter_projects(
+        fields,
+        status_filter,
+        search_student_id,
+        sort_by,
+        sort_order,
+        start_date,
+        end_date,
+    ):
+        row = [_export_value(doc.get(f)) for f in fields]
+        if writer:
+            writer.writerow(row)
+        else:
+            buffer.write(
+                json.dumps(dict(zip(fields, row)), ensure_ascii=False, default=str)
+            )
+            buffer.write("\n")
+        if buffer.tell() >= _EXPORT_CHUNK_CHARS:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
@@ -6,20 +6,28 @@ export const projectKeys = {
   list: (params) => [...projectKeys.all, 'list', params],
 };
 
-export function useProjects(page, pageSize, statusFilter, studentId, sortBy, sortOrder) {
+// `cursor` ({ after } or { before }) comes from the adjacent page's
+// nextCursor / prevCursor; without it `page` is fetched by offset.
+export function useProjects(page, pageSize, statusFilter, studentId, sortBy, sortOrder, cursor = null) {
   return useQuery({
-    queryKey: projectKeys.list({ page, pageSize, statusFilter, studentId, sortBy, sortOrder }),
+    queryKey: projectKeys.list({ page, pageSize, statusFilter, studentId, sortBy, sortOrder, cursor }),
     queryFn: async () => {
       const params = { page, size: pageSize };
       if (statusFilter) params.status = statusFilter;
       if (studentId) params.student_id = studentId;
       if (sortBy) params.sort_by = sortBy;
       if (sortOrder) params.sort_order = sortOrder;
+      if (cursor?.after) params.after = cursor.after;
+      if (cursor?.before) params.before = cursor.before;
 
       const res = await apiClient.get('/projects/', { params });
       return {
         items: Array.isArray(res.data?.items) ? res.data.items : [],
         total: res.data?.total ?? 0,
+        // The server answers with page 1 when a stale cursor had to start over.
+        page: res.data?.page ?? page,
+        nextCursor: res.data?.next_cursor ?? null,
+        prevCursor: res.data?.prev_cursor ?? null,
       };
     },
     keepPreviousData: true,
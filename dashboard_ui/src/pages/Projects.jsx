@@ -11,6 +11,7 @@ import { motion } from 'framer-motion';
 
 export default function Projects() {
   const [page, setPage] = useState(1);
+  const [cursor, setCursor] = useState(null);
   const [pageSize] = useState(20);
   const [statusFilter, setStatusFilter] = useState('');
   const [studentId, setStudentId] = useState('');
@@ -37,64 +38,65 @@ export default function Projects() {
     const delayDebounceFn = setTimeout(() => {
       setDebouncedStudentId(studentId);
       setPage(1);
+      setCursor(null);
     }, 500);
 
     return () => clearTimeout(delayDebounceFn);
   }, [studentId]);
 
-  const { data, isLoading, isError, error, refetch } = useProjects(page, pageSize, statusFilter, debouncedStudentId, sortBy, sortOrder);
+  const { data, isLoading, isError, error, refetch } = useProjects(page, pageSize, statusFilter, debouncedStudentId, sortBy, sortOrder, cursor);
   const { sendOffer, denyProject, finishProject } = useProjectMutations();
 
+  // A cursor whose rows are gone comes back as page 1; follow it.
+  useEffect(() => {
+    if (data?.page && data.page !== page) {
+      setPage(data.page);
+      setCursor(null);
+    }
+  }, [data?.page]);
+
+  // Next / previous page seek from the current page's boundary rows;
+  // jumps further away fall back to an offset read.
+  const handlePageChange = (nextPage) => {
+    if (nextPage === page + 1 && data?.nextCursor) setCursor({ after: data.nextCursor });
+    else if (nextPage === page - 1 && data?.prevCursor) setCursor({ before: data.prevCursor });
+    else setCursor(null);
+    setPage(nextPage);
+  };
+
   const handleSearchChange = (e) => setStudentId(e.target.value);
   const handleStatusChange = (e) => {
     setStatusFilter(e.target.value);
     setPage(1);
+    setCursor(null);
   };
   const handleSort = (column, order) => {
     setSortBy(column);
     setSortOrder(order);
     setPage(1);
+    setCursor(null);
   };
 
   const handleExportCSV = async () => {
     try {
-      const params = new URLSearchParams({ export_all: 'true' });
+      const params = new URLSearchParams({
+        format: 'csv',
+        fields: 'id,user_full_name,username,user_id,subject_name,status,deadline,price,currency',
+      });
       if (statusFilter) params.append('status', statusFilter);
       if (debouncedStudentId) params.append('student_id', debouncedStudentId);
       if (sortBy) params.append('sort_by', sortBy);
       if (sortOrder) params.append('sort_order', sortOrder);
 
-      const res = await window.fetch(`/api/projects/?${params.toString()}`, {
+      // The server streams the CSV; the browser only holds the finished file.
+      const res = await window.fetch(`/api/projects/export?${params.toString()}`, {
         headers: {
           'Authorization': `Bearer ${localStorage.getItem('token')}`
         }
       });
       if (!res.ok) throw new Error('Export failed');
-      const json = await res.json();
-      
-      const items = json.items || [];
-      if (items.length === 0) {
-        showToast('No projects to export', 'error');
-        return;
-      }
-      
-      // Convert JSON to CSV
-      const headers = ['ID', 'Student Name', 'Student ID', 'Subject', 'Status', 'Deadline', 'Price'];
-      const rows = items.map(p => [
-        p.id,
-        `"${p.user_full_name || p.username || ''}"`,
-        p.user_id,
-        `"${p.subject_name}"`,
-        p.status,
-        p.deadline || '',
-        p.price || ''
-      ]);
-      const csvContent = [
-        headers.join(','),
-        ...rows.map(r => r.join(','))
-      ].join('\n');
 
-      const blob = new Blob([csvContent], { type: 'text/csv;charset=utf-8;' });
+      const blob = await res.blob();
       const url = URL.createObjectURL(blob);
       const link = document.createElement('a');
       link.setAttribute('href', url);
@@ -103,6 +105,7 @@ export default function Projects() {
       document.body.appendChild(link);
       link.click();
       document.body.removeChild(link);
+      URL.revokeObjectURL(url);
     } catch (err) {
       showToast('Export failed', 'error');
     }
@@ -330,7 +333,7 @@ export default function Projects() {
         total={data?.total || 0} 
         page={page} 
         pageSize={pageSize} 
-        onPageChange={setPage}
+        onPageChange={handlePageChange}
         onSort={handleSort}
         sortBy={sortBy}
         sortOrder={sortOrder}
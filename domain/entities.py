@@ -9,12 +9,13 @@ from datetime import datetime, timezone
 from typing import List, Optional
 from uuid import uuid4
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, computed_field, field_validator
 
 from domain.enums import (
     PaymentStatus, ProjectStatus, TicketStatus, AuditEventType,
     MatchStatus, TeamRequestStatus,
 )
+from domain.text import normalize_key
 from utils.constants import (
     MSG_INVALID_DATE_FORMAT,
     MSG_INVALID_DATE_VALUES,
@@ -73,7 +74,8 @@ class Project(BaseModel):
     details: str
     attachments: List[dict] = Field(default_factory=list)
     status: ProjectStatus = Field(default=ProjectStatus.PENDING)
-    price: Optional[int] = None
+    price: Optional[int] = None  # whole units of ``currency`` (domain.money)
+    currency: Optional[str] = None
     delivery_date: Optional[str] = None
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc)
@@ -101,17 +103,34 @@ class Payment(BaseModel):
     model_config = ConfigDict(use_enum_values=True)
 
 
+# Messages per ticket_messages bucket document.
+MESSAGE_BUCKET_SIZE = 50
+
+
 class TicketMessage(BaseModel):
     """A single message inside a support ticket conversation."""
     sender: str                        # "user" | "admin"
     text: Optional[str] = None
     file_id: Optional[str] = None
     file_type: Optional[str] = None    # photo / document / video / …
+    seq: int = 0                       # position in the conversation, from 0
     timestamp: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc)
     )
 
 
+class TicketMessageBucket(BaseModel):
+    """
+    Document in the ticket_messages collection: up to
+    MESSAGE_BUCKET_SIZE consecutive messages of one ticket.
+    Message ``seq`` lives in bucket ``seq // MESSAGE_BUCKET_SIZE``.
+    """
+    ticket_id: int
+    bucket: int
+    count: int = 0
+    messages: List[TicketMessage] = Field(default_factory=list)
+
+
 class Ticket(BaseModel):
     """Root document for the tickets collection."""
     ticket_id: int
@@ -120,7 +139,10 @@ class Ticket(BaseModel):
     user_full_name: Optional[str] = None
     message_thread_id: Optional[int] = None  # Telegram Forum Topic ID
     status: TicketStatus = Field(default=TicketStatus.OPEN)
-    messages: List[TicketMessage] = Field(default_factory=list)
+    # Messages live in ticket_messages; these two are kept in sync by
+    # TicketRepository.add_message for list views.
+    message_count: int = 0
+    last_message: Optional[TicketMessage] = None
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc)
     )
@@ -184,6 +206,17 @@ class TeamRequest(BaseModel):
 
     model_config = ConfigDict(use_enum_values=True)
 
+    # Stored lookup keys for the duplicate / involvement checks.
+    @computed_field
+    @property
+    def course_key(self) -> str:
+        return normalize_key(self.course_name)
+
+    @computed_field
+    @property
+    def doctor_key(self) -> str:
+        return normalize_key(self.doctor_name)
+
 
 class ReferralUser(BaseModel):
     """Tracks a bot user's referral chain and ShamCash balance."""
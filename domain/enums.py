@@ -12,24 +12,31 @@ from enum import Enum
 
 
 class ProjectStatus(str, Enum):
-    PENDING               = "pending"
-    ACCEPTED              = "accepted"
+    PENDING = "pending"
+    ACCEPTED = "accepted"
     AWAITING_VERIFICATION = "awaiting_verification"
-    FINISHED              = "finished"
-    OFFERED               = "offered"
-    DENIED_ADMIN          = "denied_admin"
-    DENIED_STUDENT        = "denied_student"
-    REJECTED_PAYMENT      = "rejected_payment"
+    FINISHED = "finished"
+    OFFERED = "offered"
+    DENIED_ADMIN = "denied_admin"
+    DENIED_STUDENT = "denied_student"
+    REJECTED_PAYMENT = "rejected_payment"
+
+
+class AttentionReason(str, Enum):
+    """Why a project is on the admin "urgent cases" list."""
+    PENDING_REVIEW = "pending_review"
+    PAYMENT_UNVERIFIED = "payment_unverified"
+    DELIVERY_DUE = "delivery_due"
 
 
 class PaymentStatus(str, Enum):
-    PENDING  = "pending"
+    PENDING = "pending"
     ACCEPTED = "accepted"
     REJECTED = "rejected"
 
 
 class TicketStatus(str, Enum):
-    OPEN   = "open"
+    OPEN = "open"
     CLOSED = "closed"
 
 
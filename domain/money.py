@@ -0,0 +1,47 @@
+"""
+Domain – Prices
+===============
+A project's ``price`` is stored as a whole number of ``currency`` units
+(``PRICE_CURRENCY``, Syrian pounds). ``parse_price`` is the one place
+that turns admin input or legacy stored values into that form; the
+repository refuses anything it cannot parse.
+
+    parse_price(150)          -> 150
+    parse_price("150")        -> 150
+    parse_price("150.0")      -> 150
+    parse_price("150,000 SP") -> 150000
+    parse_price(Decimal128("150")) -> 150
+    parse_price("free")       -> None
+"""
+import math
+import re
+from decimal import Decimal
+from typing import Any, Optional
+
+PRICE_CURRENCY = "SYP"
+
+_NON_DIGITS = re.compile(r"[^\d]")
+
+
+def parse_price(value: Any) -> Optional[int]:
+    """Whole-unit price for ``value``; ``None`` if it holds no number."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value) if math.isfinite(value) else None
+    if hasattr(value, "to_decimal"):
+        # bson.Decimal128, as stored by the driver; no bson import in the domain.
+        value = value.to_decimal()
+    if isinstance(value, Decimal):
+        return int(value) if value.is_finite() else None
+    if isinstance(value, str):
+        text = value.strip()
+        try:
+            number = float(text)
+        except ValueError:
+            digits = _NON_DIGITS.sub("", text)
+            return int(digits) if digits else None
+        return int(number) if math.isfinite(number) else None
+    return None
@@ -0,0 +1,49 @@
+"""
+Domain – Keyset Pagination
+==========================
+``Page`` is what the paged repository reads return: exactly one page of
+documents plus the total match count and the cursors for the adjacent
+pages.
+
+A cursor is the sort key of a boundary document, dot-joined so it fits
+in callback data (``"123"`` or ``"1.123"``). ``after`` continues past a
+page's last item (next page), ``before`` comes back from a page's first
+item (previous page). Cursors are opaque outside the repository that
+produced them.
+
+Offset-paged reads (the admin master report) leave the cursors unset and
+fill ``counts`` with per-category totals instead; ``page`` is the page
+actually returned, which is the last one when the requested page is
+past the end.
+
+``restarted`` is set when a cursor no longer led anywhere (the rows
+beyond it are gone) and the first page was returned instead; callers
+that number their pages should show page 1.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@dataclass
+class Page:
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    total: int = 0
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    counts: Dict[str, int] = field(default_factory=dict)
+    restarted: bool = False
+    page: Optional[int] = None
+
+
+def encode_cursor(*key: int) -> str:
+    return ".".join(str(int(part)) for part in key)
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[int, ...]]:
+    """Parses a cursor; ``None`` for empty or malformed input (first page)."""
+    if not cursor:
+        return None
+    try:
+        return tuple(int(part) for part in cursor.split("."))
+    except ValueError:
+        return None
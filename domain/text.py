@@ -0,0 +1,39 @@
+"""
+Domain – Text Keys
+==================
+``normalize_key`` turns free-typed names (course, doctor) into a stable
+lookup key, so "Data  Structures" / "data structures" or "مُقَرَّر" /
+"مقرر" compare equal with a plain equality match that an ordinary
+index can serve.
+
+The key is computed once, at write time, and stored next to the
+original text; queries normalise their input the same way.
+
+Normalisation
+-------------
+* Unicode NFKC, then ``casefold``.
+* Tashkeel (harakat, shadda, sukun, superscript alef) and tatweel removed.
+* Alef forms ``أ إ آ ٱ`` → ``ا``; ``ى`` / Farsi ``ی`` → ``ي``; ``ة`` → ``ه``.
+* Surrounding whitespace trimmed, inner runs collapsed to one space.
+"""
+import re
+import unicodedata
+
+_TASHKEEL = re.compile("[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]")
+_WHITESPACE = re.compile(r"\s+")
+_LETTER_FORMS = str.maketrans({
+    "\u0623": "\u0627",  # أ
+    "\u0625": "\u0627",  # إ
+    "\u0622": "\u0627",  # آ
+    "\u0671": "\u0627",  # ٱ
+    "\u0649": "\u064a",  # ى
+    "\u06cc": "\u064a",  # ی
+    "\u0629": "\u0647",  # ة
+})
+
+
+def normalize_key(text: str) -> str:
+    """The comparison key for ``text`` (see module docstring)."""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = _TASHKEEL.sub("", text).translate(_LETTER_FORMS)
+    return _WHITESPACE.sub(" ", text).strip()
@@ -1,7 +1,7 @@
 import math
 
 from aiogram import Router, F, types, Bot
-from aiogram.filters import Command
+from aiogram.filters import Command, CommandObject
 from aiogram.fsm.context import FSMContext
 import structlog
 
@@ -27,10 +27,15 @@ from utils.constants import (
     MSG_TESTS_SUCCESS,
     MSG_TESTS_FAILED,
     MSG_TESTS_ERROR,
+    MSG_TRACE_DISABLED,
+    MSG_TRACE_ENABLED,
+    MSG_TRACE_USAGE,
+    MSG_TRACES_EMPTY,
 )
 from utils.formatters import format_datetime
 from utils.helpers import build_ticket_service
 from utils.pagination import build_nav_keyboard
+from utils.tracing import CallbackTracer
 
 router = Router()
 logger = structlog.get_logger()
@@ -151,6 +156,47 @@ async def admin_maintenance_off(message: types.Message, settings_repo: SettingsR
     await message.answer(MSG_MAINTENANCE_OFF)
 
 
+@router.message(Command("trace"), F.from_user.id.in_(settings.admin_ids))
+async def admin_trace_user(
+    message: types.Message, command: CommandObject, callback_tracer: CallbackTracer
+):
+    """/trace <user_id> on|off — always record and log that user's callbacks."""
+    parts = (command.args or "").split()
+    if len(parts) != 2 or not parts[0].isdigit() or parts[1] not in ("on", "off"):
+        await message.answer(MSG_TRACE_USAGE)
+        return
+
+    user_id = int(parts[0])
+    if parts[1] == "on":
+        callback_tracer.enable_user(user_id)
+        await message.answer(MSG_TRACE_ENABLED.format(user_id))
+    else:
+        callback_tracer.disable_user(user_id)
+        await message.answer(MSG_TRACE_DISABLED.format(user_id))
+    logger.info(
+        "Callback tracing toggled",
+        admin_id=message.from_user.id,
+        user_id=user_id,
+        state=parts[1],
+    )
+
+
+@router.message(Command("traces"), F.from_user.id.in_(settings.admin_ids))
+async def admin_dump_traces(
+    message: types.Message, command: CommandObject, callback_tracer: CallbackTracer
+):
+    """/traces [n] — dump the most recent callback traces (default 30)."""
+    limit = int(command.args) if command.args and command.args.strip().isdigit() else 30
+    traces = callback_tracer.recent(limit)
+    if not traces:
+        await message.answer(MSG_TRACES_EMPTY)
+        return
+
+    text = "\n".join(trace.format() for trace in traces)
+    # Telegram caps messages at 4096 chars; keep the newest lines.
+    await message.answer(text[-4000:])
+
+
 
 
 
@@ -181,10 +227,9 @@ async def _render_admin_tickets(
         created = format_datetime(t.get("created_at", ""), fmt="%Y-%m-%d %H:%M")
             
         # Get last message
-        messages = t.get("messages", [])
+        last_msg_obj = t.get("last_message")
         last_msg = ""
-        if messages:
-            last_msg_obj = messages[-1]
+        if last_msg_obj:
             last_msg_text = last_msg_obj.get("text") or MSG_ADMIN_ATTACHMENT_LABEL
             # Trim message if too long
             if len(last_msg_text) > 40:
@@ -19,7 +19,8 @@ from utils.formatters import (
     format_project_history,
     format_project_list,
 )
-from utils.pagination import build_nav_keyboard, paginate
+from domain.pagination import Page
+from utils.pagination import build_nav_keyboard
 
 router = Router()
 logger = structlog.get_logger(__name__)
@@ -35,10 +36,16 @@ async def _render(
     page: int,
     back_action: str = "back_to_admin",
     extra_kb: types.InlineKeyboardMarkup | None = None,
+    result: Page | None = None,
 ) -> None:
     """Edit message, attach pagination footer, answer callback."""
     kb = extra_kb if extra_kb and total_pages == 1 else build_nav_keyboard(
-        action=action, page=page, total_pages=total_pages, back_action=back_action
+        action=action,
+        page=page,
+        total_pages=total_pages,
+        back_action=back_action,
+        next_cursor=result.next_cursor if result else None,
+        prev_cursor=result.prev_cursor if result else None,
     )
     try:
         await callback.message.edit_text(text, parse_mode="Markdown", reply_markup=kb)
@@ -52,8 +59,12 @@ async def _render(
 async def _render_master_page(
     callback: types.CallbackQuery, project_repo: ProjectRepository, page: int
 ) -> None:
-    projects = await GetCategorizedProjectsService(project_repo).execute()
-    text, total_pages = format_master_report(projects, page=page)
+    result = await GetCategorizedProjectsService(project_repo).execute(page=page)
+    # Past the end the report returns its last page; number the buttons from that.
+    page = result.page
+    text, total_pages = format_master_report(
+        result.items, page=page, total=result.total, counts=result.counts
+    )
     await _render(callback, text, total_pages, "all_projects", page)
 
 
@@ -82,16 +93,25 @@ async def view_all_page(
 # ── PENDING PROJECTS ─────────────────────────────────────────────────────────
 
 async def _render_pending(
-    callback: types.CallbackQuery, project_repo: ProjectRepository, page: int
+    callback: types.CallbackQuery,
+    project_repo: ProjectRepository,
+    page: int,
+    after: str | None = None,
+    before: str | None = None,
 ) -> None:
-    projects = await GetPendingProjectsService(project_repo).execute()
-    text, total_pages = format_project_list(projects, MSG_PENDING_PROJECTS_HEADER, page=page)
+    result = await GetPendingProjectsService(project_repo).execute_page(
+        after=after, before=before
+    )
+    # A stale cursor starts over at the first page.
+    page = 0 if result.restarted else page
+    text, total_pages = format_project_list(
+        result.items, MSG_PENDING_PROJECTS_HEADER, page=page, total=result.total
+    )
 
-    slice_, _, _ = paginate(projects, page)
-    item_kb = KeyboardFactory.pending_projects(slice_)
+    item_kb = KeyboardFactory.pending_projects(result.items)
 
     if total_pages > 1:
-        kb = _merge_item_and_nav(item_kb, "pending", page, total_pages)
+        kb = _merge_item_and_nav(item_kb, "pending", page, total_pages, result)
     else:
         kb = item_kb
 
@@ -121,22 +141,37 @@ async def admin_pending_page(
     callback_data: PageCallback,
     project_repo: ProjectRepository,
 ):
-    await _render_pending(callback, project_repo, page=callback_data.page)
+    await _render_pending(
+        callback,
+        project_repo,
+        callback_data.page,
+        callback_data.after,
+        callback_data.before,
+    )
 
 
 # ── ACCEPTED / ONGOING PROJECTS ───────────────────────────────────────────────
 
 async def _render_accepted(
-    callback: types.CallbackQuery, project_repo: ProjectRepository, page: int
+    callback: types.CallbackQuery,
+    project_repo: ProjectRepository,
+    page: int,
+    after: str | None = None,
+    before: str | None = None,
 ) -> None:
-    projects = await GetOngoingProjectsService(project_repo).execute()
-    text, total_pages = format_project_list(projects, MSG_ONGOING_PROJECTS_HEADER, page=page)
+    result = await GetOngoingProjectsService(project_repo).execute_page(
+        after=after, before=before
+    )
+    # A stale cursor starts over at the first page.
+    page = 0 if result.restarted else page
+    text, total_pages = format_project_list(
+        result.items, MSG_ONGOING_PROJECTS_HEADER, page=page, total=result.total
+    )
 
-    slice_, _, _ = paginate(projects, page)
-    item_kb = KeyboardFactory.accepted_projects(slice_)
+    item_kb = KeyboardFactory.accepted_projects(result.items)
 
     if total_pages > 1:
-        kb = _merge_item_and_nav(item_kb, "accepted", page, total_pages)
+        kb = _merge_item_and_nav(item_kb, "accepted", page, total_pages, result)
     else:
         kb = item_kb
 
@@ -166,17 +201,33 @@ async def admin_accepted_page(
     callback_data: PageCallback,
     project_repo: ProjectRepository,
 ):
-    await _render_accepted(callback, project_repo, page=callback_data.page)
+    await _render_accepted(
+        callback,
+        project_repo,
+        callback_data.page,
+        callback_data.after,
+        callback_data.before,
+    )
 
 
 # ── HISTORY ───────────────────────────────────────────────────────────────────
 
 async def _render_history(
-    callback: types.CallbackQuery, project_repo: ProjectRepository, page: int
+    callback: types.CallbackQuery,
+    project_repo: ProjectRepository,
+    page: int,
+    after: str | None = None,
+    before: str | None = None,
 ) -> None:
-    history = await GetProjectHistoryService(project_repo).execute()
-    text, total_pages = format_project_history(history, page=page)
-    await _render(callback, text, total_pages, "history", page)
+    result = await GetProjectHistoryService(project_repo).execute_page(
+        after=after, before=before
+    )
+    # A stale cursor starts over at the first page.
+    page = 0 if result.restarted else page
+    text, total_pages = format_project_history(
+        result.items, page=page, total=result.total
+    )
+    await _render(callback, text, total_pages, "history", page, result=result)
 
 
 @router.callback_query(
@@ -198,22 +249,35 @@ async def admin_history_page(
     callback_data: PageCallback,
     project_repo: ProjectRepository,
 ):
-    await _render_history(callback, project_repo, page=callback_data.page)
+    await _render_history(
+        callback,
+        project_repo,
+        callback_data.page,
+        callback_data.after,
+        callback_data.before,
+    )
 
 
 # ── PAYMENTS ──────────────────────────────────────────────────────────────────
 
 async def _render_payments(
-    callback: types.CallbackQuery, payment_repo: PaymentRepository, page: int
+    callback: types.CallbackQuery,
+    payment_repo: PaymentRepository,
+    page: int,
+    after: str | None = None,
+    before: str | None = None,
 ) -> None:
-    payments = await GetAllPaymentsService(payment_repo).execute()
-    text, total_pages = format_payment_list(payments, page=page)
+    result = await GetAllPaymentsService(payment_repo).execute_page(
+        after=after, before=before
+    )
+    # A stale cursor starts over at the first page.
+    page = 0 if result.restarted else page
+    text, total_pages = format_payment_list(result.items, page=page, total=result.total)
 
-    slice_, _, _ = paginate(payments, page)
-    item_kb = KeyboardFactory.payment_history(slice_)
+    item_kb = KeyboardFactory.payment_history(result.items)
 
     if total_pages > 1:
-        kb = _merge_item_and_nav(item_kb, "payments", page, total_pages)
+        kb = _merge_item_and_nav(item_kb, "payments", page, total_pages, result)
     else:
         kb = item_kb
 
@@ -243,7 +307,13 @@ async def admin_payments_page(
     callback_data: PageCallback,
     payment_repo: PaymentRepository,
 ):
-    await _render_payments(callback, payment_repo, page=callback_data.page)
+    await _render_payments(
+        callback,
+        payment_repo,
+        callback_data.page,
+        callback_data.after,
+        callback_data.before,
+    )
 
 
 # ── INTERNAL HELPER ───────────────────────────────────────────────────────────
@@ -253,6 +323,7 @@ def _merge_item_and_nav(
     action: str,
     page: int,
     total_pages: int,
+    result: Page | None = None,
 ) -> types.InlineKeyboardMarkup:
     from aiogram.utils.keyboard import InlineKeyboardBuilder
     from aiogram import types as tg_types
@@ -274,4 +345,6 @@ def _merge_item_and_nav(
         total_pages=total_pages,
         builder=builder,
         back_callback_data=back_action_data,
+        next_cursor=result.next_cursor if result else None,
+        prev_cursor=result.prev_cursor if result else None,
     )
@@ -237,10 +237,10 @@ async def view_ticket(
     # Store ticket_id in FSM data for pagination
     await state.update_data(viewing_ticket_id=callback_data.id)
 
+    total = ticket.get("message_count", 0)
     messages = await service.get_conversation_history(
-        callback_data.id, page=0, page_size=MESSAGES_PER_PAGE
+        callback_data.id, page=0, page_size=MESSAGES_PER_PAGE, total=total
     )
-    total = await service.get_message_count(callback_data.id)
     total_pages = max(1, math.ceil(total / MESSAGES_PER_PAGE))
 
     status_label = MSG_TICKET_STATUS_OPEN if ticket["status"] == "open" else MSG_TICKET_STATUS_CLOSED
@@ -294,10 +294,10 @@ async def paginate_ticket_messages(
     page = callback_data.page
     service = build_ticket_service(ticket_repo, bot)
 
+    total = await service.get_message_count(ticket_id)
     messages = await service.get_conversation_history(
-        ticket_id, page=page, page_size=MESSAGES_PER_PAGE
+        ticket_id, page=page, page_size=MESSAGES_PER_PAGE, total=total
     )
-    total = await service.get_message_count(ticket_id)
     total_pages = max(1, math.ceil(total / MESSAGES_PER_PAGE))
 
     header = (
@@ -18,7 +18,7 @@ from utils.formatters import (
     format_student_projects,
 )
 from aiogram.utils.keyboard import InlineKeyboardBuilder
-from utils.pagination import build_nav_keyboard, paginate
+from utils.pagination import build_nav_keyboard
 
 router = Router()
 logger = structlog.get_logger(__name__)
@@ -32,12 +32,27 @@ async def cb_view_projects(
 
 
 async def _render_my_projects(
-    callback: types.CallbackQuery, project_repo: ProjectRepository, page: int
+    callback: types.CallbackQuery,
+    project_repo: ProjectRepository,
+    page: int,
+    after: str | None = None,
+    before: str | None = None,
 ) -> None:
-    projects = await GetStudentProjectsService(project_repo).execute(callback.from_user.id)
-    text, total_pages = format_student_projects(projects, page=page)
+    result = await GetStudentProjectsService(project_repo).execute_page(
+        callback.from_user.id, after=after, before=before
+    )
+    # A stale cursor starts over at the first page.
+    page = 0 if result.restarted else page
+    text, total_pages = format_student_projects(
+        result.items, page=page, total=result.total
+    )
     kb = build_nav_keyboard(
-        action="my_projects", page=page, total_pages=total_pages, back_action=MenuAction.close_list
+        action="my_projects",
+        page=page,
+        total_pages=total_pages,
+        back_action=MenuAction.close_list,
+        next_cursor=result.next_cursor,
+        prev_cursor=result.prev_cursor,
     )
     
     try:
@@ -56,16 +71,28 @@ async def cb_my_projects_page(
     callback_data: PageCallback,
     project_repo: ProjectRepository,
 ):
-    await _render_my_projects(callback, project_repo, page=callback_data.page)
+    await _render_my_projects(
+        callback,
+        project_repo,
+        callback_data.page,
+        callback_data.after,
+        callback_data.before,
+    )
 
 
 @router.message(F.text == BTN_MY_PROJECTS)
 @router.message(Command("my_projects"))
 async def view_projects(message: types.Message, project_repo: ProjectRepository):
-    projects = await GetStudentProjectsService(project_repo).execute(message.from_user.id)
-    text, total_pages = format_student_projects(projects)
+    result = await GetStudentProjectsService(project_repo).execute_page(
+        message.from_user.id
+    )
+    text, total_pages = format_student_projects(result.items, total=result.total)
     kb = build_nav_keyboard(
-        action="my_projects", page=0, total_pages=total_pages, back_action=MenuAction.close_list
+        action="my_projects",
+        page=0,
+        total_pages=total_pages,
+        back_action=MenuAction.close_list,
+        next_cursor=result.next_cursor,
     )
     await message.answer(text, parse_mode="Markdown", reply_markup=kb)
 
@@ -77,9 +104,9 @@ async def cb_view_offers(
     await _render_my_offers(callback, project_repo, page=0)
 
 
-def _build_offers_kb(slice_, page: int, total_pages: int):
+def _build_offers_kb(result, page: int, total_pages: int):
     builder = InlineKeyboardBuilder()
-    item_kb = KeyboardFactory.offers_list(slice_)
+    item_kb = KeyboardFactory.offers_list(result.items)
     for row in item_kb.inline_keyboard:
         builder.row(*row)
     
@@ -89,16 +116,25 @@ def _build_offers_kb(slice_, page: int, total_pages: int):
         total_pages=total_pages,
         back_action=MenuAction.close_list,
         builder=builder,
+        next_cursor=result.next_cursor,
+        prev_cursor=result.prev_cursor,
     )
 
 
 async def _render_my_offers(
-    callback: types.CallbackQuery, project_repo: ProjectRepository, page: int
+    callback: types.CallbackQuery,
+    project_repo: ProjectRepository,
+    page: int,
+    after: str | None = None,
+    before: str | None = None,
 ) -> None:
-    offers = await GetStudentOffersService(project_repo).execute(callback.from_user.id)
-    text, total_pages = format_offer_list(offers, page=page)
-    slice_, _, _ = paginate(offers, page)
-    item_kb = _build_offers_kb(slice_, page, total_pages)
+    result = await GetStudentOffersService(project_repo).execute_page(
+        callback.from_user.id, after=after, before=before
+    )
+    # A stale cursor starts over at the first page.
+    page = 0 if result.restarted else page
+    text, total_pages = format_offer_list(result.items, page=page, total=result.total)
+    item_kb = _build_offers_kb(result, page, total_pages)
         
     try:
         await callback.message.edit_text(text, parse_mode="Markdown", reply_markup=item_kb)
@@ -116,16 +152,23 @@ async def cb_my_offers_page(
     callback_data: PageCallback,
     project_repo: ProjectRepository,
 ):
-    await _render_my_offers(callback, project_repo, page=callback_data.page)
+    await _render_my_offers(
+        callback,
+        project_repo,
+        callback_data.page,
+        callback_data.after,
+        callback_data.before,
+    )
 
 
 @router.message(F.text == BTN_MY_OFFERS)
 @router.message(Command("my_offers"))
 async def view_offers(message: types.Message, project_repo: ProjectRepository):
-    offers = await GetStudentOffersService(project_repo).execute(message.from_user.id)
-    text, total_pages = format_offer_list(offers)
-    slice_, _, _ = paginate(offers, 0)
-    item_kb = _build_offers_kb(slice_, 0, total_pages)
+    result = await GetStudentOffersService(project_repo).execute_page(
+        message.from_user.id
+    )
+    text, total_pages = format_offer_list(result.items, total=result.total)
+    item_kb = _build_offers_kb(result, 0, total_pages)
     await message.answer(text, parse_mode="Markdown", reply_markup=item_kb)
 
 
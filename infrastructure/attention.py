@@ -0,0 +1,76 @@
+"""
+Infrastructure – Project Attention Fields
+=========================================
+Projects that need an admin carry two materialised fields:
+
+* ``attention_at``     – when the project becomes urgent
+* ``attention_reason`` – why (:class:`~domain.enums.AttentionReason`)
+
+Every write that changes ``status``, the payment state or
+``delivery_date`` recomputes them inside the same update
+(``ProjectRepository.add_project`` / ``update_status`` / ``update_offer``),
+so the urgent-cases list is one range scan of the sparse ``attention_at``
+index — ``{"attention_at": {"$lte": now}}`` — with no joins.
+
+====================== =============================== ==================
+status                 attention_at                    reason
+====================== =============================== ==================
+pending                created_at + 6 h                pending_review
+awaiting_verification  receipt submitted + 6 h         payment_unverified
+accepted / offered     delivery_date − 2 days          delivery_due
+anything else          (fields removed)
+====================== =============================== ==================
+
+A project without a parseable ``delivery_date`` (``YYYY-MM-DD…``) is
+never ``delivery_due``.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from domain.enums import AttentionReason, ProjectStatus
+
+URGENT_AFTER = timedelta(hours=6)
+DELIVERY_WARNING = timedelta(days=2)
+
+ATTENTION_FIELDS = ("attention_at", "attention_reason")
+
+_MS = 1000
+
+
+def _delivery_date_expr() -> Dict[str, Any]:
+    return {"$dateFromString": {
+        "dateString": {"$substrCP": [{"$ifNull": ["$delivery_date", ""]}, 0, 10]},
+        "format": "%Y-%m-%d",
+        "onError": None,
+        "onNull": None,
+    }}
+
+
+def attention_stages(status: str, now: datetime) -> List[Dict[str, Any]]:
+    """
+    Update-pipeline stages recomputing the attention fields for a project
+    that is (now) in ``status``. Append them after the stage that sets
+    ``status`` / ``delivery_date``.
+    """
+    if status == ProjectStatus.PENDING:
+        at: Any = {"$add": ["$created_at", int(URGENT_AFTER.total_seconds() * _MS)]}
+        reason = AttentionReason.PENDING_REVIEW
+    elif status == ProjectStatus.AWAITING_VERIFICATION:
+        at = now + URGENT_AFTER
+        reason = AttentionReason.PAYMENT_UNVERIFIED
+    elif status in (ProjectStatus.ACCEPTED, ProjectStatus.OFFERED):
+        warning_ms = int(DELIVERY_WARNING.total_seconds() * _MS)
+        at = {"$subtract": [_delivery_date_expr(), warning_ms]}
+        reason = AttentionReason.DELIVERY_DUE
+    else:
+        return [{"$unset": list(ATTENTION_FIELDS)}]
+
+    is_date = {"$eq": [{"$type": "$attention_at"}, "date"]}
+    return [
+        {"$set": {"attention_at": at}},
+        # Drop both fields when no date could be computed (e.g. no delivery date).
+        {"$set": {
+            "attention_at": {"$cond": [is_date, "$attention_at", "$$REMOVE"]},
+            "attention_reason": {"$cond": [is_date, reason.value, "$$REMOVE"]},
+        }},
+    ]
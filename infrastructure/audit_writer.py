@@ -0,0 +1,140 @@
+"""
+Infrastructure – Write-behind Audit Writer
+==========================================
+Takes audit-log writes off the request path. ``AuditRepository.log_event``
+hands the finished document to :data:`audit_writer`, which only appends
+it to an in-memory buffer; a background task writes the buffer with
+``insert_many(ordered=False)`` whenever ``batch_size`` events are waiting
+or ``flush_interval`` seconds have passed.
+
+``audit_logs`` is a time-series collection (time ``created_at``, meta
+``entity_id``) that expires documents after ``AUDIT_RETENTION_DAYS`` —
+see the ``audit_logs_timeseries`` migration in ``infrastructure.schema``.
+
+Failure handling
+----------------
+* Buffer full (``buffer_size``) → the event is dropped.
+* Insert error → the batch goes back to the front of the buffer and is
+  retried on the next tick, as long as it fits; otherwise it is dropped.
+* Individual documents rejected by the server are dropped.
+
+Every outcome is counted in ``bot_audit_events_total{outcome}``.
+
+Usage in main.py
+----------------
+::
+
+    audit_writer.start(Database.db)
+    ...
+    await audit_writer.stop()     # drains everything still buffered
+
+Until ``start`` is called (scripts, tests) the repository writes directly.
+"""
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import structlog
+from pymongo.errors import BulkWriteError
+
+from config import settings
+from utils.metrics import AUDIT_EVENTS
+
+logger = structlog.get_logger(__name__)
+
+
+class AuditWriter:
+    def __init__(
+        self,
+        *,
+        batch_size: int = 100,
+        flush_interval: float = 2.0,
+        buffer_size: int = 10_000,
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.buffer_size = buffer_size
+        self._buffer: List[Dict[str, Any]] = []
+        self._db = None
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, db) -> None:
+        if self.running:
+            return
+        self._db = db
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="audit_writer")
+        logger.info(
+            "Audit writer started",
+            batch_size=self.batch_size,
+            flush_interval=self.flush_interval,
+        )
+
+    def enqueue(self, doc: Dict[str, Any]) -> bool:
+        """Buffers one document; never blocks. ``False`` if it was dropped."""
+        if len(self._buffer) >= self.buffer_size:
+            AUDIT_EVENTS.labels("dropped").inc()
+            return False
+        self._buffer.append(doc)
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+            if self._stopping:
+                return
+
+    async def flush(self) -> None:
+        """Writes everything buffered so far, one ``batch_size`` at a time."""
+        while self._buffer:
+            batch = self._buffer[:self.batch_size]
+            del self._buffer[:self.batch_size]
+            try:
+                await self._db.audit_logs.insert_many(batch, ordered=False)
+            except BulkWriteError as e:
+                written = e.details.get("nInserted", 0)
+                AUDIT_EVENTS.labels("written").inc(written)
+                AUDIT_EVENTS.labels("failed").inc(len(batch) - written)
+                logger.error("Audit documents rejected", rejected=len(batch) - written)
+                continue
+            except Exception as e:
+                if self._stopping or len(self._buffer) + len(batch) > self.buffer_size:
+                    AUDIT_EVENTS.labels("failed").inc(len(batch))
+                    logger.error("Audit batch lost", size=len(batch), error=str(e))
+                else:
+                    self._buffer[:0] = batch
+                    logger.warning(
+                        "Audit flush failed, will retry", size=len(batch), error=str(e)
+                    )
+                return
+            AUDIT_EVENTS.labels("written").inc(len(batch))
+
+    async def stop(self) -> None:
+        """Stops the background task after a final flush of the buffer."""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        logger.info("Audit writer stopped", undelivered=len(self._buffer))
+
+
+audit_writer = AuditWriter(
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL,
+    buffer_size=settings.AUDIT_BUFFER_SIZE,
+)
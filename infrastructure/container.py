@@ -0,0 +1,156 @@
+"""
+Infrastructure – Dependency Container
+======================================
+Per-process registry of lazily-built singletons (repositories and the
+few services handlers receive directly), keyed by the handler parameter
+name they are injected as.
+
+Repositories only hold a reference to the Motor ``db`` handle, so one
+instance per process is safe to share between concurrent updates.
+
+Adding a cached or instrumented variant of a repository is a one-line
+change in :func:`build_default_container`; handlers keep declaring the
+same parameter name. Every repository is wrapped in
+``utils.metrics.instrument_repository`` so Mongo latency is recorded per
+repository method.
+"""
+from typing import Any, Callable, Dict, FrozenSet, Iterable
+
+from aiogram import Router
+
+from infrastructure.mongo_db import Database
+from infrastructure.redis_client import redis_client
+from infrastructure.repositories import (
+    AuditRepository,
+    CachedSettingsRepository,
+    PaymentRepository,
+    ProjectRepository,
+    SettingsRepository,
+    StatsRepository,
+    StudentRepository,
+    TeamRequestRepository,
+    TicketRepository,
+    UserReferralRepository,
+)
+
+from utils.metrics import instrument_repository
+
+Provider = Callable[["DependencyContainer"], Any]
+
+
+class DependencyContainer:
+    """
+    Resolves named dependencies, building each one at most once.
+
+    Providers receive the container so they can depend on each other
+    (``container.db`` or ``container.resolve("other_name")``).
+    """
+
+    def __init__(self) -> None:
+        self._providers: Dict[str, Provider] = {}
+        self._instances: Dict[str, Any] = {}
+        # id(HandlerObject) -> dependency names its callback declares
+        self._handler_deps: Dict[int, FrozenSet[str]] = {}
+
+    @property
+    def db(self):
+        return Database.db
+
+    @property
+    def names(self) -> FrozenSet[str]:
+        return frozenset(self._providers)
+
+    def register(self, name: str, provider: Provider) -> None:
+        self._providers[name] = provider
+        self._instances.pop(name, None)
+
+    def resolve(self, name: str) -> Any:
+        try:
+            return self._instances[name]
+        except KeyError:
+            instance = self._providers[name](self)
+            self._instances[name] = instance
+            return instance
+
+    def reset(self) -> None:
+        """Drops all built instances (e.g. after the DB handle changed)."""
+        self._instances.clear()
+
+    # ── Handler wiring ────────────────────────────────────────────────────
+
+    def dependencies_for(self, handler) -> FrozenSet[str]:
+        """
+        Names this container should inject for an aiogram ``HandlerObject``.
+
+        aiogram already inspected the callback signature when the handler
+        was registered (``handler.params`` / ``handler.varkw``); we only
+        intersect it with our provider names, once per handler.
+        """
+        key = id(handler)
+        deps = self._handler_deps.get(key)
+        if deps is None:
+            if handler.varkw:
+                deps = self.names
+            else:
+                deps = self.names.intersection(handler.params)
+            self._handler_deps[key] = deps
+        return deps
+
+    def wire(self, router: Router) -> None:
+        """Pre-computes dependencies for every handler in the router tree."""
+        for handler in _iter_handlers(router):
+            self.dependencies_for(handler)
+
+
+def _iter_handlers(router: Router) -> Iterable[Any]:
+    for observer in router.observers.values():
+        yield from observer.handlers
+    for sub_router in router.sub_routers:
+        yield from _iter_handlers(sub_router)
+
+
+def build_default_container() -> DependencyContainer:
+    """Registers every dependency handlers can currently declare."""
+    # Imported lazily: infrastructure must not import the application layer
+    # at module load time.
+    from application.withdrawal_service import WithdrawalService
+
+    container = DependencyContainer()
+    container.register(
+        "project_repo", lambda c: instrument_repository(ProjectRepository(c.db))
+    )
+    container.register(
+        "payment_repo", lambda c: instrument_repository(PaymentRepository(c.db))
+    )
+    container.register(
+        "stats_repo", lambda c: instrument_repository(StatsRepository(c.db))
+    )
+    # Only the Mongo-backed repository is timed; cache hits are not Mongo latency.
+    container.register(
+        "settings_repo",
+        lambda c: CachedSettingsRepository(
+            instrument_repository(SettingsRepository(c.db)), redis_client
+        ),
+    )
+    container.register(
+        "ticket_repo", lambda c: instrument_repository(TicketRepository(c.db))
+    )
+    container.register(
+        "audit_repo", lambda c: instrument_repository(AuditRepository(c.db))
+    )
+    container.register(
+        "team_request_repo",
+        lambda c: instrument_repository(TeamRequestRepository(c.db)),
+    )
+    container.register(
+        "student_repo", lambda c: instrument_repository(StudentRepository(c.db))
+    )
+    container.register(
+        "user_referral_repo",
+        lambda c: instrument_repository(UserReferralRepository(c.db)),
+    )
+    container.register(
+        "withdrawal_service",
+        lambda c: WithdrawalService(c.resolve("user_referral_repo")),
+    )
+    return container
@@ -4,37 +4,77 @@ Infrastructure – MongoDB Connection
 Manages the global MongoDB client and provides the `Database` class
 for lifecycle management (connect, index creation, sequence counters).
 
-Indexes created at startup
---------------------------
-projects:
-  - id          (unique)  – fast look-up by project ID
-  - user_id               – filter projects per student
-  - status                – filter by workflow state
-  - created_at (desc)     – time-based sorting / stats
-
-payments:
-  - id          (unique)  – fast look-up by payment ID
-  - project_id            – find payment for a project
-  - status                – filter pending / accepted receipts
-  - created_at (desc)     – time-based sorting / stats
+Handles
+-------
+``Database.db``            – primary, default read concern. Everything the
+                             bot does, and any dashboard read that must
+                             see its own writes.
+``Database.analytics_db``  – ``secondaryPreferred`` with ``local`` read
+                             concern, for dashboard aggregations, so heavy
+                             reports run on a secondary instead of
+                             competing with student-facing traffic.
+
+Both share one pooled client configured from the ``MONGO_*`` settings
+(pool sizes, timeouts, wire compression).
+
+Sequence IDs are allocated hi-lo style: one ``$inc`` on ``counters``
+reserves a block of ``ID_BLOCK_SIZE`` IDs for this process, which are
+then handed out from memory. IDs are unique across replicas and
+increasing within a process; unused IDs of a block are lost on restart,
+so sequences have gaps.
+
+Indexes and data migrations are declared in ``infrastructure.schema``;
+``connect()`` applies them only when the stored schema version is behind.
 
 This module is the single place that knows about Motor / Motor-asyncio.
 Application and domain layers must never import from here directly;
 instead, use the `get_db` helper or receive `db` via DI middleware.
 """
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Dict
+
 import structlog
-from pymongo import DESCENDING
+from pymongo import ReadPreference
+from pymongo.read_concern import ReadConcern
 
 from motor.motor_asyncio import AsyncIOMotorClient
 
 from config import settings
+from infrastructure.schema import ensure_schema
 
 logger = structlog.get_logger()
 
 DB_NAME = settings.DB_NAME
 
+
+def client_options() -> Dict[str, Any]:
+    """Motor client keyword arguments built from ``settings``."""
+    options: Dict[str, Any] = {
+        "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": settings.MONGO_MAX_IDLE_TIME_MS,
+        "connectTimeoutMS": settings.MONGO_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "socketTimeoutMS": settings.MONGO_SOCKET_TIMEOUT_MS,
+    }
+    compressors = [
+        c.strip() for c in settings.MONGO_COMPRESSORS.split(",") if c.strip()
+    ]
+    if compressors:
+        # pymongo skips (with a warning) any compressor whose module is missing.
+        options["compressors"] = compressors
+    return options
+
+
 # Module-level client (lazy connection, one per process)
-mongo_client = AsyncIOMotorClient(settings.MONGO_URI)
+mongo_client = AsyncIOMotorClient(settings.MONGO_URI, **client_options())
+
+
+@dataclass
+class _IdBlock:
+    next_id: int = 0
+    last_id: int = -1  # inclusive; next_id > last_id means exhausted
 
 
 class Database:
@@ -42,77 +82,50 @@ class Database:
 
     client: AsyncIOMotorClient = mongo_client
     db = None  # Set by connect()
+    analytics_db = None  # Set by connect()
+    id_block_size: int = settings.ID_BLOCK_SIZE
+    _id_blocks: Dict[str, _IdBlock] = {}
+    _id_locks: Dict[str, asyncio.Lock] = {}
 
     @classmethod
     async def connect(cls) -> None:
-        """Initialises the MongoDB connection and ensures required indexes."""
+        """Initialises the MongoDB connection and brings the schema up to date."""
         cls.db = cls.client[DB_NAME]
-        logger.info("Connected to MongoDB", db_name=DB_NAME)
-
-        # --- Index creation ---
-        await cls.db.projects.create_index("id", unique=True)
-        await cls.db.projects.create_index("user_id")
-        await cls.db.projects.create_index("status")
-        await cls.db.projects.create_index([("created_at", DESCENDING)])
-
-        await cls.db.payments.create_index("id", unique=True)
-        await cls.db.payments.create_index("project_id")
-        await cls.db.payments.create_index("status")
-        await cls.db.payments.create_index([("created_at", DESCENDING)])
-
-        # FSM state storage — compound index for fast per-user look-ups
-        await cls.db.fsm_states.create_index(
-            [("chat_id", 1), ("user_id", 1)],
-            unique=True,
-        )
-
-        # --- Ticket indexes ---
-        await cls.db.tickets.create_index("ticket_id", unique=True)
-
-        # Drop the old message_thread_id index if it exists with stale
-        # null values, then recreate with sparse=True.
-        try:
-            await cls.db.tickets.drop_index("message_thread_id_1")
-        except Exception:
-            pass  # index doesn't exist yet — first run
-        # Clean up any documents where the field is explicitly null
-        # (they break the sparse unique constraint).
-        await cls.db.tickets.update_many(
-            {"message_thread_id": None},
-            {"$unset": {"message_thread_id": ""}},
-        )
-        await cls.db.tickets.create_index(
-            "message_thread_id", unique=True, sparse=True
-        )
-
-        await cls.db.tickets.create_index("user_id")
-        await cls.db.tickets.create_index(
-            [("user_id", 1), ("status", 1)]
+        cls.analytics_db = cls.client.get_database(
+            DB_NAME,
+            read_preference=ReadPreference.SECONDARY_PREFERRED,
+            read_concern=ReadConcern("local"),
         )
+        logger.info("Connected to MongoDB", db_name=DB_NAME)
 
-        # --- Team request indexes ---
-        await cls.db.team_requests.create_index("id", unique=True)
-        await cls.db.team_requests.create_index("host_id")
-        await cls.db.team_requests.create_index("status")
-        await cls.db.team_requests.create_index(
-            [("course_name", 1), ("status", 1)]
-        )
-        await cls.db.team_requests.create_index(
-            [("status", 1), ("course_name", 1), ("created_at", -1)]
-        )
-        await cls.db.team_requests.create_index(
-            [("host_id", 1), ("status", 1), ("created_at", -1)]
-        )
+        await ensure_schema(cls.db)
 
     @classmethod
     async def get_next_sequence(cls, sequence_name: str) -> int:
-        """Atomically increments and returns the next integer ID."""
+        """Returns the next integer ID, reserving a new block when needed."""
+        block = cls._id_blocks.get(sequence_name)
+        if block is not None and block.next_id <= block.last_id:
+            block.next_id += 1
+            return block.next_id - 1
+
+        lock = cls._id_locks.setdefault(sequence_name, asyncio.Lock())
+        async with lock:
+            block = cls._id_blocks.setdefault(sequence_name, _IdBlock())
+            if block.next_id > block.last_id:
+                last_id = await cls._reserve_ids(sequence_name, cls.id_block_size)
+                block.next_id, block.last_id = last_id - cls.id_block_size + 1, last_id
+            block.next_id += 1
+            return block.next_id - 1
+
+    @classmethod
+    async def _reserve_ids(cls, sequence_name: str, count: int) -> int:
+        """Atomically advances the counter by ``count``; returns the new value."""
         if cls.db is None:
             await cls.connect()
 
         result = await cls.db.counters.find_one_and_update(
             {"_id": sequence_name},
-            {"$inc": {"seq": 1}},
+            {"$inc": {"seq": count}},
             upsert=True,
             return_document=True,
         )
@@ -126,6 +139,13 @@ async def get_db():
     return Database.db
 
 
+async def get_analytics_db():
+    """Returns the secondary-preferred handle for dashboard analytics."""
+    if Database.analytics_db is None:
+        await Database.connect()
+    return Database.analytics_db
+
+
 async def init_db() -> None:
     """Public entry-point called at application startup."""
     await Database.connect()
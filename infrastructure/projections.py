@@ -0,0 +1,105 @@
+"""
+Infrastructure – Projection Profiles
+====================================
+Named field sets for repository reads, so a list view does not pull
+embedded arrays (``attachments``, ``join_requests``) or other heavy
+fields it never renders.
+
+Every aggregate has three profiles:
+
+* ``"list"``   – the handful of fields list rows and their buttons use.
+* ``"card"``   – one document minus its heaviest field; enough for
+  single-item summaries, notifications and ownership checks.
+* ``"detail"`` – the whole document (no projection).
+
+Repositories take ``profile=`` on their reads and resolve it with
+:func:`projection`; handlers and services pick the smallest profile that
+covers what they render.
+
+Changing a profile
+------------------
+Add the field here when a list view starts rendering it — a missing
+field surfaces as a ``KeyError`` / ``.get`` default in the view, not as
+an error from MongoDB.
+"""
+from typing import Any, Dict, Literal, Optional
+
+Profile = Literal["list", "card", "detail"]
+
+LIST: Profile = "list"
+CARD: Profile = "card"
+DETAIL: Profile = "detail"
+
+PROFILES: Dict[str, Dict[str, Optional[Dict[str, Any]]]] = {
+    "projects": {
+        LIST: {
+            "_id": 0,
+            "id": 1,
+            "user_id": 1,
+            "username": 1,
+            "user_full_name": 1,
+            "subject_name": 1,
+            "tutor_name": 1,
+            "deadline": 1,
+            "status": 1,
+            "price": 1,
+            "currency": 1,
+            "delivery_date": 1,
+            "created_at": 1,
+            "attention_at": 1,
+            "attention_reason": 1,
+        },
+        CARD: {"attachments": 0},
+        DETAIL: None,
+    },
+    "team_requests": {
+        LIST: {
+            "_id": 0,
+            "id": 1,
+            "host_id": 1,
+            "host_name": 1,
+            "host_username": 1,
+            "course_name": 1,
+            "doctor_name": 1,
+            "specialization": 1,
+            "required_members": 1,
+            "current_members": 1,
+            "status": 1,
+            "created_at": 1,
+        },
+        CARD: {"join_requests": 0},
+        DETAIL: None,
+    },
+    "tickets": {
+        LIST: {
+            "_id": 0,
+            "ticket_id": 1,
+            "user_id": 1,
+            "username": 1,
+            "user_full_name": 1,
+            "status": 1,
+            "message_thread_id": 1,
+            "created_at": 1,
+            "message_count": 1,
+            "last_message": 1,
+        },
+        CARD: {"last_message": 0},
+        DETAIL: None,
+    },
+}
+
+
+def projection(collection: str, profile: Profile) -> Optional[Dict[str, Any]]:
+    """
+    The ``find`` projection for ``profile`` on ``collection``
+    (``None`` = whole document).
+
+    Raises:
+        ValueError: unknown collection or profile.
+    """
+    try:
+        return PROFILES[collection][profile]
+    except KeyError:
+        raise ValueError(
+            f"Unknown projection profile {profile!r} for {collection!r}"
+        ) from None
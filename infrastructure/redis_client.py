@@ -0,0 +1,32 @@
+"""
+Infrastructure – Redis Connection
+==================================
+Process-wide async Redis client shared by the middlewares and caches.
+
+``redis.from_url`` only builds a connection pool; no socket is opened
+until the first command, so importing this module is cheap (same as the
+lazy Motor client in ``infrastructure.mongo_db``).
+
+Keys owned by the bot
+---------------------
+throttle:bucket:<user_id>   – token-bucket hash {tokens, ts}
+settings:maintenance_mode   – "1" / "0" copy of the Mongo maintenance flag
+settings:invalidate         – pub/sub channel, published on settings writes
+"""
+import redis.asyncio as redis
+
+from config import settings
+
+# Module-level client (lazy connection, one pool per process)
+redis_client = redis.from_url(settings.REDIS_URI, decode_responses=True)
+
+MAINTENANCE_FLAG_KEY = "settings:maintenance_mode"
+# How long the Redis copy of the Mongo flag is trusted before re-reading it.
+MAINTENANCE_FLAG_TTL_SECONDS = 15
+
+# Pub/sub channel announcing settings writes to every bot / dashboard replica.
+SETTINGS_CHANNEL = "settings:invalidate"
+
+
+def throttle_key(user_id: int) -> str:
+    return f"throttle:bucket:{user_id}"
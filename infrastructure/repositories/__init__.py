@@ -2,7 +2,7 @@
 from .project import ProjectRepository
 from .payment import PaymentRepository
 from .stats import StatsRepository
-from .settings import SettingsRepository
+from .settings import CachedSettingsRepository, SettingsRepository
 from .ticket import TicketRepository
 from .audit import AuditRepository
 from .matchmaking import TeamRequestRepository
@@ -14,6 +14,7 @@ __all__ = [
     "PaymentRepository",
     "StatsRepository",
     "SettingsRepository",
+    "CachedSettingsRepository",
     "TicketRepository",
     "AuditRepository",
     "TeamRequestRepository",
@@ -4,12 +4,19 @@ import structlog
 
 from domain.entities import AuditLog
 from domain.enums import AuditEventType
+from infrastructure.audit_writer import AuditWriter, audit_writer
 
 logger = structlog.get_logger(__name__)
 
 class AuditRepository:
-    def __init__(self, db) -> None:
+    """
+    ``log_event`` hands the document to the write-behind ``AuditWriter``
+    when it is running and inserts directly otherwise.
+    """
+
+    def __init__(self, db, writer: AuditWriter = audit_writer) -> None:
         self._db = db
+        self._writer = writer
 
     async def log_event(
         self,
@@ -30,8 +37,11 @@ class AuditRepository:
             metadata=metadata or {},
         )
         
-        await self._db.audit_logs.insert_one(audit_log.model_dump())
-        logger.info(
+        if self._writer.running:
+            self._writer.enqueue(audit_log.model_dump())
+        else:
+            await self._db.audit_logs.insert_one(audit_log.model_dump())
+        logger.debug(
             "Audit event logged",
             log_id=log_id,
             event_type=event_type.value,
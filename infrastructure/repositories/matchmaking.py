@@ -3,7 +3,9 @@ import structlog
 
 from domain.entities import TeamRequest, JoinRequest
 from domain.enums import TeamRequestStatus, MatchStatus
+from domain.text import normalize_key
 from infrastructure.mongo_db import Database
+from infrastructure.projections import DETAIL, LIST, Profile, projection
 
 logger = structlog.get_logger()
 
@@ -39,21 +41,27 @@ class TeamRequestRepository:
         logger.info("Team request created", request_id=request_id, host_id=host_id, course=course_name, doctor=doctor_name)
         return request_id
 
-    async def get_by_id(self, request_id: int) -> Optional[Dict[str, Any]]:
+    async def get_by_id(
+        self, request_id: int, *, profile: Profile = DETAIL
+    ) -> Optional[Dict[str, Any]]:
         """Fetch a single team request by ID."""
-        return await self._db.team_requests.find_one({"id": int(request_id)})
+        return await self._db.team_requests.find_one(
+            {"id": int(request_id)}, projection("team_requests", profile)
+        )
 
     async def get_open_teams_for_specialization(
         self,
         specialization: str,
         exclude_user_id: int,
+        *,
+        profile: Profile = LIST,
     ) -> List[Dict[str, Any]]:
         """Fetch open requests matching given specialization, excluding the user's own."""
         cursor = self._db.team_requests.find({
             "status": TeamRequestStatus.OPEN.value,
             "specialization": specialization,
             "host_id": {"$ne": exclude_user_id},
-        }).sort("created_at", -1)
+        }, projection("team_requests", profile)).sort("created_at", -1)
         return await cursor.to_list(length=100)
 
     async def add_join_request(
@@ -181,10 +189,10 @@ class TeamRequestRepository:
     ) -> bool:
         """Check if any host already has an open request for the specific course and doctor globally."""
         doc = await self._db.team_requests.find_one({
-            "course_name": {"$regex": f"^{course_name}$", "$options": "i"},
-            "doctor_name": {"$regex": f"^{doctor_name}$", "$options": "i"},
+            "course_key": normalize_key(course_name),
+            "doctor_key": normalize_key(doctor_name),
             "status": TeamRequestStatus.OPEN.value,
-        })
+        }, {"_id": 1})
         return doc is not None
 
     async def reject_all_pending_joins(self, request_id: int) -> None:
@@ -199,7 +207,7 @@ class TeamRequestRepository:
     async def has_active_involvement_for_course(self, user_id: int, course_name: str) -> bool:
         """Check if user is host or accepted/pending in any open team for this course."""
         doc = await self._db.team_requests.find_one({
-            "course_name": {"$regex": f"^{course_name}$", "$options": "i"},
+            "course_key": normalize_key(course_name),
             "status": TeamRequestStatus.OPEN.value,
             "$or": [
                 {"host_id": user_id},
@@ -213,5 +221,5 @@ class TeamRequestRepository:
                     }
                 }
             ]
-        })
+        }, {"_id": 1})
         return doc is not None
@@ -1,14 +1,23 @@
+import asyncio
 from typing import Any, Dict, List, Optional
 import structlog
 
 from domain.entities import Payment
 from domain.enums import PaymentStatus
+from domain.pagination import Page, decode_cursor, encode_cursor
 from infrastructure.mongo_db import Database
 
 logger = structlog.get_logger()
 
 DEFAULT_PAGE_SIZE: int = 500
 MAX_PAGE_SIZE: int = 500
+# Bot list views show this many items per page.
+VIEW_PAGE_SIZE: int = 5
+
+# Display order is (is_pending desc, id desc): pending receipts first, so a
+# page is read from up to two segments, each a plain indexed range on id.
+_PENDING_SEGMENT = (1, {"status": PaymentStatus.PENDING})
+_SETTLED_SEGMENT = (0, {"status": {"$ne": PaymentStatus.PENDING}})
 
 class PaymentRepository:
     def __init__(self, db) -> None:
@@ -90,3 +99,86 @@ class PaymentRepository:
         ]
         cursor = self._db.payments.aggregate(pipeline)
         return await cursor.to_list(length=limit)
+
+    async def get_page(
+        self,
+        *,
+        after: Optional[str] = None,
+        before: Optional[str] = None,
+        limit: int = VIEW_PAGE_SIZE,
+    ) -> Page:
+        """
+        One page of payments in the same order as :meth:`get_all`, keyset-
+        paged on ``(is_pending, id)``; project fields are joined for the
+        page's items only.
+        """
+        after_key, before_key = decode_cursor(after), decode_cursor(before)
+        if before_key:
+            # Walk backwards from the cursor (ascending), then reverse.
+            segments = [_SETTLED_SEGMENT, _PENDING_SEGMENT]
+            start, direction = before_key, 1
+        else:
+            segments = [_PENDING_SEGMENT, _SETTLED_SEGMENT]
+            start, direction = after_key, -1
+
+        found: List[tuple] = []
+        for is_pending, query in segments:
+            if start is not None:
+                behind = (
+                    is_pending > start[0] if direction < 0 else is_pending < start[0]
+                )
+                if behind:
+                    continue  # whole segment lies on the other side of the cursor
+                if is_pending == start[0]:
+                    query = {
+                        **query,
+                        "id": {"$lt" if direction < 0 else "$gt": start[1]},
+                    }
+            need = limit + 1 - len(found)
+            if need <= 0:
+                break
+            cursor = self._db.payments.find(query).sort("id", direction).limit(need)
+            found.extend((is_pending, doc) for doc in await cursor.to_list(length=need))
+
+        more = len(found) > limit
+        found = found[:limit]
+        if before_key:
+            found.reverse()
+            has_prev, has_next = more, True
+        else:
+            has_prev, has_next = after_key is not None, more
+
+        if not found and (after_key or before_key):
+            # Everything beyond the cursor is gone; start over.
+            first = await self.get_page(limit=limit)
+            first.restarted = True
+            return first
+
+        total, projects = await asyncio.gather(
+            self._db.payments.estimated_document_count(),
+            self._db.projects.find(
+                {"id": {"$in": [doc["project_id"] for _, doc in found]}},
+                {"id": 1, "subject_name": 1, "username": 1, "user_full_name": 1},
+            ).to_list(length=limit),
+        )
+        by_id = {p["id"]: p for p in projects}
+        items = []
+        for is_pending, doc in found:
+            project = by_id.get(doc["project_id"], {})
+            items.append({
+                **doc,
+                "project_name": project.get("subject_name"),
+                "username": project.get("username"),
+                "user_full_name": project.get("user_full_name"),
+                "is_pending": is_pending,
+            })
+
+        def key(item: Dict[str, Any]) -> str:
+            return encode_cursor(item["is_pending"], item["id"])
+
+        return Page(
+            items=items,
+            total=total,
+            next_cursor=key(items[-1]) if has_next and items else None,
+            prev_cursor=key(items[0]) if has_prev and items else None,
+        )
@@ -1,15 +1,40 @@
-from typing import Any, Dict, List, Optional
-from datetime import datetime, timedelta, timezone
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timezone
 import structlog
+from pymongo import ReturnDocument
 
 from domain.entities import Project
-from domain.enums import ProjectStatus
+from domain.enums import AttentionReason, ProjectStatus
+from domain.money import PRICE_CURRENCY, parse_price
+from domain.pagination import Page, decode_cursor, encode_cursor
+from infrastructure.attention import URGENT_AFTER, attention_stages
 from infrastructure.mongo_db import Database
+from infrastructure.projections import DETAIL, LIST, Profile, projection
+from infrastructure.rollups import record_transition
 
 logger = structlog.get_logger()
 
 DEFAULT_PAGE_SIZE: int = 500
 MAX_PAGE_SIZE: int = 500
+# Bot list views show this many items per page.
+VIEW_PAGE_SIZE: int = 5
+
+# Fields a status / price write needs to move the daily-stats bucket.
+_ROLLUP_FIELDS = {"_id": 0, "status": 1, "price": 1, "created_at": 1}
+
+# Master report categories in display order.
+MASTER_CATEGORIES: List[Tuple[str, List[str]]] = [
+    ("New / Pending", [ProjectStatus.PENDING]),
+    ("Offered / Waiting", [ProjectStatus.OFFERED]),
+    ("Ongoing", [ProjectStatus.ACCEPTED, ProjectStatus.AWAITING_VERIFICATION]),
+    ("History", [
+        ProjectStatus.FINISHED,
+        ProjectStatus.DENIED_ADMIN,
+        ProjectStatus.DENIED_STUDENT,
+        ProjectStatus.REJECTED_PAYMENT,
+    ]),
+]
 
 class ProjectRepository:
     def __init__(self, db) -> None:
@@ -41,12 +66,22 @@ class ProjectRepository:
             attachments=attachments,
         )
 
-        await self._db.projects.insert_one(project_model.model_dump())
+        doc = project_model.model_dump()
+        doc["attention_at"] = doc["created_at"] + URGENT_AFTER
+        doc["attention_reason"] = AttentionReason.PENDING_REVIEW.value
+        await self._db.projects.insert_one(doc)
+        await record_transition(
+            self._db, doc["created_at"], new=(doc["status"], doc.get("price"))
+        )
         logger.info("Project created in DB", project_id=project_id, user_id=user_id)
         return project_id
 
-    async def get_project_by_id(self, project_id: int) -> Optional[Dict[str, Any]]:
-        return await self._db.projects.find_one({"id": int(project_id)})
+    async def get_project_by_id(
+        self, project_id: int, *, profile: Profile = DETAIL
+    ) -> Optional[Dict[str, Any]]:
+        return await self._db.projects.find_one(
+            {"id": int(project_id)}, projection("projects", profile)
+        )
 
     async def get_user_projects(
         self,
@@ -54,15 +89,48 @@ class ProjectRepository:
         *,
         limit: int = DEFAULT_PAGE_SIZE,
         skip: int = 0,
+        profile: Profile = LIST,
     ) -> List[Dict[str, Any]]:
         limit = min(limit, MAX_PAGE_SIZE)
         logger.debug("Fetching user projects from DB", user_id=user_id, limit=limit, skip=skip)
-        cursor = self._db.projects.find({"user_id": user_id}).sort("id", -1).skip(skip).limit(limit)
+        cursor = self._db.projects.find(
+            {"user_id": user_id}, projection("projects", profile)
+        ).sort("id", -1).skip(skip).limit(limit)
         return await cursor.to_list(length=limit)
 
+    async def _update_tracked(
+        self,
+        project_id: int,
+        pipeline: List[Dict[str, Any]],
+        status: str,
+        price: Any = None,
+    ) -> None:
+        """
+        Applies ``pipeline`` and moves the project to its ``(status, price)``
+        daily-stats bucket (``price=None`` keeps the stored price).
+        """
+        before = await self._db.projects.find_one_and_update(
+            {"id": int(project_id)},
+            pipeline,
+            projection=_ROLLUP_FIELDS,
+            return_document=ReturnDocument.BEFORE,
+        )
+        if before is not None:
+            await record_transition(
+                self._db,
+                before.get("created_at"),
+                old=(before.get("status"), before.get("price")),
+                new=(status, before.get("price") if price is None else price),
+            )
+
     async def update_status(self, project_id: int, new_status: str) -> None:
-        await self._db.projects.update_one(
-            {"id": int(project_id)}, {"$set": {"status": new_status}}
+        await self._update_tracked(
+            project_id,
+            [
+                {"$set": {"status": new_status}},
+                *attention_stages(new_status, datetime.now(timezone.utc)),
+            ],
+            new_status,
         )
         logger.info("Project status updated in DB", project_id=project_id, new_status=new_status)
 
@@ -73,86 +141,169 @@ class ProjectRepository:
         *,
         limit: int = DEFAULT_PAGE_SIZE,
         skip: int = 0,
+        profile: Profile = LIST,
     ) -> List[Dict[str, Any]]:
         limit = min(limit, MAX_PAGE_SIZE)
         query: Dict[str, Any] = {"status": {"$in": statuses}}
         if user_id is not None:
             query["user_id"] = user_id
-        cursor = self._db.projects.find(query).sort("id", -1).skip(skip).limit(limit)
+        cursor = (
+            self._db.projects.find(query, projection("projects", profile))
+            .sort("id", -1)
+            .skip(skip)
+            .limit(limit)
+        )
         return await cursor.to_list(length=limit)
 
-    async def update_offer(self, proj_id: int, price: str, delivery: str) -> None:
-        await self._db.projects.update_one(
-            {"id": int(proj_id)},
-            {
-                "$set": {
-                    "status": ProjectStatus.OFFERED,
-                    "price": price,
-                    "delivery_date": delivery,
-                }
-            },
+    async def get_projects_page(
+        self,
+        statuses: List[str],
+        user_id: Optional[int] = None,
+        *,
+        after: Optional[str] = None,
+        before: Optional[str] = None,
+        limit: int = VIEW_PAGE_SIZE,
+        profile: Profile = LIST,
+    ) -> Page:
+        """
+        One page of projects in ``statuses``, newest first, keyset-paged on
+        ``id`` so every page costs the same regardless of its position.
+        """
+        query: Dict[str, Any] = {"status": {"$in": statuses}}
+        if user_id is not None:
+            query["user_id"] = user_id
+        after_key, before_key = decode_cursor(after), decode_cursor(before)
+        fields = projection("projects", profile)
+
+        if before_key:
+            # Previous page: walk back from the cursor, then restore display order.
+            find = self._db.projects.find(
+                {**query, "id": {"$gt": before_key[0]}}, fields
+            ).sort("id", 1)
+        elif after_key:
+            find = self._db.projects.find(
+                {**query, "id": {"$lt": after_key[0]}}, fields
+            ).sort("id", -1)
+        else:
+            find = self._db.projects.find(query, fields).sort("id", -1)
+
+        total, docs = await asyncio.gather(
+            self._db.projects.count_documents(query),
+            find.limit(limit + 1).to_list(length=limit + 1),
         )
-        logger.info("Project offer updated in DB", project_id=proj_id, price=price)
+        more = len(docs) > limit
+        items = docs[:limit]
+        if before_key:
+            items.reverse()
+            has_prev, has_next = more, True
+        else:
+            has_prev, has_next = after_key is not None, more
 
-    async def get_all_categorized(self) -> Dict[str, List[Dict[str, Any]]]:
-        pending = await self.get_projects_by_status([ProjectStatus.PENDING])
-        ongoing = await self.get_projects_by_status(
-            [ProjectStatus.ACCEPTED, ProjectStatus.AWAITING_VERIFICATION]
+        if not items and (after_key or before_key):
+            # Everything beyond the cursor is gone (status changes); start over.
+            first = await self.get_projects_page(
+                statuses, user_id, limit=limit, profile=profile
+            )
+            first.restarted = True
+            return first
+        return Page(
+            items=items,
+            total=total,
+            next_cursor=encode_cursor(items[-1]["id"]) if has_next and items else None,
+            prev_cursor=encode_cursor(items[0]["id"]) if has_prev and items else None,
         )
-        history = await self.get_projects_by_status(
+
+    async def update_offer(self, proj_id: int, price: Any, delivery: str) -> None:
+        """
+        Stores the offer with ``price`` in canonical form (see
+        ``domain.money``).
+
+        Raises:
+            ValueError: ``price`` is not a non-negative number.
+        """
+        amount = parse_price(price)
+        if amount is None or amount < 0:
+            raise ValueError(f"Invalid price: {price!r}")
+        await self._update_tracked(
+            proj_id,
             [
-                ProjectStatus.FINISHED,
-                ProjectStatus.DENIED_ADMIN,
-                ProjectStatus.DENIED_STUDENT,
-                ProjectStatus.REJECTED_PAYMENT,
-            ]
+                {
+                    "$set": {
+                        "status": ProjectStatus.OFFERED,
+                        "price": amount,
+                        "currency": PRICE_CURRENCY,
+                        # Pipeline update: keep admin input from being read as "$field".
+                        "delivery_date": {"$literal": delivery},
+                    }
+                },
+                *attention_stages(ProjectStatus.OFFERED, datetime.now(timezone.utc)),
+            ],
+            ProjectStatus.OFFERED,
+            amount,
         )
-        offered = await self.get_projects_by_status([ProjectStatus.OFFERED])
+        logger.info("Project offer updated in DB", project_id=proj_id, price=amount)
+
+    async def get_master_report(
+        self, *, page: int = 0, page_size: int = VIEW_PAGE_SIZE
+    ) -> Page:
+        """
+        One page of the all-projects report, ordered by category (see
+        ``MASTER_CATEGORIES``) then newest first, with per-category counts.
+        Only the display fields are projected; each item gets a ``category``
+        key.
+
+        The counts decide which categories the requested slice falls in;
+        only those are read, newest first on the ``(status, id)`` index, so
+        no click sorts the whole collection. A page past the end (projects
+        changed status since the last click) falls back to the last page;
+        ``Page.page`` says which page was returned.
+        """
+        sizes = await asyncio.gather(*(
+            self._db.projects.count_documents({"status": {"$in": statuses}})
+            for _, statuses in MASTER_CATEGORIES
+        ))
+        counts = {name: n for (name, _), n in zip(MASTER_CATEGORIES, sizes)}
+        total = sum(sizes)
+        page = max(0, min(page, (total - 1) // page_size if total else 0))
 
-        return {
-            "New / Pending": pending,
-            "Offered / Waiting": offered,
-            "Ongoing": ongoing,
-            "History": history,
-        }
+        items: List[Dict[str, Any]] = []
+        skip = page * page_size
+        for (name, statuses), size in zip(MASTER_CATEGORIES, sizes):
+            if skip >= size:
+                skip -= size
+                continue
+            need = page_size - len(items)
+            docs = await (
+                self._db.projects.find(
+                    {"status": {"$in": statuses}}, projection("projects", LIST)
+                )
+                .sort("id", -1)
+                .skip(skip)
+                .limit(need)
+                .to_list(length=need)
+            )
+            items.extend({**doc, "category": name} for doc in docs)
+            skip = 0
+            if len(items) >= page_size:
+                break
+        return Page(items=items, total=total, counts=counts, page=page)
 
     async def get_all_user_ids(self) -> List[int]:
         return await self._db.projects.distinct("user_id")
 
-    async def get_urgent_projects(self) -> List[Dict[str, Any]]:
-        now = datetime.now(timezone.utc)
-        six_hours_ago = now - timedelta(hours=6)
-        two_days_from_now = (now + timedelta(days=2)).strftime("%Y-%m-%d")
-        
-        pending_urgent_cursor = self._db.projects.find({
-            "status": "pending",
-            "created_at": {"$lte": six_hours_ago}
-        })
-        
-        awaiting_urgent_cursor = self._db.projects.aggregate([
-            {"$match": {"status": "awaiting_verification"}},
-            {"$lookup": {
-                "from": "payments",
-                "localField": "id",
-                "foreignField": "project_id",
-                "as": "payment_info"
-            }},
-            {"$unwind": {"path": "$payment_info", "preserveNullAndEmptyArrays": True}},
-            {"$match": {
-                "payment_info.created_at": {"$lte": six_hours_ago}
-            }},
-            {"$project": {"payment_info": 0}}
-        ])
-        
-        delivery_urgent_cursor = self._db.projects.find({
-            "status": {"$in": ["accepted", "offered"]},
-            "delivery_date": {"$ne": None, "$lte": two_days_from_now}
-        })
-        
-        pending_projects = await pending_urgent_cursor.to_list(length=100)
-        awaiting_projects = await awaiting_urgent_cursor.to_list(length=100)
-        delivery_projects = await delivery_urgent_cursor.to_list(length=100)
-        
-        all_urgent = {p["id"]: p for p in pending_projects + awaiting_projects + delivery_projects}
-        
-        return sorted(list(all_urgent.values()), key=lambda x: x["created_at"], reverse=True)
+    async def get_urgent_projects(
+        self, *, limit: int = 200, profile: Profile = LIST
+    ) -> List[Dict[str, Any]]:
+        """
+        Projects whose ``attention_at`` has passed, most overdue first
+        (see ``infrastructure.attention``).
+        """
+        cursor = (
+            self._db.projects.find(
+                {"attention_at": {"$lte": datetime.now(timezone.utc)}},
+                projection("projects", profile),
+            )
+            .sort("attention_at", 1)
+            .limit(limit)
+        )
+        return await cursor.to_list(length=limit)
@@ -1,3 +1,19 @@
+import asyncio
+import time
+from typing import Optional
+
+import structlog
+
+from infrastructure.redis_client import (
+    MAINTENANCE_FLAG_KEY,
+    MAINTENANCE_FLAG_TTL_SECONDS,
+    SETTINGS_CHANNEL,
+)
+from utils.metrics import observe_redis
+
+logger = structlog.get_logger(__name__)
+
+
 class SettingsRepository:
     def __init__(self, db) -> None:
         self._db = db
@@ -12,3 +28,84 @@ class SettingsRepository:
             {"$set": {"maintenance_mode": status}},
             upsert=True,
         )
+
+
+class CachedSettingsRepository:
+    """
+    Process-wide, read-through cache around :class:`SettingsRepository`.
+
+    Reads are served from an in-memory snapshot for ``ttl`` seconds.
+    Writes go to Mongo, refresh the Redis flag copy and publish the new
+    value on ``SETTINGS_CHANNEL`` so every replica running
+    :meth:`listen_for_invalidations` updates its snapshot immediately;
+    the TTL only bounds staleness if a pub/sub message is lost.
+    """
+
+    def __init__(
+        self, repo: SettingsRepository, redis_client=None, ttl: float = 30.0
+    ) -> None:
+        self._repo = repo
+        self._redis = redis_client
+        self._ttl = ttl
+        self._maintenance_mode: Optional[bool] = None
+        self._expires_at = 0.0
+
+    def invalidate(self) -> None:
+        self._maintenance_mode = None
+        self._expires_at = 0.0
+
+    def _remember(self, status: bool) -> None:
+        self._maintenance_mode = status
+        self._expires_at = time.monotonic() + self._ttl
+
+    async def get_maintenance_mode(self) -> bool:
+        if self._maintenance_mode is not None and time.monotonic() < self._expires_at:
+            return self._maintenance_mode
+        status = await self._repo.get_maintenance_mode()
+        self._remember(status)
+        return status
+
+    async def set_maintenance_mode(self, status: bool) -> None:
+        await self._repo.set_maintenance_mode(status)
+        self._remember(status)
+        if self._redis is None:
+            return
+        value = "1" if status else "0"
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.set(MAINTENANCE_FLAG_KEY, value, ex=MAINTENANCE_FLAG_TTL_SECONDS)
+            pipe.publish(SETTINGS_CHANNEL, value)
+            with observe_redis("settings_publish"):
+                await pipe.execute()
+        except Exception as e:
+            # Other replicas still converge once their TTL expires.
+            logger.warning("Failed to publish settings change", error=str(e))
+
+    async def listen_for_invalidations(self, retry_delay: float = 5.0) -> None:
+        """Applies settings changes published by other replicas. Runs forever."""
+        while True:
+            pubsub = self._redis.pubsub()
+            try:
+                await pubsub.subscribe(SETTINGS_CHANNEL)
+                logger.info(
+                    "Subscribed to settings invalidations", channel=SETTINGS_CHANNEL
+                )
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    if message.get("data") in ("0", "1"):
+                        self._remember(message["data"] == "1")
+                    else:
+                        self.invalidate()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Anything could have changed while we were disconnected.
+                self.invalidate()
+                logger.warning("Settings invalidation listener error", error=str(e))
+                await asyncio.sleep(retry_delay)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
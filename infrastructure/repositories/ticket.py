@@ -1,7 +1,13 @@
 """
 Ticket Repository
 =================
-Data-access layer for the ``tickets`` collection.
+Data-access layer for the ``tickets`` and ``ticket_messages`` collections.
+
+Conversation messages are stored outside the ticket, in fixed-size
+buckets of ``MESSAGE_BUCKET_SIZE`` (``ticket_messages {ticket_id,
+bucket}``). The ticket keeps ``message_count`` and ``last_message`` so
+list views never touch the buckets, and a page of history reads only
+the one or two buckets it overlaps.
 
 All MongoDB operations are async via Motor.  Handlers never call this
 directly – they receive ``ticket_repo`` via the DI middleware.
@@ -10,10 +16,17 @@ from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
 import structlog
+from pymongo import ReturnDocument
 
-from domain.entities import Ticket, TicketMessage
+from domain.entities import (
+    MESSAGE_BUCKET_SIZE,
+    Ticket,
+    TicketMessage,
+    TicketMessageBucket,
+)
 from domain.enums import TicketStatus
 from infrastructure.mongo_db import Database
+from infrastructure.projections import DETAIL, LIST, Profile, projection
 
 logger = structlog.get_logger()
 
@@ -53,7 +66,8 @@ class TicketRepository:
             user_id=user_id,
             username=username,
             user_full_name=user_full_name,
-            messages=[first_message],
+            message_count=1,
+            last_message=first_message,
         )
 
         # exclude_none=True ensures fields like message_thread_id are
@@ -62,6 +76,11 @@ class TicketRepository:
         await self._db.tickets.insert_one(
             ticket.model_dump(exclude_none=True)
         )
+        await self._db.ticket_messages.insert_one(
+            TicketMessageBucket(
+                ticket_id=ticket_id, bucket=0, count=1, messages=[first_message]
+            ).model_dump()
+        )
         logger.info(
             "Ticket created", ticket_id=ticket_id, user_id=user_id
         )
@@ -71,9 +90,11 @@ class TicketRepository:
     # Read
     # ------------------------------------------------------------------
     async def get_ticket_by_id(
-        self, ticket_id: int
+        self, ticket_id: int, *, profile: Profile = DETAIL
     ) -> Optional[Dict[str, Any]]:
-        return await self._db.tickets.find_one({"ticket_id": ticket_id})
+        return await self._db.tickets.find_one(
+            {"ticket_id": ticket_id}, projection("tickets", profile)
+        )
 
     async def get_ticket_by_thread(
         self, message_thread_id: int
@@ -96,14 +117,14 @@ class TicketRepository:
         return await cursor.to_list(length=100)
 
     async def get_all_active_tickets(
-        self, page: int = 0, page_size: int = 5
+        self, page: int = 0, page_size: int = 5, *, profile: Profile = LIST
     ) -> tuple[List[Dict[str, Any]], int]:
         """Return all active tickets paginated (for admin view)."""
         query = {"status": TicketStatus.OPEN}
         total_count = await self._db.tickets.count_documents(query)
         
         cursor = (
-            self._db.tickets.find(query)
+            self._db.tickets.find(query, projection("tickets", profile))
             .sort("created_at", -1)
             .skip(page * page_size)
             .limit(page_size)
@@ -117,43 +138,46 @@ class TicketRepository:
         *,
         page: int = 0,
         page_size: int = DEFAULT_MSG_PAGE_SIZE,
+        total: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """Return a page of messages for a ticket (newest first).
 
-        Uses MongoDB ``$slice`` projection to implement server-side
-        pagination over the embedded ``messages`` array.
+        Only the buckets overlapping the page are read. Pass ``total``
+        (the ticket's ``message_count``) when already known to skip the
+        count look-up.
         """
         page_size = min(page_size, MAX_MSG_PAGE_SIZE)
-        skip = page * page_size
+        if total is None:
+            total = await self.get_message_count(ticket_id)
 
-        # $slice with [negative_skip, limit] gives the *last* N entries
-        # after skipping from the end.  We want newest-first pages.
-        doc = await self._db.tickets.find_one(
-            {"ticket_id": ticket_id},
-            {"messages": 1, "_id": 0},
-        )
-        if not doc or "messages" not in doc:
+        # Newest first: page 0 is seq [total - page_size, total).
+        end = total - page * page_size
+        if end <= 0:
             return []
+        start = max(end - page_size, 0)
+        buckets = list(
+            range(start // MESSAGE_BUCKET_SIZE, (end - 1) // MESSAGE_BUCKET_SIZE + 1)
+        )
 
-        messages = doc["messages"]
-        total = len(messages)
-
-        # Newest first, paginated
-        start = max(total - skip - page_size, 0)
-        end = total - skip
-        page_msgs = messages[start:end]
-        page_msgs.reverse()  # newest first
+        cursor = self._db.ticket_messages.find(
+            {"ticket_id": ticket_id, "bucket": {"$in": buckets}},
+            {"messages": 1, "_id": 0},
+        )
+        docs = await cursor.to_list(length=len(buckets))
+        page_msgs = [
+            msg for doc in docs for msg in doc["messages"]
+            if start <= msg["seq"] < end
+        ]
+        page_msgs.sort(key=lambda msg: msg["seq"], reverse=True)
         return page_msgs
 
     async def get_message_count(self, ticket_id: int) -> int:
         """Return the total number of messages in a ticket."""
         doc = await self._db.tickets.find_one(
             {"ticket_id": ticket_id},
-            {"messages": 1, "_id": 0},
+            {"message_count": 1, "_id": 0},
         )
-        if not doc or "messages" not in doc:
-            return 0
-        return len(doc["messages"])
+        return doc.get("message_count", 0) if doc else 0
 
     # ------------------------------------------------------------------
     # Update
@@ -181,16 +205,43 @@ class TicketRepository:
         file_id: Optional[str] = None,
         file_type: Optional[str] = None,
     ) -> None:
-        """Append a message to the ticket's conversation history."""
+        """Append a message to the ticket's conversation history.
+
+        The ticket's ``message_count`` is incremented first; the value it
+        returns is the message's ``seq`` and so picks its bucket.
+        """
         msg = TicketMessage(
             sender=sender,
             text=text,
             file_id=file_id,
             file_type=file_type,
         )
-        await self._db.tickets.update_one(
+        ticket = await self._db.tickets.find_one_and_update(
             {"ticket_id": ticket_id},
-            {"$push": {"messages": msg.model_dump()}},
+            {"$inc": {"message_count": 1}},
+            projection={"message_count": 1, "_id": 0},
+            return_document=ReturnDocument.AFTER,
+        )
+        if ticket is None:
+            return
+        msg.seq = ticket["message_count"] - 1
+        doc = msg.model_dump()
+
+        await self._db.ticket_messages.update_one(
+            {"ticket_id": ticket_id, "bucket": msg.seq // MESSAGE_BUCKET_SIZE},
+            {"$push": {"messages": doc}, "$inc": {"count": 1}},
+            upsert=True,
+        )
+        # Concurrent replies may finish out of order; keep the newest.
+        await self._db.tickets.update_one(
+            {
+                "ticket_id": ticket_id,
+                "$or": [
+                    {"last_message.seq": {"$lt": msg.seq}},
+                    {"last_message": {"$exists": False}},
+                ],
+            },
+            {"$set": {"last_message": doc}},
         )
         logger.debug(
             "Message added to ticket",
@@ -0,0 +1,177 @@
+"""
+Infrastructure – Daily Project Rollups
+======================================
+``project_daily_stats`` holds one small document per (creation day,
+current status):
+
+    {_id: "2026-10-17|pending", day: "2026-10-17", status: "pending",
+     count: 4, revenue: 0.0}
+
+``count`` is how many projects created that day are now in ``status``;
+``revenue`` is the sum of their prices, parsed like MongoDB's
+``$convert`` to double: numbers and numeric strings count, anything else
+(legacy text prices not yet converted by the ``projects_numeric_price``
+backfill, missing prices) counts as 0.
+
+``ProjectRepository`` keeps the buckets current: ``add_project`` adds
+one to ``(day, pending)`` and every status / price change moves the
+project from its old bucket to its new one with two ``$inc`` upserts.
+The dashboard overview reads these buckets instead of grouping every
+project (``dashboard_api.repositories.stats_repo``).
+
+Drift
+-----
+A rollup write that fails after its project update — or a write racing
+the reconciler — leaves a bucket off by one. :func:`reconcile_daily_stats`
+regroups ``projects`` and rewrites only the buckets that differ; it runs
+nightly from ``main.py`` and once as the ``project_daily_stats_backfill``
+migration.
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import structlog
+from pymongo import DeleteOne, ReplaceOne, UpdateOne
+
+logger = structlog.get_logger(__name__)
+
+ROLLUP_COLLECTION = "project_daily_stats"
+UNKNOWN_DAY = "unknown"
+
+# (status, price) of a project before / after a write.
+RollupState = Tuple[str, Any]
+
+_PRICE_EXPR = {
+    "$convert": {"input": "$price", "to": "double", "onError": 0, "onNull": 0}
+}
+
+_DAY_EXPR = {
+    "$dateToString": {
+        "format": "%Y-%m-%d",
+        "date": {
+            "$convert": {
+                "input": "$created_at",
+                "to": "date",
+                "onError": None,
+                "onNull": None,
+            }
+        },
+        "onNull": UNKNOWN_DAY,
+    }
+}
+
+
+def rollup_day(created_at: Any) -> str:
+    """UTC ``YYYY-MM-DD`` of a project's ``created_at``."""
+    if isinstance(created_at, str):
+        try:
+            created_at = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+        except ValueError:
+            return UNKNOWN_DAY
+    if not isinstance(created_at, datetime):
+        return UNKNOWN_DAY
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc)
+    return created_at.strftime("%Y-%m-%d")
+
+
+def price_value(price: Any) -> float:
+    """``price`` as :data:`_PRICE_EXPR` sees it; unparseable or missing count as 0."""
+    if price is None or isinstance(price, bool):
+        return 0.0
+    try:
+        return float(str(price).strip())
+    except ValueError:
+        return 0.0
+
+
+def bucket_id(day: str, status: Any) -> str:
+    # str() of a ProjectStatus member is "ProjectStatus.X", not its value.
+    return f"{day}|{getattr(status, 'value', status)}"
+
+
+def _bucket_inc(day: str, status: Any, sign: int, price: Any) -> UpdateOne:
+    status = getattr(status, "value", status)
+    return UpdateOne(
+        {"_id": bucket_id(day, status)},
+        {
+            "$inc": {"count": sign, "revenue": sign * price_value(price)},
+            "$setOnInsert": {"day": day, "status": status},
+        },
+        upsert=True,
+    )
+
+
+def rollup_ops(
+    created_at: Any,
+    *,
+    old: Optional[RollupState] = None,
+    new: Optional[RollupState] = None,
+) -> List[UpdateOne]:
+    """``$inc`` upserts moving one project from bucket ``old`` to ``new``."""
+    if old is not None and new is not None:
+        same_status = bucket_id("", old[0]) == bucket_id("", new[0])
+        if same_status and price_value(old[1]) == price_value(new[1]):
+            return []
+    day = rollup_day(created_at)
+    ops = []
+    if old is not None:
+        ops.append(_bucket_inc(day, old[0], -1, old[1]))
+    if new is not None:
+        ops.append(_bucket_inc(day, new[0], 1, new[1]))
+    return ops
+
+
+async def record_transition(
+    db,
+    created_at: Any,
+    *,
+    old: Optional[RollupState] = None,
+    new: Optional[RollupState] = None,
+) -> None:
+    """Applies :func:`rollup_ops`; failures are logged and left to the reconciler."""
+    ops = rollup_ops(created_at, old=old, new=new)
+    if not ops:
+        return
+    try:
+        await db.project_daily_stats.bulk_write(ops, ordered=False)
+    except Exception as e:
+        logger.warning(
+            "Daily stats rollup update failed", error=str(e), old=old, new=new
+        )
+
+
+async def reconcile_daily_stats(db) -> int:
+    """
+    Rebuilds ``project_daily_stats`` from ``projects``; returns how many
+    buckets were rewritten or removed.
+    """
+    actual: Dict[str, Dict[str, Any]] = {}
+    cursor = db.projects.aggregate([
+        {"$group": {
+            "_id": {"day": _DAY_EXPR, "status": "$status"},
+            "count": {"$sum": 1},
+            "revenue": {"$sum": _PRICE_EXPR},
+        }},
+    ], allowDiskUse=True)
+    async for row in cursor:
+        day, status = row["_id"]["day"], row["_id"].get("status")
+        key = bucket_id(day, status)
+        actual[key] = {
+            "_id": key, "day": day, "status": status,
+            "count": row["count"], "revenue": float(row["revenue"]),
+        }
+
+    stored = {doc["_id"]: doc async for doc in db.project_daily_stats.find({})}
+    ops: List[Any] = [
+        ReplaceOne({"_id": key}, doc, upsert=True)
+        for key, doc in actual.items()
+        if key not in stored
+        or stored[key].get("count") != doc["count"]
+        or abs(stored[key].get("revenue", 0.0) - doc["revenue"]) > 1e-6
+    ]
+    ops += [DeleteOne({"_id": key}) for key in stored.keys() - actual.keys()]
+    if ops:
+        await db.project_daily_stats.bulk_write(ops, ordered=False)
+    logger.info("Daily stats reconciled", buckets=len(actual), corrected=len(ops))
+    return len(ops)
@@ -0,0 +1,483 @@
+"""
+Infrastructure – Schema Manifest
+================================
+Declares every MongoDB index and data migration the application relies
+on, together with a ``SCHEMA_VERSION``.
+
+The version that was last applied is stored in
+``schema_meta {_id: "schema"}``. On startup :func:`ensure_schema` reads
+that one document and returns immediately when it is at least
+``SCHEMA_VERSION`` — a plain redeploy issues no DDL at all, and an older
+replica still running during a rolling deploy leaves a newer schema alone.
+
+When the stored version is older (or missing):
+
+1. pending migrations run **in order** (each one is idempotent and is
+   recorded in ``applied_migrations`` as soon as it succeeds) — except
+   ``background`` ones, which :func:`run_background_migrations` applies
+   after startup (``main.py``) so a long backfill does not delay serving;
+2. missing indexes are created **concurrently**, one ``create_indexes``
+   call per collection, skipping those ``list_indexes`` already reports;
+3. the new version is written.
+
+Changing the schema
+-------------------
+* Add / change an ``IndexSpec`` or append a ``Migration`` below.
+* Bump ``SCHEMA_VERSION``.
+* ``scripts/db/explain_queries.py`` explains every repository query
+  against a seeded scratch database and prints the ``IndexSpec`` for any
+  that scans.
+
+Index names are derived from the keys exactly as MongoDB does
+(``user_id_1_status_1``), so indexes created by older releases are
+recognised and not rebuilt.
+"""
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Sequence, Tuple, Union
+
+import structlog
+from bson import ObjectId
+from pymongo import DESCENDING, IndexModel, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from config import settings
+from domain.entities import MESSAGE_BUCKET_SIZE
+from domain.enums import AttentionReason, PaymentStatus, ProjectStatus
+from domain.money import PRICE_CURRENCY, parse_price
+from domain.text import normalize_key
+from infrastructure.attention import URGENT_AFTER, attention_stages
+from infrastructure.rollups import ROLLUP_COLLECTION, reconcile_daily_stats
+
+logger = structlog.get_logger(__name__)
+
+SCHEMA_VERSION = 10
+SCHEMA_COLLECTION = "schema_meta"
+SCHEMA_DOC_ID = "schema"
+
+IndexKeys = Union[str, Sequence[Tuple[str, int]]]
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    """One index: ``keys`` as accepted by ``create_index`` plus options."""
+    collection: str
+    keys: IndexKeys
+    options: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def key_list(self) -> List[Tuple[str, int]]:
+        if isinstance(self.keys, str):
+            return [(self.keys, 1)]
+        return list(self.keys)
+
+    @property
+    def name(self) -> str:
+        return self.options.get("name") or "_".join(
+            f"{k}_{direction}" for k, direction in self.key_list
+        )
+
+    def model(self) -> IndexModel:
+        return IndexModel(self.key_list, name=self.name, **{
+            k: v for k, v in self.options.items() if k != "name"
+        })
+
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    A one-off data fix. ``apply`` must be safe to run more than once.
+
+    ``background`` migrations are skipped by :func:`ensure_schema` and run
+    by :func:`run_background_migrations` once the process is serving — for
+    backfills the running code already copes with (new writes are in the
+    target shape) and that would otherwise hold up startup.
+    """
+    name: str
+    apply: Callable[[Any], Awaitable[None]]
+    background: bool = False
+
+
+INDEXES: List[IndexSpec] = [
+    # --- projects ---
+    IndexSpec("projects", "id", {"unique": True}),
+    IndexSpec("projects", "user_id"),
+    IndexSpec("projects", "status"),
+    IndexSpec("projects", [("created_at", DESCENDING)]),
+    # revenue / price-sorted reads on the canonical numeric price
+    IndexSpec("projects", [("status", 1), ("price", 1)]),
+    # dashboard project list: (sort field, id) keyset order, optionally per status
+    IndexSpec("projects", [("created_at", DESCENDING), ("id", DESCENDING)]),
+    IndexSpec(
+        "projects", [("status", 1), ("created_at", DESCENDING), ("id", DESCENDING)]
+    ),
+    # urgent-cases list: only projects needing attention carry the field
+    IndexSpec("projects", "attention_at", {"sparse": True}),
+    # keyset-paged list views: status / owner filter, newest id first
+    IndexSpec("projects", [("status", 1), ("id", DESCENDING)]),
+    IndexSpec("projects", [("user_id", 1), ("id", DESCENDING)]),
+    # dashboard overview: daily rollup buckets by date range
+    IndexSpec(ROLLUP_COLLECTION, [("day", 1), ("status", 1)]),
+    # --- payments ---
+    IndexSpec("payments", "id", {"unique": True}),
+    IndexSpec("payments", "project_id"),
+    IndexSpec("payments", "status"),
+    IndexSpec("payments", [("created_at", DESCENDING)]),
+    IndexSpec("payments", [("status", 1), ("id", DESCENDING)]),
+    # --- FSM state storage: per-user look-ups ---
+    IndexSpec("fsm_states", [("chat_id", 1), ("user_id", 1)], {"unique": True}),
+    # --- tickets ---
+    IndexSpec("tickets", "ticket_id", {"unique": True}),
+    IndexSpec("tickets", "message_thread_id", {"unique": True, "sparse": True}),
+    IndexSpec("tickets", "user_id"),
+    IndexSpec("tickets", [("user_id", 1), ("status", 1)]),
+    IndexSpec("ticket_messages", [("ticket_id", 1), ("bucket", 1)], {"unique": True}),
+    # --- audit log (time-series; created by the audit_logs_timeseries migration) ---
+    IndexSpec("audit_logs", [("entity_id", 1), ("created_at", DESCENDING)]),
+    # --- team requests ---
+    IndexSpec("team_requests", "id", {"unique": True}),
+    IndexSpec("team_requests", "host_id"),
+    IndexSpec("team_requests", "status"),
+    # duplicate / involvement checks: exact match on the normalised keys
+    IndexSpec("team_requests", [("course_key", 1), ("doctor_key", 1), ("status", 1)]),
+    IndexSpec("team_requests", [("course_key", 1), ("status", 1)]),
+    IndexSpec("team_requests", [("status", 1), ("course_name", 1), ("created_at", -1)]),
+    IndexSpec("team_requests", [("host_id", 1), ("status", 1), ("created_at", -1)]),
+    IndexSpec("team_requests", "current_members"),
+    IndexSpec("team_requests", "join_requests.seeker_id"),
+    # --- students ---
+    IndexSpec("students", "user_id"),
+    # --- referrals ---
+    IndexSpec("referral_users", "user_id"),
+    IndexSpec("referral_users", "referred_by"),
+    IndexSpec("withdrawal_requests", "request_id"),
+    IndexSpec("withdrawal_requests", [("status", 1), ("requested_at", DESCENDING)]),
+    IndexSpec("commission_logs", "referrer_id"),
+]
+
+
+async def _tickets_sparse_thread_id(db) -> None:
+    """
+    Replace the old non-sparse ``message_thread_id`` index: drop it and
+    unset explicit nulls, which break the sparse unique constraint.
+    """
+    indexes = await db.tickets.index_information()
+    if not indexes.get("message_thread_id_1", {}).get("sparse"):
+        try:
+            await db.tickets.drop_index("message_thread_id_1")
+        except Exception:
+            pass  # index doesn't exist yet — first run
+    await db.tickets.update_many(
+        {"message_thread_id": None},
+        {"$unset": {"message_thread_id": ""}},
+    )
+
+
+async def _tickets_bucket_messages(db) -> None:
+    """
+    Move embedded ``tickets.messages`` arrays into ``ticket_messages``
+    buckets and set ``message_count`` / ``last_message``. Buckets are
+    upserted by ``(ticket_id, bucket)`` and the array is unset last, so
+    an interrupted run simply redoes the unfinished tickets.
+    """
+    async for ticket in db.tickets.find(
+        {"messages": {"$exists": True}}, {"ticket_id": 1, "messages": 1}
+    ):
+        messages = [{**msg, "seq": seq} for seq, msg in enumerate(ticket["messages"])]
+        for start in range(0, len(messages), MESSAGE_BUCKET_SIZE):
+            chunk = messages[start:start + MESSAGE_BUCKET_SIZE]
+            bucket = start // MESSAGE_BUCKET_SIZE
+            await db.ticket_messages.replace_one(
+                {"ticket_id": ticket["ticket_id"], "bucket": bucket},
+                {"ticket_id": ticket["ticket_id"], "bucket": bucket,
+                 "count": len(chunk), "messages": chunk},
+                upsert=True,
+            )
+        update: Dict[str, Any] = {
+            "$set": {"message_count": len(messages)},
+            "$unset": {"messages": ""},
+        }
+        if messages:
+            update["$set"]["last_message"] = messages[-1]
+        await db.tickets.update_one({"_id": ticket["_id"]}, update)
+
+
+AUDIT_LEGACY_COLLECTION = "audit_logs_legacy"
+_AUDIT_COPY_BATCH = 1000
+
+
+async def _audit_logs_timeseries(db) -> None:
+    """
+    Make ``audit_logs`` a time-series collection (time ``created_at``,
+    meta ``entity_id``) expiring after ``AUDIT_RETENTION_DAYS``.
+
+    An existing regular collection is renamed to ``audit_logs_legacy`` and
+    copied across in batches, keeping each document's ``_id``; each copied
+    batch is deleted from the legacy collection, so an interrupted run
+    resumes where it stopped. Documents whose ``created_at`` is not a date
+    get one from :func:`_audit_time` and keep the original value in
+    ``created_at_raw``. The legacy collection is only dropped once empty.
+    """
+    cursor = await db.list_collections(
+        filter={"name": {"$in": ["audit_logs", AUDIT_LEGACY_COLLECTION]}}
+    )
+    existing = {info["name"]: info for info in await cursor.to_list(length=None)}
+    current = existing.get("audit_logs")
+
+    if current is None or current.get("type") != "timeseries":
+        if current is not None:
+            await db.audit_logs.rename(AUDIT_LEGACY_COLLECTION)
+            existing[AUDIT_LEGACY_COLLECTION] = current
+        await db.create_collection(
+            "audit_logs",
+            timeseries={
+                "timeField": "created_at",
+                "metaField": "entity_id",
+                "granularity": "minutes",
+            },
+            expireAfterSeconds=settings.AUDIT_RETENTION_DAYS * 86400,
+        )
+
+    if AUDIT_LEGACY_COLLECTION not in existing:
+        return
+    legacy = db[AUDIT_LEGACY_COLLECTION]
+    first = True
+    while True:
+        batch = await (
+            legacy.find({}).limit(_AUDIT_COPY_BATCH).to_list(length=_AUDIT_COPY_BATCH)
+        )
+        if not batch:
+            break
+        ids = [doc["_id"] for doc in batch]
+        docs = [_audit_copy(doc) for doc in batch]
+        if first:
+            # Time-series collections have no unique _id index: the batch an
+            # interrupted run inserted but did not delete must be skipped here.
+            copied = set(
+                await db.audit_logs.distinct("_id", {"_id": {"$in": ids}})
+            )
+            docs = [doc for doc in docs if doc["_id"] not in copied]
+            first = False
+        if docs:
+            try:
+                await db.audit_logs.insert_many(docs, ordered=False)
+            except BulkWriteError as e:
+                errors = e.details.get("writeErrors", [])
+                if any(err.get("code") != 11000 for err in errors):
+                    raise
+        await legacy.delete_many({"_id": {"$in": ids}})
+
+    remaining = await legacy.count_documents({})
+    if remaining:
+        logger.warning(
+            "Audit legacy collection not empty, keeping it",
+            collection=AUDIT_LEGACY_COLLECTION,
+            remaining=remaining,
+        )
+        return
+    await legacy.drop()
+
+
+def _audit_time(doc: Dict[str, Any]) -> datetime:
+    """
+    ``created_at`` for a legacy audit document: the parsed string, else the
+    ``_id`` time, else now.
+    """
+    value = doc.get("created_at")
+    if isinstance(value, str):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+            return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+        except ValueError:
+            pass
+    if isinstance(doc.get("_id"), ObjectId):
+        return doc["_id"].generation_time
+    return datetime.now(timezone.utc)
+
+
+def _audit_copy(doc: Dict[str, Any]) -> Dict[str, Any]:
+    if isinstance(doc.get("created_at"), datetime):
+        return doc
+    copy = {**doc, "created_at": _audit_time(doc)}
+    if "created_at" in doc:
+        copy["created_at_raw"] = doc["created_at"]
+    return copy
+
+
+async def _projects_attention_backfill(db) -> None:
+    """
+    Compute ``attention_at`` / ``attention_reason`` for existing projects.
+    Awaiting-verification projects are dated from their pending receipt,
+    everything else by the same pipeline the repository applies.
+    """
+    now = datetime.now(timezone.utc)
+    for status in ProjectStatus:
+        if status == ProjectStatus.AWAITING_VERIFICATION:
+            continue
+        await db.projects.update_many({"status": status}, attention_stages(status, now))
+
+    receipts = db.payments.aggregate([
+        {"$match": {"status": PaymentStatus.PENDING}},
+        {"$group": {"_id": "$project_id", "submitted_at": {"$max": "$created_at"}}},
+    ])
+    async for receipt in receipts:
+        await db.projects.update_one(
+            {"id": receipt["_id"], "status": ProjectStatus.AWAITING_VERIFICATION},
+            {"$set": {
+                "attention_at": receipt["submitted_at"] + URGENT_AFTER,
+                "attention_reason": AttentionReason.PAYMENT_UNVERIFIED.value,
+            }},
+        )
+
+
+async def _team_requests_match_keys(db) -> None:
+    """
+    Store ``course_key`` / ``doctor_key`` on team requests created before
+    the keys existed, and drop the ``course_name_1_status_1`` index the
+    case-insensitive regex look-ups used to (fail to) rely on.
+    """
+    async for doc in db.team_requests.find(
+        {"course_key": {"$exists": False}}, {"course_name": 1, "doctor_name": 1}
+    ):
+        await db.team_requests.update_one({"_id": doc["_id"]}, {"$set": {
+            "course_key": normalize_key(doc.get("course_name") or ""),
+            "doctor_key": normalize_key(doc.get("doctor_name") or ""),
+        }})
+    try:
+        await db.team_requests.drop_index("course_name_1_status_1")
+    except Exception:
+        pass  # already dropped or never created
+
+
+async def _project_daily_stats_backfill(db) -> None:
+    """Build the ``project_daily_stats`` rollup from existing projects."""
+    await reconcile_daily_stats(db)
+
+
+_PRICE_BATCH = 500
+# Pause between batches so the backfill leaves room for live traffic.
+_PRICE_BATCH_PAUSE = 0.05
+
+
+async def _projects_numeric_price(db) -> None:
+    """
+    Store every project ``price`` as a whole number of ``PRICE_CURRENCY``
+    (``domain.money.parse_price``). Values with no number in them become
+    ``null`` and the original is kept in ``price_raw``; nothing is deleted.
+
+    Runs in the background after startup (``ProjectRepository`` already
+    writes canonical prices) in batches of non-numeric prices, so an
+    interrupted run simply continues with what is left. The daily-stats
+    rollup is rebuilt last because converted prices change its revenue.
+    """
+    while True:
+        batch = await db.projects.find(
+            {"price": {"$type": ["string", "double", "decimal"]}}, {"price": 1}
+        ).limit(_PRICE_BATCH).to_list(length=_PRICE_BATCH)
+        if not batch:
+            break
+        ops = []
+        for doc in batch:
+            amount = parse_price(doc["price"])
+            update = (
+                {"$set": {"price": amount, "currency": PRICE_CURRENCY}}
+                if amount is not None
+                else {"$set": {"price": None, "price_raw": doc["price"]}}
+            )
+            ops.append(UpdateOne({"_id": doc["_id"]}, update))
+        await db.projects.bulk_write(ops, ordered=False)
+        await asyncio.sleep(_PRICE_BATCH_PAUSE)
+    await db.projects.update_many(
+        {"price": {"$type": "number"}, "currency": {"$exists": False}},
+        {"$set": {"currency": PRICE_CURRENCY}},
+    )
+    await reconcile_daily_stats(db)
+
+
+MIGRATIONS: List[Migration] = [
+    Migration("tickets_sparse_thread_id", _tickets_sparse_thread_id),
+    Migration("tickets_bucket_messages", _tickets_bucket_messages),
+    Migration("audit_logs_timeseries", _audit_logs_timeseries),
+    Migration("projects_attention_backfill", _projects_attention_backfill),
+    Migration("team_requests_match_keys", _team_requests_match_keys),
+    Migration("project_daily_stats_backfill", _project_daily_stats_backfill),
+    Migration("projects_numeric_price", _projects_numeric_price, background=True),
+]
+
+
+async def _ensure_collection_indexes(
+    db, collection: str, specs: List[IndexSpec]
+) -> List[str]:
+    existing = {doc["name"] async for doc in db[collection].list_indexes()}
+    missing = [spec for spec in specs if spec.name not in existing]
+    if not missing:
+        return []
+    return await db[collection].create_indexes([spec.model() for spec in missing])
+
+
+async def _apply_migrations(db, meta: Dict[str, Any], *, background: bool) -> None:
+    applied = set(meta.get("applied_migrations", []))
+    for migration in MIGRATIONS:
+        if migration.background != background or migration.name in applied:
+            continue
+        logger.info(
+            "Applying migration", migration=migration.name, background=background
+        )
+        await migration.apply(db)
+        await db[SCHEMA_COLLECTION].update_one(
+            {"_id": SCHEMA_DOC_ID},
+            {"$addToSet": {"applied_migrations": migration.name}},
+            upsert=True,
+        )
+
+
+async def run_background_migrations(db) -> None:
+    """
+    Applies pending ``background`` migrations; started as a task once the
+    process is serving. Failures are logged and retried on the next start.
+    """
+    try:
+        meta = await db[SCHEMA_COLLECTION].find_one({"_id": SCHEMA_DOC_ID}) or {}
+        await _apply_migrations(db, meta, background=True)
+    except Exception as e:
+        logger.error("Background migration failed", error=str(e), exc_info=True)
+
+
+async def ensure_schema(db) -> bool:
+    """
+    Brings the database up to ``SCHEMA_VERSION``.
+
+    Returns ``True`` if any work was done, ``False`` if the stored
+    version was already current.
+    """
+    meta = await db[SCHEMA_COLLECTION].find_one({"_id": SCHEMA_DOC_ID}) or {}
+    stored = meta.get("version", 0)
+    if stored >= SCHEMA_VERSION:
+        # A newer release may already have migrated (rolling deploy); never
+        # write a lower version.
+        logger.debug("Schema up to date", version=SCHEMA_VERSION, stored=stored)
+        return False
+
+    await _apply_migrations(db, meta, background=False)
+
+    by_collection: Dict[str, List[IndexSpec]] = {}
+    for spec in INDEXES:
+        by_collection.setdefault(spec.collection, []).append(spec)
+    created = await asyncio.gather(*(
+        _ensure_collection_indexes(db, name, specs)
+        for name, specs in by_collection.items()
+    ))
+
+    await db[SCHEMA_COLLECTION].update_one(
+        {"_id": SCHEMA_DOC_ID},
+        {"$set": {"version": SCHEMA_VERSION, "updated_at": datetime.now(timezone.utc)}},
+        upsert=True,
+    )
+    logger.info(
+        "Schema upgraded",
+        from_version=meta.get("version"),
+        to_version=SCHEMA_VERSION,
+        indexes_created=sum(len(names) for names in created),
+    )
+    return True
@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import Optional
 from aiogram.filters.callback_data import CallbackData
 
 class MenuAction(str, Enum):
@@ -80,6 +81,9 @@ class PageCallback(CallbackData, prefix="page"):
     """Pagination callback for paged admin views."""
     action: PageAction
     page: int
+    # Keyset cursors (see domain.pagination); unset for offset-paged views.
+    after: Optional[str] = None
+    before: Optional[str] = None
 
 class TicketCallback(CallbackData, prefix="tkt"):
     """Callback for ticket-related actions."""
@@ -739,7 +739,7 @@ class KeyboardFactory:
         for t in tickets:
             tid = t["ticket_id"]
             created = format_datetime(t.get("created_at", ""), "%d/%m")
-            msg_count = len(t.get("messages", []))
+            msg_count = t.get("message_count", 0)
             btn_text = f"🎫 #{tid} | 💬 {msg_count} | {created}"
             builder.row(
                 types.InlineKeyboardButton(
@@ -814,7 +814,7 @@ class KeyboardFactory:
         for t in tickets:
             tid = t["ticket_id"]
             created = format_datetime(t.get("created_at", ""), "%d/%m")
-            msg_count = len(t.get("messages", []))
+            msg_count = t.get("message_count", 0)
             btn_text = f"🔒 #{tid} | 💬 {msg_count} | {created}"
             builder.row(
                 types.InlineKeyboardButton(
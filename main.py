@@ -1,15 +1,19 @@
 import asyncio
 import sys
+from typing import Optional
 
 from aiohttp import web
-from aiogram import Bot, Dispatcher, BaseMiddleware, types
+from aiogram import Bot, Dispatcher, types
 from datetime import timedelta
 
 # Internal Project Imports
 import sentry_sdk
 
 from config import settings
-from database.connection import init_db
+from database.connection import Database, init_db
+from infrastructure.audit_writer import audit_writer
+from infrastructure.container import build_default_container
+from infrastructure.schema import run_background_migrations
 from handlers.admin_routes import router as admin_router
 from handlers.client_routes import router as client_router
 from handlers.common import router as common_router
@@ -18,7 +22,11 @@ from middlewares.maintenance import MaintenanceMiddleware
 from middlewares.throttling import ThrottlingMiddleware
 from middlewares.db_injection import DbInjectionMiddleware
 from middlewares.correlation import CorrelationLoggingMiddleware
-from middlewares.activity_tracker import ActivityTrackerMiddleware
+from middlewares.executor import UpdateExecutorMiddleware
+from middlewares.metrics import HandlerMetricsMiddleware, TelegramApiMetricsMiddleware
+from middlewares.request_context import RequestContextMiddleware
+from middlewares.tracing import CallbackTracingMiddleware
+from infrastructure.redis_client import redis_client
 from aiogram.fsm.storage.redis import RedisStorage
 
 # Ensure console handles UTF-8 for emojis (especially on Windows)
@@ -32,8 +40,12 @@ if sys.stdout.encoding.lower() != "utf-8":
 from utils.constants import (
     CMD_START, CMD_NEW_PROJECT, CMD_MY_PROJECTS, CMD_MY_OFFERS, CMD_HELP, CMD_CANCEL,
     CMD_ADMIN, CMD_STATS, CMD_MAINTENANCE_ON, CMD_MAINTENANCE_OFF,
+    CMD_TRACE, CMD_TRACES,
 )
 from utils.logger import setup_logger
+from utils.metrics import UPDATES_IN_FLIGHT, UPDATES_WAITING, handle_metrics
+from utils.tracing import CallbackTracer
+from utils.webhook import WebhookIngestor
 
 # ... (imports)
 
@@ -54,6 +66,7 @@ else:
 
 # --- BOT INITIALIZATION ---
 bot = Bot(token=settings.BOT_TOKEN)
+bot.session.middleware(TelegramApiMetricsMiddleware())
 
 # Use Redis for fast, ephemeral FSM storage with 20-minute automatic expiration
 storage = RedisStorage.from_url(
@@ -64,33 +77,51 @@ storage = RedisStorage.from_url(
 dp = Dispatcher(storage=storage)
 
 # Register Middleware
-# Order matters: Correlation -> Activity Tracker -> DB Injection -> Maintenance -> Throttling -> Error Handler
+# Order matters: Correlation -> Request Context -> Handler Metrics -> DB Injection
+#   -> Throttling -> Maintenance -> Error Handler
 dp.message.outer_middleware(CorrelationLoggingMiddleware())
 dp.callback_query.outer_middleware(CorrelationLoggingMiddleware())
 dp.edited_message.outer_middleware(CorrelationLoggingMiddleware())
-dp.message.outer_middleware(ActivityTrackerMiddleware())
-dp.callback_query.outer_middleware(ActivityTrackerMiddleware())
-dp.edited_message.outer_middleware(ActivityTrackerMiddleware())
-dp.message.middleware(DbInjectionMiddleware())
-dp.callback_query.middleware(DbInjectionMiddleware())
-dp.edited_message.middleware(DbInjectionMiddleware())
-# One shared instance so the TTLCache is truly shared across event types.
-_throttle = ThrottlingMiddleware(rate_limit=0.5)
+# One Redis round trip per update: token bucket, activity stamp, maintenance flag.
+# Edited messages cost 0 tokens, so they only stamp activity.
+_request_context = RequestContextMiddleware(
+    redis_client,
+    capacity=settings.THROTTLE_CAPACITY,
+    refill_per_second=settings.THROTTLE_REFILL_PER_SECOND,
+)
+dp.message.outer_middleware(_request_context)
+dp.callback_query.outer_middleware(_request_context)
+dp.edited_message.outer_middleware(_request_context)
+# First inner middleware: per-handler latency histogram (covers everything below it).
+_handler_metrics = HandlerMetricsMiddleware()
+dp.message.middleware(_handler_metrics)
+dp.callback_query.middleware(_handler_metrics)
+dp.edited_message.middleware(_handler_metrics)
+# Lazily-built per-process singletons, injected only where a handler declares them.
+container = build_default_container()
+_db_injection = DbInjectionMiddleware(container)
+dp.message.middleware(_db_injection)
+dp.callback_query.middleware(_db_injection)
+dp.edited_message.middleware(_db_injection)
+# Drops updates the request context marked as throttled; answers throttled callbacks.
+_throttle = ThrottlingMiddleware()
 dp.message.middleware(_throttle)
 dp.callback_query.middleware(_throttle)
-dp.message.middleware(MaintenanceMiddleware())
-
-class DebugCallbackMiddleware(BaseMiddleware):
-    async def __call__(self, handler, event, data):
-        if isinstance(event, types.Update) and event.callback_query:
-            print(f"RAW CALLBACK PRINT: {event.callback_query.data}", flush=True)
-            logger.info("RAW CALLBACK", data=event.callback_query.data)
-        return await handler(event, data)
-
-
+dp.message.middleware(MaintenanceMiddleware(redis_client))
 
+# Executor first: per-user ordering + global in-flight cap around the whole chain.
+executor = UpdateExecutorMiddleware(max_in_flight=settings.MAX_CONCURRENT_UPDATES)
+dp.update.outer_middleware(executor)
+UPDATES_IN_FLIGHT.set_function(lambda: executor.in_flight)
+UPDATES_WAITING.set_function(lambda: executor.waiting)
 dp.update.outer_middleware(GlobalErrorHandler())
-dp.update.outer_middleware(DebugCallbackMiddleware())
+# Sampled / per-user opt-in callback tracing (admin: /trace, /traces).
+callback_tracer = CallbackTracer(
+    sample_rate=settings.CALLBACK_TRACE_SAMPLE_RATE,
+    buffer_size=settings.CALLBACK_TRACE_BUFFER_SIZE,
+)
+dp["callback_tracer"] = callback_tracer
+dp.callback_query.outer_middleware(CallbackTracingMiddleware(callback_tracer))
 dp.callback_query.middleware(GlobalErrorHandler())
 dp.edited_message.middleware(GlobalErrorHandler())
 
@@ -98,64 +129,109 @@ dp.edited_message.middleware(GlobalErrorHandler())
 dp.include_router(common_router)
 dp.include_router(client_router)
 dp.include_router(admin_router)
+# Resolve each handler's declared dependencies once, up front.
+container.wire(dp)
 
 
 # --- KEEP-ALIVE WEB SERVER FOR RAILWAY ---
 async def handle_ping(request):
     return web.Response(text="Bot is running!")
 
-async def start_keepalive_server():
+
+async def start_keepalive_server(ingestor: Optional[WebhookIngestor] = None):
     app = web.Application()
     app.router.add_get("/", handle_ping)
     app.router.add_get("/health", handle_ping)
-    
+    if ingestor is not None:
+        ingestor.register(app)
+
     runner = web.AppRunner(app)
     await runner.setup()
-    
+
     import os
     port = int(os.environ.get("PORT", 8080))
     site = web.TCPSite(runner, "0.0.0.0", port)
     await site.start()
     logger.info("Keep-alive server started", port=port)
     return runner
-    
+
+
+async def start_metrics_server() -> Optional[web.AppRunner]:
+    """Serves GET /metrics on METRICS_HOST:METRICS_PORT, apart from the public one."""
+    if not settings.METRICS_PORT:
+        return None
+    app = web.Application()
+    app.router.add_get("/metrics", handle_metrics)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, settings.METRICS_HOST, settings.METRICS_PORT)
+    await site.start()
+    logger.info(
+        "Metrics server started", host=settings.METRICS_HOST, port=settings.METRICS_PORT
+    )
+    return runner
+
+
 async def urgent_cases_job(bot: Bot):
     """Background task to check for urgent cases every 6 hours and notify admins."""
     from database.connection import get_db
     from infrastructure.repositories.project import ProjectRepository
     from utils.helpers import notify_admins
     from utils.constants import MSG_URGENT_REPORT_HEADER, MSG_URGENT_REPORT_ITEM
-    
+
     while True:
         try:
             db = await get_db()
             project_repo = ProjectRepository(db)
             urgent_projects = await project_repo.get_urgent_projects()
-            
+
             if urgent_projects:
                 text = MSG_URGENT_REPORT_HEADER
                 for p in urgent_projects:
                     subject = p.get('subject_name', 'N/A')
                     status = p.get('status', 'N/A')
                     text += MSG_URGENT_REPORT_ITEM.format(p['id'], subject, status)
-                
+
                 await notify_admins(bot, text, parse_mode=None)
         except Exception as e:
             logger.error("Error in urgent cases background job", error=str(e), exc_info=True)
-            
+
         await asyncio.sleep(6 * 60 * 60)  # Wait 6 hours
 
+
+async def daily_stats_job():
+    """Background task that reconciles the project_daily_stats rollup once a night."""
+    from datetime import datetime, timezone
+    from infrastructure.rollups import reconcile_daily_stats
+
+    while True:
+        now = datetime.now(timezone.utc)
+        next_run = now.replace(
+            hour=settings.STATS_RECONCILE_HOUR, minute=0, second=0, microsecond=0
+        )
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        await asyncio.sleep((next_run - now).total_seconds())
+        try:
+            await reconcile_daily_stats(Database.db)
+        except Exception as e:
+            logger.error(
+                "Error in daily stats reconcile job", error=str(e), exc_info=True
+            )
+
+
 async def e2e_tests_job(bot: Bot):
     """Background task to run E2E tests on startup, then every 6 hours and notify admins on failure/success."""
     from utils.helpers import notify_admins
     from utils.constants import MSG_TESTS_FAILED, MSG_TESTS_ERROR, MSG_TESTS_RUNNING_STARTUP, MSG_TESTS_SUCCESS
     import html
-    
+
     # Wait a few seconds to ensure bot is fully up before running startup tests
     await asyncio.sleep(10)
-    
+
     is_startup = True
-    
+
     while True:
         try:
             if is_startup:
@@ -170,38 +246,48 @@ async def e2e_tests_job(bot: Bot):
                 stderr=asyncio.subprocess.PIPE
             )
             stdout, stderr = await process.communicate()
-            
+
             output = stdout.decode('utf-8')
             err_output = stderr.decode('utf-8')
             full_output = (output + "\\n" + err_output).strip()
             full_output = html.escape(full_output)
-            
+
             if len(full_output) > 3000:
                 full_output = full_output[-3000:]
-                
+
             if process.returncode != 0:
                 await notify_admins(bot, MSG_TESTS_FAILED.format(full_output), parse_mode="HTML")
             else:
                 await notify_admins(bot, MSG_TESTS_SUCCESS.format(full_output), parse_mode="HTML")
                 logger.info("Automated E2E tests passed successfully.")
-                
+
         except Exception as e:
             logger.error("Error in e2e tests background job", error=str(e), exc_info=True)
             await notify_admins(bot, MSG_TESTS_ERROR.format(str(e)), parse_mode="HTML")
-            
+
         is_startup = False
         await asyncio.sleep(6 * 60 * 60)  # Wait 6 hours
 
+
 # --- MAIN ENTRY POINT ---
 async def main():
     """
-    Initializes the bot, sets up commands, and starts the polling loop.
+    Initializes the bot, sets up commands, and starts receiving updates
+    (webhook when WEBHOOK_URL is set, long polling otherwise).
     Ensures the database is ready before accepting any updates.
     """
+    ingestor = None
     try:
         # Step 1: Initialize Database schema
         await init_db()
         logger.info("📂 Database initialized.")
+        # Audit events are buffered and written in batches from here on.
+        audit_writer.start(Database.db)
+
+        # Process-wide settings snapshot; injected into every update via the
+        # dispatcher workflow data and kept fresh over Redis pub/sub.
+        settings_repo = container.resolve("settings_repo")
+        dp["settings_repo"] = settings_repo
 
         # Set bot commands
         student_commands = [
@@ -218,6 +304,8 @@ async def main():
             types.BotCommand(command="stats", description=CMD_STATS),
             types.BotCommand(command="maintenance_on", description=CMD_MAINTENANCE_ON),
             types.BotCommand(command="maintenance_off", description=CMD_MAINTENANCE_OFF),
+            types.BotCommand(command="trace", description=CMD_TRACE),
+            types.BotCommand(command="traces", description=CMD_TRACES),
         ]
 
         # Apply student commands to everyone
@@ -234,21 +322,50 @@ async def main():
             except Exception as e:
                 logger.warning("Failed to set admin commands for user", admin_id=admin_id, error=str(e))
 
-
         logger.info("Bot online", admin_ids=settings.admin_ids)
 
-        await bot.delete_webhook(drop_pending_updates=True)
-        
-        # Start keep-alive web server for Railway
-        runner = await start_keepalive_server()
-        
+        if settings.WEBHOOK_URL:
+            ingestor = WebhookIngestor(
+                bot,
+                dp,
+                secret=settings.WEBHOOK_SECRET,
+                queue_size=settings.WEBHOOK_QUEUE_SIZE,
+                max_tasks=settings.WEBHOOK_MAX_TASKS,
+            )
+        else:
+            await bot.delete_webhook(drop_pending_updates=True)
+
+        # Start keep-alive web server for Railway (also serves the webhook route)
+        runner = await start_keepalive_server(ingestor)
+        metrics_runner = await start_metrics_server()
+
         # Track all background tasks so we can cancel them cleanly on shutdown
         background_tasks = [
             asyncio.create_task(urgent_cases_job(bot), name="urgent_cases_job"),
             asyncio.create_task(e2e_tests_job(bot), name="e2e_tests_job"),
+            asyncio.create_task(daily_stats_job(), name="daily_stats_job"),
+            asyncio.create_task(
+                run_background_migrations(Database.db), name="background_migrations"
+            ),
+            asyncio.create_task(
+                settings_repo.listen_for_invalidations(),
+                name="settings_invalidation_listener",
+            ),
         ]
-        
-        await dp.start_polling(bot)
+
+        if ingestor is not None:
+            await ingestor.start()
+            # Every replica registers the same URL, so this is idempotent.
+            await bot.set_webhook(
+                url=settings.WEBHOOK_URL.rstrip("/") + ingestor.path,
+                secret_token=settings.WEBHOOK_SECRET,
+                allowed_updates=dp.resolve_used_update_types(),
+            )
+            logger.info("Webhook mode enabled", url=settings.WEBHOOK_URL)
+            # Serve until the process is cancelled
+            await asyncio.Event().wait()
+        else:
+            await dp.start_polling(bot)
 
     except Exception as e:
         logger.error("Error occurred while running bot", e=str(e), exc_info=True)
@@ -258,14 +375,19 @@ async def main():
             for task in background_tasks:
                 task.cancel()
             await asyncio.gather(*background_tasks, return_exceptions=True)
+        if ingestor is not None:
+            await ingestor.stop()
+        # After the handlers have stopped, so their last events are drained.
+        await audit_writer.stop()
         await bot.session.close()
         try:
             if "runner" in dir() and runner:
                 await runner.cleanup()
+            if "metrics_runner" in dir() and metrics_runner:
+                await metrics_runner.cleanup()
         except Exception:
             pass
 
 
-
 if __name__ == "__main__":
     asyncio.run(main())
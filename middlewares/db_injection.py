@@ -1,11 +1,11 @@
 """
 DB Injection Middleware
 =======================
-Builds repository instances for every incoming update and injects them
-into the aiogram handler data dict.
+Injects per-process repository singletons into the aiogram handler data
+dict — but only the ones the resolved handler actually declares.
 
-Handlers declare typed parameters matching the keys below and aiogram
-automatically resolves them:
+Handlers declare parameters matching the container's provider names and
+aiogram resolves them:
 
     async def my_handler(
         message: types.Message,
@@ -15,35 +15,32 @@ automatically resolves them:
         ...
 
 Design notes:
-  - Repositories are lightweight objects (just a reference to `db`) so
-    constructing them per-update is negligible overhead.
-  - We read `Database.db` here (infrastructure layer boundary). This is
-    the *only* place outside of infrastructure/ that knows about the DB
-    connection object.
-  - SettingsRepository / StatsRepository are injected the same way so
-    admin handlers can also be fully tested with mocks.
+  - Registered as an **inner** middleware, so ``data["handler"]`` is the
+    matched ``HandlerObject``. Its parameter set was inspected once by
+    aiogram at registration; ``DependencyContainer`` caches the
+    intersection with its provider names per handler.
+  - Instances are built lazily on first use and then reused for every
+    update (repositories only hold a reference to ``db``).
+  - The container reads ``Database.db`` (infrastructure layer boundary),
+    so nothing outside infrastructure/ knows about the DB connection.
+  - Names already present in ``data`` (e.g. the ``settings_repo`` put in
+    the dispatcher workflow data by main.py) are never overwritten, which
+    also keeps handlers fully testable with mocks.
 """
-from typing import Any, Awaitable, Callable, Dict
+from typing import Any, Awaitable, Callable, Dict, Optional
 
 from aiogram import BaseMiddleware
 from aiogram.types import TelegramObject
 
+from infrastructure.container import DependencyContainer, build_default_container
 from infrastructure.mongo_db import Database
-from infrastructure.repositories import (
-    PaymentRepository,
-    ProjectRepository,
-    SettingsRepository,
-    StatsRepository,
-    TicketRepository,
-    AuditRepository,
-    TeamRequestRepository,
-    StudentRepository,
-    UserReferralRepository,
-)
-from application.withdrawal_service import WithdrawalService
+
 
 class DbInjectionMiddleware(BaseMiddleware):
-    """Injects repository instances into the handler data dict."""
+    """Injects the container dependencies the matched handler declares."""
+
+    def __init__(self, container: Optional[DependencyContainer] = None) -> None:
+        self.container = container or build_default_container()
 
     async def __call__(
         self,
@@ -51,20 +48,11 @@ class DbInjectionMiddleware(BaseMiddleware):
         event: TelegramObject,
         data: Dict[str, Any],
     ) -> Any:
-        db = Database.db
+        handler_object = data.get("handler")
 
-        if db is not None:
-            data["project_repo"] = ProjectRepository(db)
-            data["payment_repo"] = PaymentRepository(db)
-            data["stats_repo"] = StatsRepository(db)
-            data["settings_repo"] = SettingsRepository(db)
-            data["ticket_repo"] = TicketRepository(db)
-            data["audit_repo"] = AuditRepository(db)
-            data["team_request_repo"] = TeamRequestRepository(db)
-            data["student_repo"] = StudentRepository(db)
-            
-            user_referral_repo = UserReferralRepository(db)
-            data["user_referral_repo"] = user_referral_repo
-            data["withdrawal_service"] = WithdrawalService(user_referral_repo)
+        if Database.db is not None and handler_object is not None:
+            for name in self.container.dependencies_for(handler_object):
+                if name not in data:
+                    data[name] = self.container.resolve(name)
 
         return await handler(event, data)
@@ -0,0 +1,142 @@
+"""
+Update executor middleware
+==========================
+Sits in front of every router (outer ``update`` middleware) and gives
+two guarantees aiogram does not provide on its own:
+
+* **Per-user ordering** – updates from the same ``from_user.id`` run one
+  at a time, in arrival order, on that user's lane. A double-tapped
+  button can no longer race its own FSM state.
+* **Global bound** – at most ``max_in_flight`` handlers run at once;
+  everything else waits without holding a slot.
+
+A user's queued updates wait on their lane *before* taking a global
+slot, so one busy user can never starve everyone else — provided the
+update source runs every update in its own task (long polling does, and
+so does ``utils.webhook.WebhookIngestor``); a fixed worker pool would
+park its workers on that user's lane.
+
+Queue depth (updates waiting on a lane or a slot), in-flight count and
+wait time (arrival → handler start) are available from
+:meth:`UpdateExecutorMiddleware.snapshot`.
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, User
+import structlog
+
+from utils.metrics import UPDATE_WAIT
+
+logger = structlog.get_logger(__name__)
+
+# Waits longer than this are logged so overload is visible without metrics.
+SLOW_WAIT_SECONDS = 1.0
+
+
+@dataclass
+class _Lane:
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    pending: int = 0  # updates queued on or running in this lane
+
+
+class UpdateExecutorMiddleware(BaseMiddleware):
+    """
+    Per-user sequential, globally bounded update execution.
+
+    Usage in main.py
+    ----------------
+    Register as the **first** outer middleware on ``dp.update`` so the
+    whole middleware chain runs inside the lane::
+
+        executor = UpdateExecutorMiddleware(max_in_flight=100)
+        dp.update.outer_middleware(executor)
+    """
+
+    def __init__(self, max_in_flight: int = 100) -> None:
+        self.max_in_flight = max_in_flight
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._lanes: Dict[int, _Lane] = {}
+        self.waiting = 0
+        self.in_flight = 0
+        self.processed_total = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        enqueued_at = time.perf_counter()
+        # Set by aiogram's UserContextMiddleware, which runs before us.
+        user: Optional[User] = data.get("event_from_user")
+        lane: Optional[_Lane] = None
+
+        self.waiting += 1
+        try:
+            if user is not None:
+                lane = self._lanes.get(user.id)
+                if lane is None:
+                    lane = self._lanes[user.id] = _Lane()
+                lane.pending += 1
+                await lane.lock.acquire()
+            try:
+                await self._slots.acquire()
+            except BaseException:
+                if lane is not None:
+                    lane.lock.release()
+                raise
+        except BaseException:
+            # Cancelled (e.g. shutdown) before the handler ever started.
+            self.waiting -= 1
+            if lane is not None:
+                self._leave_lane(user.id, lane)
+            raise
+        self.waiting -= 1
+
+        self._record_wait(time.perf_counter() - enqueued_at, user)
+        self.in_flight += 1
+        try:
+            return await handler(event, data)
+        finally:
+            self.in_flight -= 1
+            self.processed_total += 1
+            self._slots.release()
+            if lane is not None:
+                lane.lock.release()
+                self._leave_lane(user.id, lane)
+
+    def _leave_lane(self, user_id: int, lane: _Lane) -> None:
+        lane.pending -= 1
+        if lane.pending == 0:
+            del self._lanes[user_id]
+
+    def _record_wait(self, wait: float, user: Optional[User]) -> None:
+        self.wait_seconds_total += wait
+        self.wait_seconds_max = max(self.wait_seconds_max, wait)
+        UPDATE_WAIT.observe(wait)
+        if wait > SLOW_WAIT_SECONDS:
+            logger.warning(
+                "Update waited for execution",
+                user_id=user.id if user else None,
+                wait_ms=round(wait * 1000, 2),
+                in_flight=self.in_flight,
+                waiting=self.waiting,
+            )
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Point-in-time executor metrics."""
+        return {
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "waiting": self.waiting,
+            "lanes": len(self._lanes),
+            "processed_total": self.processed_total,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "wait_seconds_max": round(self.wait_seconds_max, 6),
+        }
@@ -1,19 +1,34 @@
-
 from typing import Any, Awaitable, Callable, Dict
 
 from aiogram import BaseMiddleware
 from aiogram.types import Message
+import structlog
 
 from config import settings
+from infrastructure.redis_client import (
+    MAINTENANCE_FLAG_KEY,
+    MAINTENANCE_FLAG_TTL_SECONDS,
+)
 from utils.constants import MSG_MAINTENANCE_ACTIVE
+from utils.metrics import observe_redis
+
+logger = structlog.get_logger(__name__)
 
 
 class MaintenanceMiddleware(BaseMiddleware):
     """
     Blocks usage for non-admins when global maintenance mode is on.
-    Reads settings_repo from the data dict injected by DbInjectionMiddleware.
+
+    The flag normally arrives pre-read in ``data["request_context"]``
+    (RequestContextMiddleware's single Redis round trip). Only on a cache
+    miss is settings_repo (injected by DbInjectionMiddleware) queried, and
+    the result is written back to Redis for the next
+    ``MAINTENANCE_FLAG_TTL_SECONDS``.
     """
 
+    def __init__(self, redis_client=None) -> None:
+        self._redis = redis_client
+
     async def __call__(
         self,
         handler: Callable[[Message, Dict[str, Any]], Awaitable[Any]],
@@ -26,11 +41,32 @@ class MaintenanceMiddleware(BaseMiddleware):
         if event.from_user.id in settings.admin_ids:
             return await handler(event, data)
 
-        settings_repo = data.get("settings_repo")
-        if settings_repo and await settings_repo.get_maintenance_mode():
+        if await self._is_maintenance_on(data):
             await event.answer(
                 MSG_MAINTENANCE_ACTIVE
             )
             return None
 
         return await handler(event, data)
+
+    async def _is_maintenance_on(self, data: Dict[str, Any]) -> bool:
+        ctx = data.get("request_context")
+        if ctx is not None and ctx.maintenance_mode is not None:
+            return ctx.maintenance_mode
+
+        settings_repo = data.get("settings_repo")
+        if not settings_repo:
+            return False
+
+        enabled = await settings_repo.get_maintenance_mode()
+        if self._redis is not None:
+            try:
+                with observe_redis("maintenance_flag_set"):
+                    await self._redis.set(
+                        MAINTENANCE_FLAG_KEY,
+                        "1" if enabled else "0",
+                        ex=MAINTENANCE_FLAG_TTL_SECONDS,
+                    )
+            except Exception as e:
+                logger.warning("Failed to cache maintenance flag", error=str(e))
+        return enabled
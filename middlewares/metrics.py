@@ -0,0 +1,77 @@
+"""
+Metrics middlewares
+===================
+``HandlerMetricsMiddleware`` – inner update middleware; records
+``bot_update_duration_seconds`` labelled with the resolved handler's
+name (``data["handler"]``) and the event type.
+
+``TelegramApiMetricsMiddleware`` – aiogram *session* request middleware;
+records ``bot_telegram_api_duration_seconds`` per Bot API method.
+
+Usage in main.py
+----------------
+::
+
+    handler_metrics = HandlerMetricsMiddleware()
+    dp.message.middleware(handler_metrics)       # register first (outermost inner)
+    bot.session.middleware(TelegramApiMetricsMiddleware())
+"""
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware, Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.methods import Response, TelegramMethod
+from aiogram.types import TelegramObject
+
+from utils.metrics import TELEGRAM_API_DURATION, UPDATE_DURATION
+
+
+def _handler_name(handler_object: Any) -> str:
+    if handler_object is None:
+        return "unhandled"
+    callback = handler_object.callback
+    return f"{callback.__module__}.{getattr(callback, '__qualname__', repr(callback))}"
+
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """Observes per-handler latency for every update that reaches a handler."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        histogram = UPDATE_DURATION.labels(
+            _handler_name(data.get("handler")), type(event).__name__
+        )
+        start = time.perf_counter()
+        try:
+            return await handler(event, data)
+        finally:
+            histogram.observe(time.perf_counter() - start)
+
+
+class TelegramApiMetricsMiddleware(BaseRequestMiddleware):
+    """Observes latency of every outgoing Bot API call made through aiogram."""
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType,
+        bot: Bot,
+        method: TelegramMethod,
+    ) -> Response:
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            response = await make_request(bot, method)
+            outcome = "ok"
+            return response
+        finally:
+            TELEGRAM_API_DURATION.labels(type(method).__name__, outcome).observe(
+                time.perf_counter() - start
+            )
@@ -0,0 +1,171 @@
+"""
+Request context middleware
+==========================
+Does all per-update Redis bookkeeping in **one** round trip, before any
+other middleware needs it:
+
+* token-bucket throttle check (see ``middlewares.throttling``)
+* TTL refresh of the user's FSM data record, so an idle flow expires
+  ``data_ttl`` after the last interaction (replaces the old FSM
+  ``update_data`` read-modify-write of the whole data blob)
+* read of the cached maintenance flag
+
+An in-process :class:`LocalTokenBucket` runs first; updates it rejects
+never reach Redis.
+
+The outcome is stored as a :class:`RequestContext` in
+``data["request_context"]``; ``ThrottlingMiddleware`` and
+``MaintenanceMiddleware`` read it instead of talking to Redis / Mongo
+themselves.
+
+Usage in main.py
+----------------
+Register as an **outer** middleware so the context exists before the
+inner throttle / maintenance checks run::
+
+    ctx = RequestContextMiddleware(redis_client)
+    dp.message.outer_middleware(ctx)
+    dp.callback_query.outer_middleware(ctx)
+    dp.edited_message.outer_middleware(ctx)
+"""
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from aiogram import BaseMiddleware
+from aiogram.fsm.storage.redis import RedisStorage
+from aiogram.types import CallbackQuery, Message, TelegramObject
+import structlog
+
+from infrastructure.redis_client import MAINTENANCE_FLAG_KEY, throttle_key
+from middlewares.throttling import (
+    DEFAULT_COSTS,
+    LocalTokenBucket,
+    ThrottleCosts,
+    event_type_of,
+)
+from utils.metrics import observe_redis
+
+logger = structlog.get_logger(__name__)
+
+# The in-process pre-check allows this many times the Redis burst, so it
+# only ever rejects traffic Redis would certainly reject too.
+LOCAL_CAPACITY_FACTOR = 2
+
+# KEYS[1] bucket hash, KEYS[2] maintenance flag key, KEYS[3] FSM data key (optional)
+# ARGV[1] cost ("0" = don't throttle), ARGV[2] capacity,
+# ARGV[3] refill tokens/second, ARGV[4] FSM data TTL (s)
+_CONTEXT_SCRIPT = """
+local allowed = 1
+local cost = tonumber(ARGV[1])
+if cost > 0 then
+    local capacity = tonumber(ARGV[2])
+    local rate = tonumber(ARGV[3])
+    local t = redis.call('TIME')
+    local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(bucket[1]) or capacity
+    local ts = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    if tokens >= cost then
+        tokens = tokens - cost
+    else
+        allowed = 0
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+    redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+end
+if KEYS[3] then
+    redis.call('EXPIRE', KEYS[3], ARGV[4])
+end
+return {allowed, redis.call('GET', KEYS[2])}
+"""
+
+
+def _fsm_data_key(data: Dict[str, Any]) -> Optional[Tuple[str, int]]:
+    """Redis key and TTL (s) of the update's FSM data record, if it has one."""
+    state = data.get("state")
+    storage = getattr(state, "storage", None)
+    if not isinstance(storage, RedisStorage) or not storage.data_ttl:
+        return None
+    ttl = storage.data_ttl
+    seconds = int(ttl.total_seconds()) if isinstance(ttl, timedelta) else int(ttl)
+    return storage.key_builder.build(state.key, "data"), seconds
+
+
+@dataclass
+class RequestContext:
+    """Per-update facts resolved by :class:`RequestContextMiddleware`."""
+    user_id: int
+    throttled: bool
+    # None means the flag is not cached in Redis; callers fall back to Mongo.
+    maintenance_mode: Optional[bool]
+
+
+class RequestContextMiddleware(BaseMiddleware):
+    """
+    Resolves throttle / maintenance state and refreshes the FSM data TTL
+    in a single Lua call.
+
+    Updates whose cost is 0 (edited messages by default) are never
+    throttled but still keep the FSM data alive.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        *,
+        capacity: float = 5.0,
+        refill_per_second: float = 2.0,
+        costs: ThrottleCosts = DEFAULT_COSTS,
+    ) -> None:
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.costs = costs
+        self._local = LocalTokenBucket(
+            capacity * LOCAL_CAPACITY_FACTOR, refill_per_second
+        )
+        self._script = redis_client.register_script(_CONTEXT_SCRIPT)
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        if not isinstance(event, (Message, CallbackQuery)) or event.from_user is None:
+            return await handler(event, data)
+
+        user_id = event.from_user.id
+        cost = self.costs.cost_for(event, event_type_of(data))
+
+        if cost > 0 and not self._local.consume(user_id, cost):
+            # Obvious flood: decided locally, Redis is not touched.
+            data["request_context"] = RequestContext(
+                user_id=user_id, throttled=True, maintenance_mode=None
+            )
+            return await handler(event, data)
+
+        try:
+            with observe_redis("request_context"):
+                keys: List[str] = [throttle_key(user_id), MAINTENANCE_FLAG_KEY]
+                args: List[Any] = [cost, self.capacity, self.refill_per_second]
+                fsm = _fsm_data_key(data)
+                if fsm is not None:
+                    keys.append(fsm[0])
+                    args.append(fsm[1])
+                allowed, maintenance = await self._script(keys=keys, args=args)
+        except Exception as e:
+            # Redis being down must not take the bot down with it: fall back
+            # to the local bucket's verdict and let maintenance read Mongo.
+            logger.warning(
+                "Request context lookup failed", user_id=user_id, error=str(e)
+            )
+            allowed, maintenance = 1, None
+
+        data["request_context"] = RequestContext(
+            user_id=user_id,
+            throttled=not allowed,
+            maintenance_mode=None if maintenance is None else maintenance == "1",
+        )
+        return await handler(event, data)
@@ -1,89 +1,163 @@
 """
 Throttling middleware
 ====================
-Limits each user to one request per ``rate_limit`` seconds, **across all
-event types** that the same middleware instance is registered on.
+Token-bucket rate limiting per user, **across all event types**.
+
+Each user owns a bucket of ``capacity`` tokens that refills at
+``refill_per_second``. Every update spends tokens according to
+:class:`ThrottleCosts` — a pagination click is cheap, finalizing a
+submission or confirming a payment is expensive — so bursts of normal
+use (e.g. an album upload) pass while sustained floods are rejected.
 
 Key design decisions
 --------------------
-* A **single** ``ThrottlingMiddleware`` instance should be reused for every
-  event observer (message, callback_query, …).  ``main.py`` must pass the
-  same object to each ``dp.<observer>.middleware(...)`` call so that the
-  shared Redis instance is actually used.
+* The authoritative bucket lives in Redis and is consumed inside
+  ``RequestContextMiddleware``'s single Lua round trip. This module only
+  holds the cost table, the in-process pre-check and the middleware that
+  acts on the decision (``data["request_context"].throttled``).
+
+* :class:`LocalTokenBucket` is a looser, per-process copy of the bucket.
+  Obvious floods are rejected by it before Redis is touched at all.
 
-* Cache key is ``user_id`` alone (not per-event-type) so a spammer cannot
+* Bucket key is ``user_id`` alone (not per-event-type) so a spammer cannot
   bypass the message rate-limit by sending rapid callback presses instead.
 
-* The import of ``CallbackQuery`` is hoisted to module level (avoids a
-  repeated import on every hot-path call).
+* Throttled callback queries get an empty ``answer()`` so the Telegram
+  client stops its spinner instead of retrying; throttled messages are
+  dropped silently.
 """
 import time
-from typing import Any, Awaitable, Callable, Dict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
 
 from aiogram import BaseMiddleware
-from aiogram.types import CallbackQuery, Message
-import redis.asyncio as redis
+from aiogram.types import CallbackQuery, Message, TelegramObject, Update
+from cachetools import TTLCache
 import structlog
-from config import settings
+
+from utils.constants import BTN_DONE
 
 logger = structlog.get_logger(__name__)
 
 
+@dataclass
+class ThrottleCosts:
+    """
+    Token cost of an update.
+
+    ``callback_prefixes`` is matched against ``callback_query.data``
+    (longest prefix wins); ``message_texts`` against exact message text,
+    which covers reply-keyboard buttons.
+    """
+    event_types: Dict[str, float] = field(default_factory=dict)
+    callback_prefixes: Dict[str, float] = field(default_factory=dict)
+    message_texts: Dict[str, float] = field(default_factory=dict)
+    default: float = 1.0
+
+    def cost_for(
+        self, event: TelegramObject, event_type: Optional[str] = None
+    ) -> float:
+        if isinstance(event, CallbackQuery) and event.data:
+            best = None
+            for prefix in self.callback_prefixes:
+                if event.data.startswith(prefix) and (
+                    best is None or len(prefix) > len(best)
+                ):
+                    best = prefix
+            if best is not None:
+                return self.callback_prefixes[best]
+        elif isinstance(event, Message) and event.text in self.message_texts:
+            return self.message_texts[event.text]
+        return self.event_types.get(event_type, self.default)
+
+
+DEFAULT_COSTS = ThrottleCosts(
+    event_types={
+        "message": 1.0,
+        "callback_query": 1.0,
+        # Edits were never throttled; they only stamp activity.
+        "edited_message": 0.0,
+    },
+    callback_prefixes={
+        "page:": 0.5,            # pagination
+        "proj:accept": 2.0,
+        "pay:confirm": 2.0,
+        "pay:reject": 2.0,
+        "team:create": 2.0,
+        "team:join": 2.0,
+        "wdraw:confirm": 3.0,
+    },
+    message_texts={
+        BTN_DONE: 3.0,           # submission finalize
+    },
+)
+
+
+def event_type_of(data: Dict[str, Any]) -> Optional[str]:
+    """Update field name (``message``, ``edited_message``, …) for this event."""
+    update: Optional[Update] = data.get("event_update")
+    return update.event_type if update is not None else None
+
+
+class LocalTokenBucket:
+    """
+    In-process token bucket used as a pre-check in front of Redis.
+
+    Buckets that have been idle long enough to refill completely are
+    evicted by the TTL cache; a missing bucket is a full one.
+    """
+
+    def __init__(
+        self, capacity: float, refill_per_second: float, maxsize: int = 10_000
+    ) -> None:
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._buckets: TTLCache = TTLCache(
+            maxsize=maxsize, ttl=capacity / refill_per_second
+        )
+
+    def consume(self, key: int, cost: float) -> bool:
+        now = time.monotonic()
+        tokens, last = self._buckets.get(key, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - last) * self.refill_per_second)
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        self._buckets[key] = (tokens, now)
+        return allowed
+
+
 class ThrottlingMiddleware(BaseMiddleware):
     """
     Anti-spam middleware.
 
-    Rate-limits each Telegram user to one accepted request every
-    ``rate_limit`` seconds using Redis. Throttled events are silently dropped
-    (returns ``None`` without calling the next handler).
+    Drops updates that ``RequestContextMiddleware`` marked as throttled
+    and answers throttled callback queries.
 
     Usage in main.py
     ----------------
     Create **one** instance and register it on every observer you want
     to protect::
 
-        throttle = ThrottlingMiddleware(rate_limit=0.5)
+        throttle = ThrottlingMiddleware()
         dp.message.middleware(throttle)
         dp.callback_query.middleware(throttle)
     """
 
-    def __init__(self, rate_limit: float = 2.0) -> None:
-        self.rate_limit = rate_limit
-        # Initialize Redis connection pool
-        self._redis = redis.from_url(settings.REDIS_URI, decode_responses=True)
-
     async def __call__(
         self,
         handler: Callable[[Any, Dict[str, Any]], Awaitable[Any]],
         event: Any,
         data: Dict[str, Any],
     ) -> Any:
-        # Resolve user_id for the two primary event types we throttle.
-        if isinstance(event, (Message, CallbackQuery)):
-            user = event.from_user
-            if user is None:
-                # Anonymous channel posts — pass through untouched.
-                return await handler(event, data)
-            user_id: int = user.id
-        else:
-            # Unknown event type (e.g. inline_query) — pass through.
+        ctx = data.get("request_context")
+        if ctx is None or not ctx.throttled:
             return await handler(event, data)
 
-        redis_key = f"throttle:{user_id}"
-        
-        # Check if key exists using Redis
-        is_throttled = await self._redis.exists(redis_key)
-        
-        if is_throttled:
-            logger.warning(
-                "Request throttled",
-                user_id=user_id,
-                rate_limit=self.rate_limit,
-            )
-            return None  # Drop the update silently.
-
-        # Mark user as "seen" for this window by setting key with expiry.
-        # Use SET with EX (expiration in seconds)
-        # Using math.ceil as Redis EX requires integer seconds. For sub-second, use PX.
-        await self._redis.set(redis_key, "1", px=int(self.rate_limit * 1000))
-        return await handler(event, data)
+        logger.warning("Request throttled", user_id=ctx.user_id)
+        if isinstance(event, CallbackQuery):
+            try:
+                await event.answer()
+            except Exception:
+                pass  # Query too old / already answered — nothing to do.
+        return None  # Drop the update.
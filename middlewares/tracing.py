@@ -0,0 +1,70 @@
+"""
+Callback tracing middleware
+===========================
+Replaces the old ``DebugCallbackMiddleware`` that printed and logged
+every callback query. The per-click cost is now one ``random()`` call;
+only sampled or opted-in callbacks are timed and stored in the
+:class:`~utils.tracing.CallbackTracer` ring buffer, and only opted-in
+users' callbacks are logged.
+
+Usage in main.py
+----------------
+Register as an **outer** callback-query middleware so callbacks no
+handler matches are traced too::
+
+    tracer = CallbackTracer(sample_rate=settings.CALLBACK_TRACE_SAMPLE_RATE)
+    dp.callback_query.outer_middleware(CallbackTracingMiddleware(tracer))
+    dp["callback_tracer"] = tracer   # for the /trace and /traces commands
+"""
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.event.bases import UNHANDLED
+from aiogram.types import CallbackQuery, TelegramObject
+import structlog
+
+from utils.tracing import CallbackTracer, make_trace
+
+logger = structlog.get_logger(__name__)
+
+
+class CallbackTracingMiddleware(BaseMiddleware):
+    def __init__(self, tracer: CallbackTracer) -> None:
+        self.tracer = tracer
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        if not (
+            isinstance(event, CallbackQuery)
+            and self.tracer.should_record(event.from_user.id)
+        ):
+            return await handler(event, data)
+
+        start = time.perf_counter()
+        outcome = "handled"
+        try:
+            result = await handler(event, data)
+            if result is UNHANDLED:
+                outcome = "unhandled"
+            return result
+        except Exception as e:
+            outcome = type(e).__name__
+            raise
+        finally:
+            trace = make_trace(
+                event.from_user.id, event.data, time.perf_counter() - start, outcome
+            )
+            self.tracer.record(trace)
+            if self.tracer.is_traced_user(event.from_user.id):
+                logger.info(
+                    "Callback trace",
+                    user_id=trace.user_id,
+                    callback_data=trace.data,
+                    outcome=trace.outcome,
+                    duration_ms=round(trace.duration_ms, 1),
+                )
@@ -0,0 +1,89 @@
+"""
+bench_id_allocation.py — Insert throughput: per-call counter vs ID blocks
+========================================================================
+Compares the old ``get_next_sequence`` (one ``$inc`` on ``counters`` per
+insert) with the hi-lo block allocator now used by ``Database``.
+
+Runs against a scratch database ``<DB_NAME>_bench`` that is dropped
+afterwards; the bot's own data is never touched.
+
+Usage::
+
+    python scripts/db/bench_id_allocation.py [--inserts 2000] [--concurrency 20] \
+        [--block-size 50]
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from config import settings
+from infrastructure.mongo_db import Database
+
+
+async def per_call_counter(db, name: str) -> int:
+    """The pre-block implementation: one counters round trip per ID."""
+    result = await db.counters.find_one_and_update(
+        {"_id": name}, {"$inc": {"seq": 1}}, upsert=True, return_document=True
+    )
+    return result["seq"]
+
+
+async def block_allocator(db, name: str) -> int:
+    return await Database.get_next_sequence(name)
+
+
+async def run(db, next_id, label: str, inserts: int, concurrency: int) -> None:
+    await db.bench_projects.drop()
+    await db.counters.delete_many({})
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def insert_one() -> None:
+        async with semaphore:
+            project_id = await next_id(db, "project_id")
+            await db.bench_projects.insert_one(
+                {"id": project_id, "created_at": datetime.now(timezone.utc)}
+            )
+
+    start = time.perf_counter()
+    await asyncio.gather(*(insert_one() for _ in range(inserts)))
+    elapsed = time.perf_counter() - start
+
+    ids = await db.bench_projects.distinct("id")
+    assert len(ids) == inserts, "duplicate IDs allocated"
+    print(f"  {label:<22} {inserts / elapsed:>9.0f} inserts/s   ({elapsed:.2f}s)")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--inserts", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--block-size", type=int, default=settings.ID_BLOCK_SIZE)
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(settings.MONGO_URI)
+    db = client[f"{settings.DB_NAME}_bench"]
+    Database.db = db
+    Database.id_block_size = args.block_size
+
+    print(
+        f"{args.inserts} inserts, concurrency {args.concurrency}, "
+        f"block size {args.block_size}"
+    )
+    try:
+        await run(
+            db, per_call_counter, "per-call counter", args.inserts, args.concurrency
+        )
+        Database._id_blocks.clear()
+        await run(
+            db, block_allocator, "block allocator", args.inserts, args.concurrency
+        )
+    finally:
+        await client.drop_database(db.name)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
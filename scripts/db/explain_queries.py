@@ -0,0 +1,979 @@
+"""
+explain_queries.py — Query plans for every repository method
+============================================================
+Seeds a scratch database ``<DB_NAME>_explain`` (dropped afterwards),
+brings it to the current schema with ``ensure_schema`` and calls every
+public method of the repository classes in ``infrastructure/repositories``
+and every public coroutine in ``dashboard_api/repositories``.
+
+Each query those calls send (find, aggregate, count, distinct, update,
+delete, findAndModify — captured with a pymongo command listener) is run
+again as ``explain`` with ``executionStats``. The run fails (exit status 1)
+when
+
+* a plan contains a ``COLLSCAN`` stage,
+* a query examines more than ``--max-ratio`` keys/documents per document
+  returned (grouping aggregations, counts and distincts excepted), or
+* a repository method has no entry in :func:`build_calls` — add one when
+  you add a query.
+
+For every finding the ``IndexSpec`` that would serve it (equality fields,
+then sort, then ranges) is printed, ready for ``infrastructure.schema``.
+Calls marked ``scan=True`` read whole collections on purpose; they are
+reported but do not fail the run.
+
+Usage::
+
+    python scripts/db/explain_queries.py [--docs 1000] [--max-ratio 10]
+"""
+
+import argparse
+import asyncio
+import copy
+import importlib
+import inspect
+import pkgutil
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+
+from config import settings
+from domain.entities import CommissionLog, JoinRequest, TeamRequest, WithdrawalRequest
+from domain.enums import (
+    AuditEventType,
+    PaymentStatus,
+    ProjectStatus,
+    TeamRequestStatus,
+    TicketStatus,
+)
+from infrastructure.attention import URGENT_AFTER
+from infrastructure.mongo_db import Database
+from infrastructure.repositories import (
+    AuditRepository,
+    PaymentRepository,
+    ProjectRepository,
+    SettingsRepository,
+    StatsRepository,
+    StudentRepository,
+    TeamRequestRepository,
+    TicketRepository,
+    UserReferralRepository,
+)
+from infrastructure.repositories.e2e_test_repo import E2ETestRepo
+from infrastructure.schema import ensure_schema
+
+REPOSITORY_PACKAGES = ("infrastructure.repositories", "dashboard_api.repositories")
+# Classes with no queries of their own.
+SKIPPED_CLASSES = {"CachedSettingsRepository"}  # cache in front of SettingsRepository
+
+EXPLAINABLE = {
+    "find",
+    "aggregate",
+    "count",
+    "distinct",
+    "update",
+    "delete",
+    "findAndModify",
+}
+# Session / routing fields the driver adds that ``explain`` rejects.
+_DRIVER_FIELDS = {
+    "lsid",
+    "$db",
+    "$clusterTime",
+    "$readPreference",
+    "readConcern",
+    "writeConcern",
+    "txnNumber",
+    "autocommit",
+    "startTransaction",
+}
+_GROUPING_STAGES = {
+    "$group",
+    "$count",
+    "$facet",
+    "$bucket",
+    "$bucketAuto",
+    "$sortByCount",
+}
+_RANGE_OPERATORS = {
+    "$gt",
+    "$gte",
+    "$lt",
+    "$lte",
+    "$ne",
+    "$nin",
+    "$exists",
+    "$regex",
+    "$type",
+}
+
+
+class CommandRecorder(monitoring.CommandListener):
+    """Keeps a copy of every explainable command sent while ``enabled``."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.commands: List[Tuple[str, Dict[str, Any]]] = []
+
+    def started(self, event) -> None:
+        if self.enabled and event.command_name in EXPLAINABLE:
+            self.commands.append(
+                (event.database_name, copy.deepcopy(dict(event.command)))
+            )
+
+    def succeeded(self, event) -> None:
+        pass
+
+    def failed(self, event) -> None:
+        pass
+
+
+@dataclass
+class Call:
+    label: str
+    run: Callable[[], Awaitable[Any]]
+    scan: bool = False  # whole-collection read by design
+
+
+@dataclass
+class Result:
+    label: str
+    command: Dict[str, Any]
+    stages: Set[str]
+    examined: int
+    returned: int
+    problem: Optional[str] = None
+    allowed: bool = False
+
+
+# ---------------------------------------------------------------------------
+# Explain output
+# ---------------------------------------------------------------------------
+
+
+def plan_stages(explain: Dict[str, Any]) -> Set[str]:
+    """Every ``stage`` name in every winning plan of ``explain``."""
+    stages: Set[str] = set()
+
+    def walk(node: Any, in_plan: bool) -> None:
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if in_plan and key == "stage" and isinstance(value, str):
+                    stages.add(value)
+                walk(value, in_plan or key == "winningPlan")
+        elif isinstance(node, list):
+            for value in node:
+                walk(value, in_plan)
+
+    walk(explain, False)
+    return stages
+
+
+def execution_counts(explain: Dict[str, Any]) -> Tuple[int, int]:
+    """``(keys or docs examined, nReturned)`` of the first ``executionStats``."""
+
+    def find(node: Any) -> Optional[Dict[str, Any]]:
+        if isinstance(node, dict):
+            stats = node.get("executionStats")
+            if isinstance(stats, dict) and "totalDocsExamined" in stats:
+                return stats
+            for value in node.values():
+                found = find(value)
+                if found is not None:
+                    return found
+        elif isinstance(node, list):
+            for value in node:
+                found = find(value)
+                if found is not None:
+                    return found
+        return None
+
+    stats = find(explain) or {}
+    examined = max(stats.get("totalDocsExamined", 0), stats.get("totalKeysExamined", 0))
+    return examined, stats.get("nReturned", 0)
+
+
+def reduces(command: Dict[str, Any]) -> bool:
+    """Counts, distincts and grouping pipelines return fewer docs than they read."""
+    name = next(iter(command))
+    if name in ("count", "distinct"):
+        return True
+    return name == "aggregate" and any(
+        next(iter(stage)) in _GROUPING_STAGES for stage in command.get("pipeline", [])
+    )
+
+
+# ---------------------------------------------------------------------------
+# Index suggestions
+# ---------------------------------------------------------------------------
+
+
+def query_shape(command: Dict[str, Any]) -> Tuple[str, Dict[str, Any], Dict[str, int]]:
+    """``(collection, filter, sort)`` of a recorded command."""
+    name = next(iter(command))
+    collection = command[name]
+    if name == "find":
+        return collection, command.get("filter") or {}, command.get("sort") or {}
+    if name == "findAndModify":
+        return collection, command.get("query") or {}, command.get("sort") or {}
+    if name in ("count", "distinct"):
+        return collection, command.get("query") or {}, {}
+    if name == "update":
+        return collection, command["updates"][0]["q"], {}
+    if name == "delete":
+        return collection, command["deletes"][0]["q"], {}
+    # aggregate: only the leading $match / $sort can use an index
+    match: Dict[str, Any] = {}
+    sort: Dict[str, int] = {}
+    for stage in command.get("pipeline", []):
+        if "$match" in stage and not match and not sort:
+            match = stage["$match"]
+        elif "$sort" in stage and not sort:
+            sort = stage["$sort"]
+        else:
+            break
+    return collection, match, sort
+
+
+def _index_keys(query: Dict[str, Any], sort: Dict[str, int]) -> List[Tuple[str, int]]:
+    equality: List[str] = []
+    ranges: List[str] = []
+    for field, condition in query.items():
+        if field.startswith("$"):
+            continue  # $or / $and / $expr are handled by the caller or not indexable
+        if isinstance(condition, dict) and "$elemMatch" in condition:
+            for sub, value in condition["$elemMatch"].items():
+                target = (
+                    ranges
+                    if isinstance(value, dict) and _RANGE_OPERATORS & set(value)
+                    else equality
+                )
+                target.append(f"{field}.{sub}")
+        elif isinstance(condition, dict) and _RANGE_OPERATORS & set(condition):
+            ranges.append(field)
+        else:
+            equality.append(field)
+    keys = [(field, 1) for field in equality]
+    keys += [
+        (field, int(direction))
+        for field, direction in sort.items()
+        if field not in equality
+    ]
+    keys += [(field, 1) for field in ranges if field not in sort]
+    return keys
+
+
+def suggest_indexes(command: Dict[str, Any]) -> List[str]:
+    """``IndexSpec`` source lines that would serve ``command``'s filter and sort."""
+    collection, query, sort = query_shape(command)
+    branches = query.get("$or") or [{}]
+    suggestions = []
+    for branch in branches:
+        keys = _index_keys({**query, **branch}, sort)
+        if not keys or keys[0][0] == "_id":
+            continue
+        if len(keys) == 1 and keys[0][1] == 1:
+            spec = f'"{keys[0][0]}"'
+        else:
+            spec = (
+                "["
+                + ", ".join(f'("{field}", {direction})' for field, direction in keys)
+                + "]"
+            )
+        suggestions.append(f'IndexSpec("{collection}", {spec}),')
+    return suggestions
+
+
+# ---------------------------------------------------------------------------
+# Repository coverage
+# ---------------------------------------------------------------------------
+
+
+def repository_methods() -> Set[str]:
+    """``Class.method`` / ``module.function`` for every public repository coroutine."""
+    labels: Set[str] = set()
+    for package_name in REPOSITORY_PACKAGES:
+        package = importlib.import_module(package_name)
+        for info in pkgutil.iter_modules(package.__path__):
+            module = importlib.import_module(f"{package_name}.{info.name}")
+            for name, obj in vars(module).items():
+                if (
+                    name.startswith("_")
+                    or getattr(obj, "__module__", None) != module.__name__
+                ):
+                    continue
+                if inspect.isclass(obj) and name not in SKIPPED_CLASSES:
+                    labels |= {
+                        f"{name}.{attr}"
+                        for attr in vars(obj)
+                        if not attr.startswith("_")
+                        and inspect.iscoroutinefunction(getattr(obj, attr))
+                    }
+                elif inspect.iscoroutinefunction(obj):
+                    labels.add(f"{info.name}.{name}")
+    return labels
+
+
+# ---------------------------------------------------------------------------
+# Seed data and calls
+# ---------------------------------------------------------------------------
+
+
+async def seed(db, n: int) -> None:
+    now = datetime.now(timezone.utc)
+    project_statuses = list(ProjectStatus)
+    payment_statuses = list(PaymentStatus)
+    specializations = ["it", "business", "law"]
+
+    projects = []
+    for i in range(1, n + 1):
+        status = project_statuses[i % len(project_statuses)]
+        created_at = now - timedelta(hours=i)
+        project = {
+            "id": i,
+            "user_id": 1000 + i % 100,
+            "username": f"user{i}",
+            "user_full_name": f"User {i}",
+            "subject_name": f"Subject {i % 40}",
+            "tutor_name": f"Tutor {i % 25}",
+            "deadline": "2030-01-01",
+            "details": "-",
+            "attachments": [],
+            "status": status,
+            "price": 100 + i,
+            "delivery_date": "2030-01-01",
+            "created_at": created_at,
+        }
+        if status == ProjectStatus.PENDING:
+            project["attention_at"] = created_at + URGENT_AFTER
+            project["attention_reason"] = "pending_review"
+        projects.append(project)
+    await db.projects.insert_many(projects)
+
+    await db.payments.insert_many(
+        [
+            {
+                "id": i,
+                "project_id": i,
+                "user_id": 1000 + i % 100,
+                "file_id": f"file{i}",
+                "file_type": "photo",
+                "status": payment_statuses[i % len(payment_statuses)],
+                "created_at": now - timedelta(hours=i),
+            }
+            for i in range(1, n + 1)
+        ]
+    )
+
+    await db.tickets.insert_many(
+        [
+            {
+                "ticket_id": i,
+                "user_id": 1000 + i % 100,
+                "username": f"user{i}",
+                "user_full_name": f"User {i}",
+                "message_thread_id": i,
+                "status": TicketStatus.OPEN if i % 2 else TicketStatus.CLOSED,
+                "created_at": now - timedelta(hours=i),
+                "message_count": 1,
+                "last_message": {
+                    "sender": "user",
+                    "text": "hi",
+                    "seq": 0,
+                    "timestamp": now,
+                },
+            }
+            for i in range(1, n + 1)
+        ]
+    )
+    await db.ticket_messages.insert_many(
+        [
+            {
+                "ticket_id": i,
+                "bucket": 0,
+                "count": 1,
+                "messages": [
+                    {"sender": "user", "text": "hi", "seq": 0, "timestamp": now}
+                ],
+            }
+            for i in range(1, n + 1)
+        ]
+    )
+
+    await db.team_requests.insert_many(
+        [
+            TeamRequest(
+                id=i,
+                host_id=1000 + i % 100,
+                course_name=f"Course {i % 30}",
+                doctor_name=f"Doctor {i % 10}",
+                specialization=specializations[i % 3],
+                required_members=3,
+                current_members=[2000 + i % 50],
+                join_requests=[JoinRequest(seeker_id=3000 + i % 50)],
+                status=TeamRequestStatus.OPEN if i % 2 else TeamRequestStatus.CLOSED,
+                created_at=now - timedelta(hours=i),
+            ).model_dump()
+            for i in range(1, n + 1)
+        ]
+    )
+
+    await db.students.insert_many(
+        [
+            {
+                "user_id": 1000 + i,
+                "specialization": specializations[i % 3],
+                "created_at": now,
+            }
+            for i in range(n)
+        ]
+    )
+
+    await db.referral_users.insert_many(
+        [
+            {
+                "user_id": 1000 + i,
+                "balance": 50.0,
+                "last_withdrawal_date": None,
+                "created_at": now - timedelta(hours=i),
+                **({"referred_by": 1000 + i // 10} if i % 3 else {}),
+            }
+            for i in range(n)
+        ]
+    )
+    await db.withdrawal_requests.insert_many(
+        [
+            {
+                "request_id": f"wr-{i}",
+                "user_id": 1000 + i % 100,
+                "amount": 10.0,
+                "shamcash_address": "-",
+                "shamcash_name": "-",
+                "status": ("pending", "processed", "rejected")[i % 3],
+                "requested_at": now - timedelta(hours=i),
+            }
+            for i in range(n)
+        ]
+    )
+    await db.commission_logs.insert_many(
+        [
+            {
+                "log_id": f"cl-{i}",
+                "referrer_id": 1000 + i % 50,
+                "referred_user_id": 1000 + i,
+                "project_id": i,
+                "project_subject": "-",
+                "project_price": 100.0,
+                "commission_amount": 10.0,
+                "earned_at": now - timedelta(hours=i),
+            }
+            for i in range(n)
+        ]
+    )
+
+    await db.audit_logs.insert_many(
+        [
+            {
+                "id": f"a-{i}",
+                "user_id": 1000 + i % 100,
+                "role": "admin",
+                "event_type": AuditEventType.PROJECT_CREATED.value,
+                "entity_id": i % (n // 10 or 1),
+                "metadata": {},
+                "created_at": now - timedelta(minutes=i),
+            }
+            for i in range(n)
+        ]
+    )
+
+    await db.settings.insert_one({"_id": "global_config", "maintenance_mode": False})
+    await db.e2e_test_results.insert_one({"_id": "latest", "suites": {}})
+    await db.counters.insert_many(
+        [
+            {"_id": name, "seq": n}
+            for name in ("project_id", "payment_id", "ticket_id", "team_request_id")
+        ]
+    )
+
+
+def build_calls(db, n: int) -> List[Call]:
+    """One or more calls per repository method, reads before destructive writes."""
+    from dashboard_api.repositories import (
+        projects_repo,
+        referrals_repo,
+        stats_repo,
+        withdrawals_repo,
+    )
+
+    projects = ProjectRepository(db)
+    payments = PaymentRepository(db)
+    tickets = TicketRepository(db)
+    teams = TeamRequestRepository(db)
+    students = StudentRepository(db)
+    referrals = UserReferralRepository(db)
+    audit = AuditRepository(db)
+    since, until = "2000-01-01", "2100-01-01"
+    pending = [ProjectStatus.PENDING]
+    list_cursor = projects_repo.encode_project_cursor(
+        "created_at",
+        {"created_at": datetime.now(timezone.utc), "id": n // 2},
+    )
+
+    return [
+        # --- ProjectRepository ---
+        Call(
+            "ProjectRepository.add_project",
+            lambda: projects.add_project(
+                user_id=1001,
+                username="u",
+                user_full_name="U",
+                subject="s",
+                tutor="t",
+                deadline="2030-01-01",
+                details="-",
+                attachments=[],
+            ),
+        ),
+        Call(
+            "ProjectRepository.get_project_by_id", lambda: projects.get_project_by_id(7)
+        ),
+        Call(
+            "ProjectRepository.get_user_projects",
+            lambda: projects.get_user_projects(1007),
+        ),
+        Call(
+            "ProjectRepository.get_projects_by_status",
+            lambda: projects.get_projects_by_status(pending),
+        ),
+        Call(
+            "ProjectRepository.get_projects_by_status",
+            lambda: projects.get_projects_by_status(pending, 1007),
+        ),
+        Call(
+            "ProjectRepository.get_projects_page",
+            lambda: projects.get_projects_page(pending),
+        ),
+        Call(
+            "ProjectRepository.get_projects_page",
+            lambda: projects.get_projects_page(pending, after=str(n // 2)),
+        ),
+        Call(
+            "ProjectRepository.get_projects_page",
+            lambda: projects.get_projects_page(pending, 1007),
+        ),
+        Call(
+            "ProjectRepository.get_master_report",
+            lambda: projects.get_master_report(page=1),
+        ),
+        Call("ProjectRepository.get_all_user_ids", projects.get_all_user_ids),
+        Call("ProjectRepository.get_urgent_projects", projects.get_urgent_projects),
+        Call(
+            "ProjectRepository.update_offer",
+            lambda: projects.update_offer(8, "100", "2030-01-01"),
+        ),
+        Call(
+            "ProjectRepository.update_status",
+            lambda: projects.update_status(8, ProjectStatus.ACCEPTED),
+        ),
+        # --- PaymentRepository ---
+        Call(
+            "PaymentRepository.add_payment",
+            lambda: payments.add_payment(7, 1007, "file"),
+        ),
+        Call("PaymentRepository.get_payment", lambda: payments.get_payment(7)),
+        Call(
+            "PaymentRepository.get_payment_by_project_id",
+            lambda: payments.get_payment_by_project_id(7),
+        ),
+        Call(
+            "PaymentRepository.get_all", payments.get_all, scan=True
+        ),  # admin export, sorted on a computed field
+        Call("PaymentRepository.get_page", payments.get_page),
+        Call(
+            "PaymentRepository.get_page", lambda: payments.get_page(after=f"0.{n // 2}")
+        ),
+        Call(
+            "PaymentRepository.update_status",
+            lambda: payments.update_status(7, PaymentStatus.ACCEPTED),
+        ),
+        # --- TicketRepository ---
+        Call(
+            "TicketRepository.create_ticket",
+            lambda: tickets.create_ticket(user_id=1001, initial_text="hi"),
+        ),
+        Call("TicketRepository.get_ticket_by_id", lambda: tickets.get_ticket_by_id(7)),
+        Call(
+            "TicketRepository.get_ticket_by_thread",
+            lambda: tickets.get_ticket_by_thread(7),
+        ),
+        Call(
+            "TicketRepository.get_active_tickets",
+            lambda: tickets.get_active_tickets(1007),
+        ),
+        Call(
+            "TicketRepository.get_all_active_tickets",
+            lambda: tickets.get_all_active_tickets(page=1),
+        ),
+        Call(
+            "TicketRepository.get_closed_tickets",
+            lambda: tickets.get_closed_tickets(1008),
+        ),
+        Call(
+            "TicketRepository.get_recent_messages",
+            lambda: tickets.get_recent_messages(7),
+        ),
+        Call(
+            "TicketRepository.get_message_count", lambda: tickets.get_message_count(7)
+        ),
+        Call("TicketRepository.set_thread_id", lambda: tickets.set_thread_id(7, n + 7)),
+        Call(
+            "TicketRepository.add_message",
+            lambda: tickets.add_message(7, sender="admin", text="ok"),
+        ),
+        Call("TicketRepository.close_ticket", lambda: tickets.close_ticket(7)),
+        Call("TicketRepository.reopen_ticket", lambda: tickets.reopen_ticket(7)),
+        # --- TeamRequestRepository ---
+        Call(
+            "TeamRequestRepository.create_team_request",
+            lambda: teams.create_team_request(
+                host_id=1001,
+                host_name="h",
+                host_username="h",
+                course_name="Course 1",
+                doctor_name="Doctor 1",
+                specialization="it",
+                required_members=3,
+            ),
+        ),
+        Call("TeamRequestRepository.get_by_id", lambda: teams.get_by_id(7)),
+        Call(
+            "TeamRequestRepository.get_open_teams_for_specialization",
+            lambda: teams.get_open_teams_for_specialization("it", 1001),
+        ),
+        Call(
+            "TeamRequestRepository.get_user_open_requests",
+            lambda: teams.get_user_open_requests(1007),
+        ),
+        Call(
+            "TeamRequestRepository.get_user_completed_requests",
+            lambda: teams.get_user_completed_requests(1008),
+        ),
+        Call(
+            "TeamRequestRepository.get_user_pending_joins",
+            lambda: teams.get_user_pending_joins(3007),
+        ),
+        Call(
+            "TeamRequestRepository.has_join_request",
+            lambda: teams.has_join_request(7, 3007),
+        ),
+        Call(
+            "TeamRequestRepository.has_global_open_team_for_subject",
+            lambda: teams.has_global_open_team_for_subject("course 7", "doctor 7"),
+        ),
+        Call(
+            "TeamRequestRepository.has_active_involvement_for_course",
+            lambda: teams.has_active_involvement_for_course(1007, "course 7"),
+        ),
+        Call(
+            "TeamRequestRepository.add_join_request",
+            lambda: teams.add_join_request(7, 4000, "s"),
+        ),
+        Call(
+            "TeamRequestRepository.update_join_request_status",
+            lambda: teams.update_join_request_status(7, 4000, "rejected"),
+        ),
+        Call(
+            "TeamRequestRepository.atomic_accept_member",
+            lambda: teams.atomic_accept_member(7, 3007),
+        ),
+        Call("TeamRequestRepository.add_member", lambda: teams.add_member(7, 4001)),
+        Call(
+            "TeamRequestRepository.remove_join_request",
+            lambda: teams.remove_join_request(7, 4000),
+        ),
+        Call(
+            "TeamRequestRepository.reject_all_pending_joins",
+            lambda: teams.reject_all_pending_joins(9),
+        ),
+        Call("TeamRequestRepository.close_request", lambda: teams.close_request(9)),
+        Call("TeamRequestRepository.delete_request", lambda: teams.delete_request(9)),
+        # --- StudentRepository ---
+        Call("StudentRepository.get_profile", lambda: students.get_profile(1007)),
+        Call(
+            "StudentRepository.create_profile",
+            lambda: students.create_profile(1007, "it"),
+        ),
+        # --- UserReferralRepository ---
+        Call(
+            "UserReferralRepository.get_or_create_user",
+            lambda: referrals.get_or_create_user(1007),
+        ),
+        Call("UserReferralRepository.get_user", lambda: referrals.get_user(1007)),
+        Call(
+            "UserReferralRepository.add_balance",
+            lambda: referrals.add_balance(1007, 5.0),
+        ),
+        Call(
+            "UserReferralRepository.deduct_balance",
+            lambda: referrals.deduct_balance(1007, 5.0),
+        ),
+        Call(
+            "UserReferralRepository.restore_balance",
+            lambda: referrals.restore_balance(1007, 5.0),
+        ),
+        Call(
+            "UserReferralRepository.record_withdrawal_date",
+            lambda: referrals.record_withdrawal_date(1007),
+        ),
+        Call(
+            "UserReferralRepository.get_referrals",
+            lambda: referrals.get_referrals(1007),
+        ),
+        Call(
+            "UserReferralRepository.save_withdrawal_request",
+            lambda: referrals.save_withdrawal_request(
+                WithdrawalRequest(
+                    user_id=1007, amount=5.0, shamcash_address="-", shamcash_name="-"
+                )
+            ),
+        ),
+        Call(
+            "UserReferralRepository.save_commission_log",
+            lambda: referrals.save_commission_log(
+                CommissionLog(
+                    referrer_id=1000,
+                    referred_user_id=1007,
+                    project_id=7,
+                    project_subject="-",
+                    project_price=100.0,
+                    commission_amount=10.0,
+                )
+            ),
+        ),
+        Call(
+            "UserReferralRepository.get_all_withdrawal_requests",
+            lambda: referrals.get_all_withdrawal_requests("pending"),
+        ),
+        Call(
+            "UserReferralRepository.mark_withdrawal_paid",
+            lambda: referrals.mark_withdrawal_paid("wr-3", "bench"),
+        ),
+        Call(
+            "UserReferralRepository.reject_withdrawal",
+            lambda: referrals.reject_withdrawal("wr-6", "bench"),
+        ),
+        Call(
+            "UserReferralRepository.get_commission_logs_for_referrer",
+            lambda: referrals.get_commission_logs_for_referrer(1007),
+        ),
+        # --- AuditRepository / SettingsRepository / StatsRepository / E2ETestRepo ---
+        Call(
+            "AuditRepository.log_event",
+            lambda: audit.log_event(
+                user_id=1001,
+                role="admin",
+                event_type=AuditEventType.PROJECT_CREATED,
+                entity_id=7,
+            ),
+        ),
+        Call(
+            "AuditRepository.get_logs_for_entity", lambda: audit.get_logs_for_entity(7)
+        ),
+        Call(
+            "SettingsRepository.get_maintenance_mode",
+            SettingsRepository(db).get_maintenance_mode,
+        ),
+        Call(
+            "SettingsRepository.set_maintenance_mode",
+            lambda: SettingsRepository(db).set_maintenance_mode(False),
+        ),
+        Call(
+            "StatsRepository.get_stats", StatsRepository(db).get_stats, scan=True
+        ),  # whole-collection counts
+        Call("E2ETestRepo.get_last_test_run", E2ETestRepo.get_last_test_run),
+        Call("E2ETestRepo.save_test_run", lambda: E2ETestRepo.save_test_run({})),
+        # --- dashboard_api/repositories ---
+        # First-visit pages count every match in the same $facet by design.
+        Call(
+            "projects_repo.find_projects_page",
+            lambda: projects_repo.find_projects_page(20),
+            scan=True,
+        ),
+        Call(
+            "projects_repo.find_projects_page",
+            lambda: projects_repo.find_projects_page(20, status_filter="pending"),
+            scan=True,
+        ),
+        Call(
+            "projects_repo.find_projects_page",
+            lambda: projects_repo.find_projects_page(
+                20, start_date=since, end_date=until
+            ),
+            scan=True,
+        ),
+        Call(
+            "projects_repo.find_projects_page",
+            lambda: projects_repo.find_projects_page(
+                20, after=list_cursor, with_total=False
+            ),
+        ),
+        Call(
+            "projects_repo.find_projects_page",
+            lambda: projects_repo.find_projects_page(
+                20,
+                status_filter="pending",
+                before=list_cursor,
+                with_total=False,
+            ),
+        ),
+        Call(
+            "stats_repo.aggregate_project_volume",
+            lambda: stats_repo.aggregate_project_volume(since, until),
+        ),
+        Call(
+            "stats_repo.aggregate_conversion_rates",
+            lambda: stats_repo.aggregate_conversion_rates(since, until),
+        ),
+        Call(
+            "stats_repo.aggregate_revenue_over_time",
+            lambda: stats_repo.aggregate_revenue_over_time(since, until),
+        ),
+        Call("stats_repo.aggregate_top_referrers", stats_repo.aggregate_top_referrers),
+        Call("stats_repo.aggregate_total_revenue", stats_repo.aggregate_total_revenue),
+        Call(
+            "referrals_repo.get_all_referral_users",
+            referrals_repo.get_all_referral_users,
+            scan=True,
+        ),
+        Call(
+            "referrals_repo.get_referral_tree",
+            referrals_repo.get_referral_tree,
+            scan=True,
+        ),
+        Call(
+            "referrals_repo.get_referral_summary",
+            referrals_repo.get_referral_summary,
+            scan=True,
+        ),
+        Call(
+            "withdrawals_repo.get_all_requests",
+            lambda: withdrawals_repo.get_all_requests("pending"),
+        ),
+        Call(
+            "withdrawals_repo.get_withdrawal_stats",
+            withdrawals_repo.get_withdrawal_stats,
+        ),
+        Call(
+            "withdrawals_repo.mark_request_paid",
+            lambda: withdrawals_repo.mark_request_paid("wr-9", "bench"),
+        ),
+        Call(
+            "withdrawals_repo.reject_request",
+            lambda: withdrawals_repo.reject_request("wr-12", "bench"),
+        ),
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+
+async def explain_call(
+    client, recorder: CommandRecorder, call: Call, max_ratio: float
+) -> List[Result]:
+    recorder.commands.clear()
+    recorder.enabled = True
+    try:
+        await call.run()
+    except Exception as e:
+        print(f"  !! {call.label} raised {e!r}")
+    finally:
+        recorder.enabled = False
+
+    results = []
+    for database, command in list(recorder.commands):
+        command = {k: v for k, v in command.items() if k not in _DRIVER_FIELDS}
+        explain = await client[database].command(
+            {"explain": command, "verbosity": "executionStats"}
+        )
+        stages = plan_stages(explain)
+        examined, returned = execution_counts(explain)
+        result = Result(
+            call.label, command, stages, examined, returned, allowed=call.scan
+        )
+        if "COLLSCAN" in stages:
+            result.problem = "COLLSCAN"
+        elif not reduces(command) and examined > max_ratio * max(returned, 1):
+            result.problem = f"examined {examined} for {returned}"
+        results.append(result)
+    return results
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--docs", type=int, default=1000, help="documents seeded per collection"
+    )
+    parser.add_argument("--max-ratio", type=float, default=10.0)
+    args = parser.parse_args()
+
+    recorder = CommandRecorder()
+    client = AsyncIOMotorClient(settings.MONGO_URI, event_listeners=[recorder])
+    db = client[f"{settings.DB_NAME}_explain"]
+    Database.client, Database.db, Database.analytics_db = client, db, db
+    Database._id_blocks.clear()
+
+    calls = build_calls(db, args.docs)
+    uncovered = sorted(repository_methods() - {call.label for call in calls})
+    results: List[Result] = []
+    try:
+        await client.drop_database(db.name)
+        await ensure_schema(db)
+        await seed(db, args.docs)
+        for call in calls:
+            results += await explain_call(client, recorder, call, args.max_ratio)
+    finally:
+        await client.drop_database(db.name)
+        client.close()
+
+    print(
+        f"{len(calls)} calls, {len(results)} queries, "
+        f"{args.docs} documents per collection\n"
+    )
+    for result in results:
+        verdict = (
+            "ok" if result.problem is None else ("scan" if result.allowed else "FAIL")
+        )
+        op = next(iter(result.command))
+        print(
+            f"  {verdict:<5} {result.label:<58} {op:<14} "
+            f"{result.examined:>6}/{result.returned:<6} "
+            f"{','.join(sorted(result.stages))}"
+        )
+
+    failures = [r for r in results if r.problem and not r.allowed]
+    suggestions = sorted(
+        {line for r in failures for line in suggest_indexes(r.command)}
+    )
+    if failures:
+        print(f"\n{len(failures)} queries need an index:")
+        for result in failures:
+            print(f"  {result.label}: {result.problem}")
+    if suggestions:
+        print("\nSuggested INDEXES entries:")
+        for line in suggestions:
+            print(f"    {line}")
+    if uncovered:
+        print("\nRepository methods missing from build_calls():")
+        for label in uncovered:
+            print(f"  {label}")
+    sys.exit(1 if failures or uncovered else 0)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -13,6 +13,7 @@ import structlog
 from aiogram import Bot
 from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError
 
+from infrastructure.projections import CARD
 from infrastructure.repositories.ticket import TicketRepository
 from infrastructure.repositories.audit import AuditRepository
 from application.audit_service import AuditService
@@ -96,7 +97,7 @@ class TicketService:
         file_type: Optional[str] = None,
     ) -> bool:
         """Save the user's reply and forward it to the admin topic."""
-        ticket = await self._repo.get_ticket_by_id(ticket_id)
+        ticket = await self._repo.get_ticket_by_id(ticket_id, profile=CARD)
         if not ticket:
             return False
 
@@ -169,7 +170,7 @@ class TicketService:
     # ------------------------------------------------------------------
     async def close_ticket(self, ticket_id: int) -> bool:
         """Close a ticket and optionally close the Forum Topic."""
-        ticket = await self._repo.get_ticket_by_id(ticket_id)
+        ticket = await self._repo.get_ticket_by_id(ticket_id, profile=CARD)
         if not ticket:
             return False
 
@@ -228,9 +229,10 @@ class TicketService:
         *,
         page: int = 0,
         page_size: int = 10,
+        total: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         return await self._repo.get_recent_messages(
-            ticket_id, page=page, page_size=page_size
+            ticket_id, page=page, page_size=page_size, total=total
         )
 
     async def get_message_count(self, ticket_id: int) -> int:
@@ -244,7 +246,7 @@ class TicketService:
     # ------------------------------------------------------------------
     async def reopen_ticket(self, ticket_id: int) -> bool:
         """Reopen a closed ticket and optionally reopen the Forum Topic."""
-        ticket = await self._repo.get_ticket_by_id(ticket_id)
+        ticket = await self._repo.get_ticket_by_id(ticket_id, profile=CARD)
         if not ticket:
             return False
 
@@ -15,11 +15,11 @@ from domain.enums import ProjectStatus
 @pytest.mark.asyncio
 async def test_get_categorized_projects_service():
     mock_repo = AsyncMock()
-    mock_repo.get_all_categorized.return_value = {"pending": []}
+    mock_repo.get_master_report.return_value = "page"
     service = GetCategorizedProjectsService(mock_repo)
-    result = await service.execute()
-    assert result == {"pending": []}
-    mock_repo.get_all_categorized.assert_called_once()
+    result = await service.execute(page=2)
+    assert result == "page"
+    mock_repo.get_master_report.assert_called_once_with(page=2)
 
 @pytest.mark.asyncio
 async def test_get_pending_projects_service():
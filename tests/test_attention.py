@@ -0,0 +1,40 @@
+from datetime import datetime, timezone
+
+from domain.enums import ProjectStatus
+from infrastructure.attention import URGENT_AFTER, attention_stages
+
+NOW = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+
+def _reason(stages):
+    return stages[-1]["$set"]["attention_reason"]["$cond"][1]
+
+
+def test_pending_is_dated_from_creation():
+    stages = attention_stages(ProjectStatus.PENDING, NOW)
+    assert stages[0]["$set"]["attention_at"]["$add"][0] == "$created_at"
+    assert _reason(stages) == "pending_review"
+
+
+def test_awaiting_verification_is_dated_from_now():
+    stages = attention_stages(ProjectStatus.AWAITING_VERIFICATION, NOW)
+    assert stages[0]["$set"]["attention_at"] == NOW + URGENT_AFTER
+    assert _reason(stages) == "payment_unverified"
+
+
+def test_accepted_and_offered_track_delivery_date():
+    for status in (ProjectStatus.ACCEPTED, ProjectStatus.OFFERED):
+        stages = attention_stages(status, NOW)
+        assert "$subtract" in stages[0]["$set"]["attention_at"]
+        assert _reason(stages) == "delivery_due"
+
+
+def test_closed_statuses_clear_the_fields():
+    for status in (
+        ProjectStatus.FINISHED,
+        ProjectStatus.DENIED_ADMIN,
+        ProjectStatus.REJECTED_PAYMENT,
+    ):
+        assert attention_stages(status, NOW) == [
+            {"$unset": ["attention_at", "attention_reason"]}
+        ]
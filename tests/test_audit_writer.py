@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from pymongo.errors import BulkWriteError
+
+from domain.enums import AuditEventType
+from infrastructure.audit_writer import AuditWriter
+from infrastructure.repositories.audit import AuditRepository
+
+
+def _db():
+    db = MagicMock()
+    db.audit_logs.insert_many = AsyncMock()
+    db.audit_logs.insert_one = AsyncMock()
+    return db
+
+
+def _written(db):
+    return [
+        doc
+        for call in db.audit_logs.insert_many.await_args_list
+        for doc in call.args[0]
+    ]
+
+
+@pytest.mark.asyncio
+async def test_flushes_on_batch_size():
+    db = _db()
+    writer = AuditWriter(batch_size=3, flush_interval=60)
+    writer.start(db)
+    for i in range(3):
+        writer.enqueue({"n": i})
+    await asyncio.sleep(0.01)
+
+    assert _written(db) == [{"n": 0}, {"n": 1}, {"n": 2}]
+    assert db.audit_logs.insert_many.await_args.kwargs == {"ordered": False}
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_flushes_on_interval():
+    db = _db()
+    writer = AuditWriter(batch_size=100, flush_interval=0.02)
+    writer.start(db)
+    writer.enqueue({"n": 1})
+    await asyncio.sleep(0.06)
+
+    assert _written(db) == [{"n": 1}]
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_buffer_in_batches():
+    db = _db()
+    writer = AuditWriter(batch_size=2, flush_interval=60)
+    writer.start(db)
+    writer._buffer.extend({"n": i} for i in range(5))
+
+    await writer.stop()
+
+    assert not writer.running
+    calls = db.audit_logs.insert_many.await_args_list
+    assert [len(call.args[0]) for call in calls] == [2, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_drops():
+    writer = AuditWriter(batch_size=10, buffer_size=2)
+    assert writer.enqueue({}) and writer.enqueue({})
+    assert writer.enqueue({}) is False
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_retried():
+    db = _db()
+    db.audit_logs.insert_many.side_effect = [ConnectionError("down"), None]
+    writer = AuditWriter(batch_size=10)
+    writer._db = db
+    writer._buffer.append({"n": 1})
+
+    await writer.flush()
+    assert writer._buffer == [{"n": 1}]
+    await writer.flush()
+    assert writer._buffer == []
+    assert db.audit_logs.insert_many.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_rejected_documents_are_not_retried():
+    db = _db()
+    db.audit_logs.insert_many.side_effect = BulkWriteError(
+        {"nInserted": 1, "writeErrors": [{}]}
+    )
+    writer = AuditWriter(batch_size=10)
+    writer._db = db
+    writer._buffer.extend([{"n": 1}, {"n": 2}])
+
+    await writer.flush()
+    assert writer._buffer == []
+
+
+@pytest.mark.asyncio
+async def test_repository_enqueues_when_writer_running():
+    db = _db()
+    writer = AuditWriter(batch_size=100, flush_interval=60)
+    writer.start(db)
+    repo = AuditRepository(db, writer=writer)
+
+    await repo.log_event(
+        user_id=1, role="student", event_type=AuditEventType.TICKET_OPENED, entity_id=10
+    )
+    db.audit_logs.insert_one.assert_not_called()
+    assert writer._buffer[0]["entity_id"] == 10
+
+    await writer.stop()
+    assert _written(db)[0]["entity_id"] == 10
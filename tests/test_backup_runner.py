@@ -6,33 +6,34 @@ import tempfile
 import os
 
 @pytest.mark.asyncio
-@patch("backup.runner.aiohttp.ClientSession.post")
-async def test_notify_admins(mock_post):
-    mock_post.return_value.__aenter__.return_value.status = 200
+@patch("backup.runner.telegram_http.call", new_callable=AsyncMock)
+async def test_notify_admins(mock_call):
+    mock_call.return_value = {"ok": True}
     
     # Text only
-    await _notify_admins("token", [1], "test")
-    mock_post.assert_called_once()
-    
+    await _notify_admins([1, 2], "test")
+    assert mock_call.await_count == 2
+    assert mock_call.await_args.args == (
+        "sendMessage",
+        {"chat_id": 2, "parse_mode": "HTML", "text": "test"},
+    )
+
     # With document
-    with tempfile.NamedTemporaryFile(delete=False) as f:
-        f.write(b"data")
-        f_path = Path(f.name)
-    
-    try:
-        mock_post.reset_mock()
-        await _notify_admins("token", [1], "test", f_path)
-        mock_post.assert_called_once()
-    finally:
-        os.unlink(f_path)
+    f_path = Path("archive.tar.gz")
+    mock_call.reset_mock()
+    await _notify_admins([1], "test", f_path)
+    mock_call.assert_awaited_once_with(
+        "sendDocument",
+        {"chat_id": 1, "parse_mode": "HTML", "caption": "test"},
+        files={"document": f_path},
+    )
     
     # Test failures
-    mock_post.return_value.__aenter__.return_value.status = 400
-    mock_post.return_value.__aenter__.return_value.text = AsyncMock(return_value="err")
-    await _notify_admins("token", [1], "test")
+    mock_call.return_value = {"ok": False, "error_code": 400, "description": "err"}
+    await _notify_admins([1], "test")
     
-    mock_post.side_effect = Exception("err")
-    await _notify_admins("token", [1], "test")
+    mock_call.side_effect = Exception("err")
+    await _notify_admins([1], "test")
 
 def test_human_size():
     with tempfile.NamedTemporaryFile(delete=False) as f:
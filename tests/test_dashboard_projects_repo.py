@@ -1,6 +1,12 @@
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
-from dashboard_api.repositories.projects_repo import count_projects, get_paginated_projects
+from dashboard_api.repositories.projects_repo import (
+    _keyset_match,
+    decode_project_cursor,
+    encode_project_cursor,
+    find_projects_page,
+    iter_projects,
+)
 
 @pytest.fixture
 def mock_db():
@@ -15,23 +21,133 @@ def mock_db():
     db.projects.find.return_value = cursor
     return db
 
+
+def test_project_cursor_round_trip():
+    from datetime import datetime
+    created = datetime(2030, 1, 2, 3, 4, 5)
+    cursor = encode_project_cursor("created_at", {"created_at": created, "id": 42})
+    assert decode_project_cursor(cursor) == (created, 42)
+    assert decode_project_cursor(encode_project_cursor("price", {"id": 3})) == (None, 3)
+    assert decode_project_cursor("not-a-cursor") is None
+    assert decode_project_cursor(None) is None
+
+
+def test_keyset_match_handles_missing_values():
+    assert _keyset_match("id", "$lt", (None, 5)) == {"id": {"$lt": 5}}
+    assert _keyset_match("price", "$gt", (100, 5)) == {
+        "$or": [{"price": {"$gt": 100}}, {"price": 100, "id": {"$gt": 5}}],
+    }
+    # Descending walks reach the null / missing prices last.
+    assert _keyset_match("price", "$lt", (100, 5))["$or"][-1] == {"price": None}
+    assert _keyset_match("price", "$gt", (None, 5)) == {
+        "$or": [{"price": None, "id": {"$gt": 5}}, {"price": {"$ne": None}}],
+    }
+
+
 @pytest.mark.asyncio
 @patch("dashboard_api.repositories.projects_repo.get_db")
-async def test_count_projects(mock_get_db, mock_db):
+async def test_find_projects_page_facet_returns_page_and_total(mock_get_db, mock_db):
     mock_get_db.return_value = mock_db
-    assert await count_projects("s", 1) == 10
-    mock_db.projects.count_documents.assert_called_with({"status": "s", "user_id": 1})
-    
-    await count_projects()
-    mock_db.projects.count_documents.assert_called_with({})
+    docs = [{"id": i, "created_at": i} for i in (9, 8, 7)]
+    facet = {"items": docs, "total": [{"n": 30}]}
+    mock_db.projects.aggregate.return_value.to_list = AsyncMock(return_value=[facet])
+
+    page = await find_projects_page(2, "pending", page=3)
+
+    pipeline = mock_db.projects.aggregate.call_args.args[0]
+    assert pipeline[0] == {"$match": {"status": "pending"}}
+    assert pipeline[1] == {"$sort": {"created_at": -1, "id": -1}}
+    assert pipeline[2]["$facet"]["items"][:2] == [{"$skip": 4}, {"$limit": 3}]
+    assert page.total == 30
+    assert [d["id"] for d in page.items] == [9, 8]
+    assert decode_project_cursor(page.next_cursor) == (8, 8)
+    assert decode_project_cursor(page.prev_cursor) == (9, 9)
+    mock_db.projects.count_documents.assert_not_called()
+
 
 @pytest.mark.asyncio
 @patch("dashboard_api.repositories.projects_repo.get_db")
-async def test_get_paginated_projects(mock_get_db, mock_db):
+async def test_find_projects_page_keyset_without_total(mock_get_db, mock_db):
     mock_get_db.return_value = mock_db
-    res = await get_paginated_projects(0, 5, "s", 1)
-    assert res == [{"id": 1}]
-    mock_db.projects.find.assert_called_with({"status": "s", "user_id": 1})
-    
-    await get_paginated_projects(0, 5)
-    mock_db.projects.find.assert_called_with({})
+    docs = [{"id": 4}, {"id": 3}]
+    mock_db.projects.find.return_value.to_list = AsyncMock(return_value=docs)
+    after = encode_project_cursor("id", {"id": 5})
+
+    page = await find_projects_page(2, sort_by="id", after=after, with_total=False)
+
+    match = mock_db.projects.find.call_args.args[0]
+    assert match == {"$and": [{}, {"id": {"$lt": 5}}]}
+    mock_db.projects.find.return_value.skip.assert_called_with(0)
+    assert [d["id"] for d in page.items] == [4, 3]
+    assert page.next_cursor is None
+    assert decode_project_cursor(page.prev_cursor) == (4, 4)
+    mock_db.projects.count_documents.assert_not_called()
+    mock_db.projects.aggregate.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch("dashboard_api.repositories.projects_repo.get_db")
+async def test_find_projects_page_before_restores_order(mock_get_db, mock_db):
+    mock_get_db.return_value = mock_db
+    docs = [{"id": 6}, {"id": 7}, {"id": 8}]
+    mock_db.projects.find.return_value.to_list = AsyncMock(return_value=docs)
+    before = encode_project_cursor("id", {"id": 5})
+
+    page = await find_projects_page(2, sort_by="id", before=before)
+
+    assert mock_db.projects.find.call_args.args[0]["$and"][1] == {"id": {"$gt": 5}}
+    mock_db.projects.find.return_value.sort.assert_called_with([("id", 1)])
+    assert [d["id"] for d in page.items] == [7, 6]
+    assert page.total == 10
+    assert page.prev_cursor is not None and page.next_cursor is not None
+
+
+@pytest.mark.asyncio
+@patch("dashboard_api.repositories.projects_repo.get_db")
+async def test_find_projects_page_stale_cursor_restarts(mock_get_db, mock_db):
+    mock_get_db.return_value = mock_db
+    batches = [[], [{"id": 9}]]
+    mock_db.projects.find.return_value.to_list = AsyncMock(side_effect=batches)
+    after = encode_project_cursor("id", {"id": 1})
+
+    page = await find_projects_page(2, sort_by="id", after=after, with_total=False)
+
+    assert [d["id"] for d in page.items] == [9]
+    assert page.restarted is True
+    assert mock_db.projects.find.call_args.args[0] == {}
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self._docs = list(docs)
+
+    def sort(self, *args):
+        return self
+
+    def batch_size(self, n):
+        self.batch = n
+        return self
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self._docs:
+            raise StopAsyncIteration
+        return self._docs.pop(0)
+
+
+@pytest.mark.asyncio
+@patch("dashboard_api.repositories.projects_repo.get_db")
+async def test_iter_projects_projects_and_batches(mock_get_db, mock_db):
+    mock_get_db.return_value = mock_db
+    cursor = _Cursor([{"id": 1}, {"id": 2}])
+    mock_db.projects.find.return_value = cursor
+
+    docs = [d async for d in iter_projects(["id", "price"], "pending", batch_size=100)]
+
+    assert docs == [{"id": 1}, {"id": 2}]
+    mock_db.projects.find.assert_called_with(
+        {"status": "pending"}, {"_id": 0, "id": 1, "price": 1}
+    )
+    assert cursor.batch == 100
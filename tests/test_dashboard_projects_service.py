@@ -1,33 +1,99 @@
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
-from dashboard_api.services.projects_service import _safe_price, _to_project_response, get_projects_page, get_project_details, get_urgent_projects_list
+from dashboard_api.services.projects_service import (
+    _to_project_response,
+    invalidate_project_totals,
+    stream_projects_export,
+    get_projects_page,
+    get_project_details,
+    get_urgent_projects_list,
+)
 from fastapi import HTTPException
-
-def test_safe_price():
-    assert _safe_price(None) is None
-    assert _safe_price("150") == 150
-    assert _safe_price(150.5) == 150
-    assert _safe_price("invalid") is None
+from domain.pagination import Page
 
 def test_to_project_response():
-    res = _to_project_response({"_id": "abc", "id": 1, "price": "100", "subject_name": "S", "user_id": 1, "status": "pending", "tutor_name": "T", "deadline": "2026", "created_at": "2026"})
+    res = _to_project_response(
+        {
+            "_id": "abc",
+            "id": 1,
+            "price": 100,
+            "currency": "SYP",
+            "subject_name": "S",
+            "user_id": 1,
+            "status": "pending",
+            "tutor_name": "T",
+            "deadline": "2026",
+            "created_at": "2026",
+        }
+    )
     assert res is not None
     assert res.id == 1
     assert res.price == 100
+    assert res.currency == "SYP"
     
     assert _to_project_response({"missing": "fields"}) is None
 
+
+@pytest.fixture(autouse=True)
+def _clear_totals():
+    invalidate_project_totals()
+    yield
+    invalidate_project_totals()
+
 @pytest.mark.asyncio
-@patch("dashboard_api.services.projects_service.count_projects")
-@patch("dashboard_api.services.projects_service.get_paginated_projects")
-async def test_get_projects_page(mock_get, mock_count):
-    mock_count.return_value = 10
-    mock_get.return_value = [{"id": 1, "subject_name": "S", "user_id": 1, "status": "pending", "tutor_name": "T", "deadline": "2026", "created_at": "2026"}]
+@patch("dashboard_api.services.projects_service.find_projects_page")
+async def test_get_projects_page(mock_find):
+    mock_find.return_value = Page(
+        items=[
+            {
+                "id": 1,
+                "subject_name": "S",
+                "user_id": 1,
+                "status": "pending",
+                "tutor_name": "T",
+                "deadline": "2026",
+                "created_at": "2026",
+            }
+        ],
+        total=10,
+        next_cursor="n",
+    )
     
     res = await get_projects_page(1, 5)
     assert res.total == 10
     assert res.pages == 2
     assert len(res.items) == 1
+    assert res.next_cursor == "n"
+    assert mock_find.call_args.kwargs["with_total"] is True
+
+
+@pytest.mark.asyncio
+@patch("dashboard_api.services.projects_service.find_projects_page")
+async def test_get_projects_page_restarted_reports_first_page(mock_find):
+    mock_find.return_value = Page(total=10, restarted=True)
+    res = await get_projects_page(4, 5, after="stale")
+    assert res.page == 1
+
+
+@pytest.mark.asyncio
+@patch("dashboard_api.services.projects_service.find_projects_page")
+async def test_get_projects_page_reuses_cached_total(mock_find):
+    mock_find.return_value = Page(total=42)
+    await get_projects_page(1, 20, "pending")
+
+    mock_find.return_value = Page()
+    res = await get_projects_page(2, 20, "pending", sort_by="price", after="c")
+    assert mock_find.call_args.kwargs["with_total"] is False
+    assert mock_find.call_args.kwargs["after"] == "c"
+    assert res.total == 42
+
+    # A different filter has its own total.
+    await get_projects_page(1, 20, "offered")
+    assert mock_find.call_args.kwargs["with_total"] is True
+
+    invalidate_project_totals()
+    await get_projects_page(1, 20, "pending")
+    assert mock_find.call_args.kwargs["with_total"] is True
 
 @pytest.mark.asyncio
 async def test_get_project_details():
@@ -59,3 +125,46 @@ async def test_get_urgent_projects_list():
     mock_repo.get_urgent_projects.return_value = [{"id": 1, "subject_name": "S", "user_id": 1, "status": "pending", "tutor_name": "T", "deadline": "2026", "created_at": "2026"}]
     res = await get_urgent_projects_list(mock_repo)
     assert len(res) == 1
+
+
+async def _rows(*docs):
+    for doc in docs:
+        yield doc
+
+
+@pytest.mark.asyncio
+@patch("dashboard_api.services.projects_service.iter_projects")
+async def test_stream_projects_export_csv(mock_iter):
+    from datetime import datetime
+    mock_iter.return_value = _rows(
+        {
+            "id": 1,
+            "subject_name": "Data, Structures",
+            "created_at": datetime(2030, 1, 2, 3, 4),
+        },
+        {"id": 2, "price": 500},
+    )
+    fields = ["id", "subject_name", "price", "created_at"]
+    chunks = [c async for c in stream_projects_export("csv", fields, "pending")]
+
+    assert "".join(chunks).splitlines() == [
+        "id,subject_name,price,created_at",
+        '1,"Data, Structures",,2030-01-02T03:04:00',
+        "2,,500,",
+    ]
+    assert mock_iter.call_args.args[:3] == (fields, "pending", None)
+
+
+@pytest.mark.asyncio
+@patch("dashboard_api.services.projects_service._EXPORT_CHUNK_CHARS", 10)
+@patch("dashboard_api.services.projects_service.iter_projects")
+async def test_stream_projects_export_ndjson_chunks(mock_iter):
+    import json
+    mock_iter.return_value = _rows({"id": 1, "subject_name": "مقرر"}, {"id": 2})
+    chunks = [c async for c in stream_projects_export("ndjson", ["id", "subject_name"])]
+
+    assert len(chunks) == 2
+    assert [json.loads(line) for line in "".join(chunks).splitlines()] == [
+        {"id": 1, "subject_name": "مقرر"},
+        {"id": 2, "subject_name": None},
+    ]
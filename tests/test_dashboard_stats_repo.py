@@ -7,41 +7,54 @@ def mock_db():
     db = MagicMock()
     cursor = MagicMock()
     cursor.to_list = AsyncMock(return_value=[{"total": 100}])
-    db.projects.aggregate.return_value = cursor
+    db.project_daily_stats.aggregate.return_value = cursor
     return db
 
 @pytest.mark.asyncio
-@patch("dashboard_api.repositories.stats_repo.get_db")
-async def test_aggregate_project_volume(mock_get_db, mock_db):
-    mock_get_db.return_value = mock_db
+@patch("dashboard_api.repositories.stats_repo.get_analytics_db")
+async def test_aggregate_project_volume(mock_get_analytics_db, mock_db):
+    mock_get_analytics_db.return_value = mock_db
     res = await aggregate_project_volume()
     assert res == [{"total": 100}]
-    mock_db.projects.aggregate.assert_called_once()
+    mock_db.project_daily_stats.aggregate.assert_called_once()
 
 @pytest.mark.asyncio
-@patch("dashboard_api.repositories.stats_repo.get_db")
-async def test_aggregate_conversion_rates(mock_get_db, mock_db):
-    mock_get_db.return_value = mock_db
+@patch("dashboard_api.repositories.stats_repo.get_analytics_db")
+async def test_aggregate_conversion_rates(mock_get_analytics_db, mock_db):
+    mock_get_analytics_db.return_value = mock_db
     res = await aggregate_conversion_rates()
     assert res == [{"total": 100}]
-    mock_db.projects.aggregate.assert_called_once()
+    mock_db.project_daily_stats.aggregate.assert_called_once()
 
 @pytest.mark.asyncio
-@patch("dashboard_api.repositories.stats_repo.get_db")
-async def test_aggregate_revenue_over_time(mock_get_db, mock_db):
-    mock_get_db.return_value = mock_db
+@patch("dashboard_api.repositories.stats_repo.get_analytics_db")
+async def test_aggregate_revenue_over_time(mock_get_analytics_db, mock_db):
+    mock_get_analytics_db.return_value = mock_db
     res = await aggregate_revenue_over_time()
     assert res == [{"total": 100}]
-    mock_db.projects.aggregate.assert_called_once()
+    mock_db.project_daily_stats.aggregate.assert_called_once()
 
 @pytest.mark.asyncio
-@patch("dashboard_api.repositories.stats_repo.get_db")
-async def test_aggregate_total_revenue(mock_get_db, mock_db):
-    mock_get_db.return_value = mock_db
+@patch("dashboard_api.repositories.stats_repo.get_analytics_db")
+async def test_aggregate_total_revenue(mock_get_analytics_db, mock_db):
+    mock_get_analytics_db.return_value = mock_db
     res = await aggregate_total_revenue()
     assert res == 100
     
     # Test empty result
-    mock_db.projects.aggregate.return_value.to_list.return_value = []
+    mock_db.project_daily_stats.aggregate.return_value.to_list.return_value = []
     res = await aggregate_total_revenue()
     assert res == 0.0
+
+
+@pytest.mark.asyncio
+@patch("dashboard_api.repositories.stats_repo.get_analytics_db")
+async def test_rollup_series_filters_by_day(mock_get_analytics_db, mock_db):
+    mock_get_analytics_db.return_value = mock_db
+    await aggregate_revenue_over_time("2030-01-01", "2030-01-31")
+    pipeline = mock_db.project_daily_stats.aggregate.call_args.args[0]
+    assert pipeline[0]["$match"] == {
+        "status": {"$in": ["finished", "accepted"]},
+        "day": {"$gte": "2030-01-01", "$lte": "2030-01-31", "$ne": "unknown"},
+    }
+    assert pipeline[1]["$group"] == {"_id": "$day", "revenue": {"$sum": "$revenue"}}
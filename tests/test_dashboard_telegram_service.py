@@ -7,46 +7,45 @@ def telegram_service():
     return TelegramService()
 
 @pytest.mark.asyncio
-@patch("dashboard_api.services.telegram_service.aiohttp.ClientSession.post")
-async def test_send_request(mock_post, telegram_service):
+@patch(
+    "dashboard_api.services.telegram_service.telegram_http.call", new_callable=AsyncMock
+)
+async def test_send_request(mock_call, telegram_service):
     # Success
-    mock_post.return_value.__aenter__.return_value.status = 200
+    mock_call.return_value = {"ok": True, "result": {}}
     await telegram_service._send_request({"chat_id": 123})
-    mock_post.assert_called_once()
+    mock_call.assert_awaited_once_with("sendMessage", {"chat_id": 123})
     
     # Failure
-    mock_post.reset_mock()
-    mock_post.return_value.__aenter__.return_value.status = 400
-    mock_post.return_value.__aenter__.return_value.text = AsyncMock(return_value="error")
+    mock_call.reset_mock()
+    mock_call.return_value = {"ok": False, "error_code": 400, "description": "error"}
     await telegram_service._send_request({"chat_id": 123})
-    mock_post.assert_called_once()
+    mock_call.assert_awaited_once()
     
     # Exception
-    mock_post.reset_mock()
-    mock_post.side_effect = Exception("error")
+    mock_call.reset_mock()
+    mock_call.side_effect = Exception("error")
     await telegram_service._send_request({"chat_id": 123})
 
 @pytest.mark.asyncio
-@patch("dashboard_api.services.telegram_service.aiohttp.ClientSession.get")
-async def test_get_file_url(mock_get, telegram_service):
+@patch("dashboard_api.services.telegram_service.telegram_http")
+async def test_get_file_url(mock_http, telegram_service):
+    mock_http.file_url.side_effect = lambda path: f"https://files/{path}"
+
     # Success
-    mock_get.return_value.__aenter__.return_value.status = 200
-    mock_get.return_value.__aenter__.return_value.json = AsyncMock(return_value={"ok": True, "result": {"file_path": "a/b.jpg"}})
+    mock_http.call = AsyncMock(
+        return_value={"ok": True, "result": {"file_path": "a/b.jpg"}}
+    )
     res = await telegram_service.get_file_url("fid")
-    assert res.endswith("a/b.jpg")
-    
-    # Failure not 200
-    mock_get.return_value.__aenter__.return_value.status = 400
-    mock_get.return_value.__aenter__.return_value.text = AsyncMock(return_value="err")
-    assert await telegram_service.get_file_url("fid") is None
+    assert res == "https://files/a/b.jpg"
+    mock_http.call.assert_awaited_once_with("getFile", {"file_id": "fid"})
     
     # Failure not ok
-    mock_get.return_value.__aenter__.return_value.status = 200
-    mock_get.return_value.__aenter__.return_value.json = AsyncMock(return_value={"ok": False})
+    mock_http.call = AsyncMock(return_value={"ok": False, "error_code": 400})
     assert await telegram_service.get_file_url("fid") is None
     
     # Exception
-    mock_get.side_effect = Exception("err")
+    mock_http.call = AsyncMock(side_effect=Exception("err"))
     assert await telegram_service.get_file_url("fid") is None
 
 @pytest.mark.asyncio
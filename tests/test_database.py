@@ -14,6 +14,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 from domain.enums import ProjectStatus
+from infrastructure.projections import projection
 from infrastructure.repositories.project import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from infrastructure.repositories import (
     PaymentRepository,
@@ -95,7 +96,7 @@ async def test_get_project_by_id_found(project_repo, mock_db):
     result = await project_repo.get_project_by_id(101)
 
     assert result == mock_project
-    mock_db.projects.find_one.assert_called_with({"id": 101})
+    mock_db.projects.find_one.assert_called_with({"id": 101}, None)
 
 
 @pytest.mark.asyncio
@@ -111,10 +112,11 @@ async def test_get_project_by_id_not_found(project_repo, mock_db):
 async def test_update_status(project_repo, mock_db):
     await project_repo.update_status(42, ProjectStatus.ACCEPTED)
 
-    mock_db.projects.update_one.assert_called_once_with(
-        {"id": 42},
-        {"$set": {"status": ProjectStatus.ACCEPTED}},
-    )
+    mock_db.projects.find_one_and_update.assert_called_once()
+    query, pipeline = mock_db.projects.find_one_and_update.call_args.args
+    assert query == {"id": 42}
+    assert pipeline[0] == {"$set": {"status": ProjectStatus.ACCEPTED}}
+    assert pipeline[-1]["$set"]["attention_reason"]["$cond"][1] == "delivery_due"
 
 
 @pytest.mark.asyncio
@@ -135,7 +137,8 @@ async def test_get_projects_by_status(project_repo, mock_db):
 
     assert result == mock_projects
     mock_db.projects.find.assert_called_once_with(
-        {"status": {"$in": [ProjectStatus.PENDING]}, "user_id": 10}
+        {"status": {"$in": [ProjectStatus.PENDING]}, "user_id": 10},
+        projection("projects", "list"),
     )
     mock_cursor.skip.assert_called_once_with(0)
     mock_cursor.limit.assert_called_once_with(DEFAULT_PAGE_SIZE)
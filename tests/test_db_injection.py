@@ -0,0 +1,88 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from aiogram import Router
+from aiogram.dispatcher.event.handler import HandlerObject
+
+from infrastructure.container import DependencyContainer, build_default_container
+from middlewares.db_injection import DbInjectionMiddleware
+
+
+async def project_handler(message, project_repo, withdrawal_service):
+    pass
+
+
+async def plain_handler(message, state):
+    pass
+
+
+@pytest.fixture
+def container():
+    c = DependencyContainer()
+    c.register("project_repo", lambda _: MagicMock(name="project_repo"))
+    c.register("payment_repo", lambda _: MagicMock(name="payment_repo"))
+    c.register("withdrawal_service", lambda _: MagicMock(name="withdrawal_service"))
+    return c
+
+
+def test_dependencies_for_intersects_handler_params(container):
+    handler = HandlerObject(callback=project_handler)
+    assert container.dependencies_for(handler) == {"project_repo", "withdrawal_service"}
+    assert container.dependencies_for(HandlerObject(callback=plain_handler)) == set()
+
+
+def test_resolve_builds_each_instance_once():
+    c = DependencyContainer()
+    provider = MagicMock(side_effect=lambda _: object())
+    c.register("x", provider)
+    assert c.resolve("x") is c.resolve("x")
+    provider.assert_called_once()
+
+
+def test_wire_walks_router_tree(container):
+    root, child = Router(), Router()
+    child.message.register(project_handler)
+    root.include_router(child)
+
+    container.wire(root)
+
+    handler = child.message.handlers[0]
+    assert container._handler_deps[id(handler)] == {
+        "project_repo",
+        "withdrawal_service",
+    }
+
+
+@pytest.mark.asyncio
+async def test_middleware_injects_only_declared(container):
+    middleware = DbInjectionMiddleware(container)
+    next_handler = AsyncMock()
+    existing = MagicMock()
+    data = {
+        "handler": HandlerObject(callback=project_handler),
+        "withdrawal_service": existing,
+    }
+
+    with patch("middlewares.db_injection.Database") as db:
+        db.db = MagicMock()
+        await middleware(next_handler, MagicMock(), data)
+
+    assert "project_repo" in data
+    assert "payment_repo" not in data
+    assert data["withdrawal_service"] is existing
+    next_handler.assert_awaited_once()
+
+
+def test_default_container_covers_previous_keys():
+    assert build_default_container().names == {
+        "project_repo",
+        "payment_repo",
+        "stats_repo",
+        "settings_repo",
+        "ticket_repo",
+        "audit_repo",
+        "team_request_repo",
+        "student_repo",
+        "user_referral_repo",
+        "withdrawal_service",
+    }
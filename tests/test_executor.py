@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+from unittest.mock import MagicMock
+
+from middlewares.executor import UpdateExecutorMiddleware
+
+
+def user_data(user_id):
+    user = MagicMock()
+    user.id = user_id
+    return {"event_from_user": user}
+
+
+@pytest.mark.asyncio
+async def test_same_user_runs_sequentially_in_order():
+    executor = UpdateExecutorMiddleware(max_in_flight=10)
+    order = []
+
+    def make_handler(tag, delay):
+        async def handler(event, data):
+            order.append(f"start-{tag}")
+            await asyncio.sleep(delay)
+            order.append(f"end-{tag}")
+        return handler
+
+    await asyncio.gather(
+        executor(make_handler("a", 0.02), None, user_data(1)),
+        executor(make_handler("b", 0), None, user_data(1)),
+    )
+
+    assert order == ["start-a", "end-a", "start-b", "end-b"]
+    assert executor.snapshot()["lanes"] == 0
+
+
+@pytest.mark.asyncio
+async def test_global_cap_bounds_in_flight():
+    executor = UpdateExecutorMiddleware(max_in_flight=2)
+    peak = 0
+
+    async def handler(event, data):
+        nonlocal peak
+        peak = max(peak, executor.in_flight)
+        await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(executor(handler, None, user_data(uid)) for uid in range(6)))
+
+    assert peak == 2
+    snapshot = executor.snapshot()
+    assert snapshot["processed_total"] == 6
+    assert snapshot["waiting"] == 0
+    assert snapshot["in_flight"] == 0
+    assert snapshot["wait_seconds_max"] > 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_releases_lane():
+    executor = UpdateExecutorMiddleware(max_in_flight=1)
+    release = asyncio.Event()
+
+    async def blocking(event, data):
+        await release.wait()
+
+    first = asyncio.create_task(executor(blocking, None, user_data(1)))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(executor(blocking, None, user_data(1)))
+    await asyncio.sleep(0)
+    assert executor.waiting == 1
+
+    second.cancel()
+    await asyncio.gather(second, return_exceptions=True)
+    assert executor.waiting == 0
+
+    release.set()
+    await first
+    assert executor.snapshot()["lanes"] == 0
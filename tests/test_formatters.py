@@ -133,17 +133,21 @@ def test_format_project_history_pagination():
 # ---------------------------------------------------------------------------
 
 def _categorized(n_new=3, n_ongoing=3, n_hist=3):
-    return {
-        "New / Pending": [_make_project(i) for i in range(1, n_new + 1)],
-        "Offered / Waiting": [],
-        "Ongoing": [_make_project(i) for i in range(100, 100 + n_ongoing)],
-        "History": [_make_history_project(i) for i in range(200, 200 + n_hist)],
-    }
+    return (
+        [{**_make_project(i), "category": "New / Pending"} for i in range(1, n_new + 1)]
+        + [
+            {**_make_project(i), "category": "Ongoing"}
+            for i in range(100, 100 + n_ongoing)
+        ]
+        + [
+            {**_make_history_project(i), "category": "History"}
+            for i in range(200, 200 + n_hist)
+        ]
+    )
 
 
 def test_format_master_report_empty():
-    text, pages = format_master_report({"New / Pending": [], "Offered / Waiting": [],
-                                        "Ongoing": [], "History": []})
+    text, pages = format_master_report([], total=0, counts={})
     assert "لا توجد مشاريع" in text
     assert pages == 1
 
@@ -152,6 +156,7 @@ def test_format_master_report_single_page():
     data = _categorized(n_new=1, n_ongoing=0, n_hist=0)
     text, pages = format_master_report(data)
     assert "#1" in text
+    assert "🆕 1 | 📨 0" in text
     assert pages == 1
 
 
@@ -163,6 +168,18 @@ def test_format_master_report_multi_page():
     assert "صفحة 3/3" in text_p2
 
 
+def test_format_master_report_prefetched_page():
+    data = _categorized(n_new=0, n_ongoing=0, n_hist=2)
+    counts = {"New / Pending": 10, "Offered / Waiting": 0, "Ongoing": 0, "History": 2}
+    text, pages = format_master_report(
+        data, page=2, page_size=5, total=12, counts=counts
+    )
+    assert pages == 3
+    assert "صفحة 3/3" in text
+    assert "🆕 10" in text and "📜 2" in text
+    assert "#200" in text and "#201" in text
+
+
 # ---------------------------------------------------------------------------
 # format_payment_list
 # ---------------------------------------------------------------------------
@@ -0,0 +1,276 @@
+"""
+Keyset pagination: repository page reads walked forwards and backwards
+against a small in-memory collection, plus the cursor-carrying nav keyboard.
+"""
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from domain.pagination import decode_cursor, encode_cursor
+from handlers.admin_routes.views import (
+    _render_history,
+    _render_master_page,
+    _render_payments,
+)
+from handlers.client_routes.views import _render_my_projects
+from infrastructure.repositories.payment import PaymentRepository
+from infrastructure.repositories.project import ProjectRepository
+from keyboards.callbacks import PageCallback
+from utils.pagination import build_nav_keyboard
+
+
+def _matches(doc, query):
+    for field, cond in query.items():
+        value = doc.get(field)
+        if not isinstance(cond, dict):
+            if value != cond:
+                return False
+            continue
+        for op, arg in cond.items():
+            if op == "$in" and value not in arg:
+                return False
+            if op == "$ne" and value == arg:
+                return False
+            if op == "$lt" and not value < arg:
+                return False
+            if op == "$gt" and not value > arg:
+                return False
+    return True
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self._docs = docs
+
+    def sort(self, field, direction):
+        self._docs = sorted(self._docs, key=lambda d: d[field], reverse=direction < 0)
+        return self
+
+    def skip(self, n):
+        self._docs = self._docs[n:]
+        return self
+
+    def limit(self, n):
+        self._docs = self._docs[:n]
+        return self
+
+    async def to_list(self, length=None):
+        return list(self._docs)
+
+
+class FakeCollection:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def find(self, query, projection=None):
+        return FakeCursor([dict(d) for d in self.docs if _matches(d, query)])
+
+    async def count_documents(self, query):
+        return sum(_matches(d, query) for d in self.docs)
+
+    async def estimated_document_count(self):
+        return len(self.docs)
+
+
+class FakeDb:
+    def __init__(self, **collections):
+        for name, docs in collections.items():
+            setattr(self, name, FakeCollection(docs))
+
+
+async def _walk(fetch, limit):
+    """Follows next cursors to the end, then prev cursors back to the start."""
+    pages, page = [], await fetch(limit=limit)
+    pages.append(page)
+    while page.next_cursor:
+        page = await fetch(after=page.next_cursor, limit=limit)
+        pages.append(page)
+    back = [page]
+    while page.prev_cursor:
+        page = await fetch(before=page.prev_cursor, limit=limit)
+        back.append(page)
+    return pages, list(reversed(back))
+
+
+@pytest.mark.asyncio
+async def test_project_pages_cover_all_matches_in_order():
+    projects = [
+        {
+            "id": i,
+            "user_id": 1 if i % 2 else 2,
+            "status": "pending" if i % 3 else "finished",
+        }
+        for i in range(1, 24)
+    ]
+    repo = ProjectRepository(FakeDb(projects=projects))
+    expected = sorted(
+        (p["id"] for p in projects if p["status"] == "pending"), reverse=True
+    )
+
+    async def fetch(**kw):
+        return await repo.get_projects_page(["pending"], **kw)
+
+    forward, backward = await _walk(fetch, limit=5)
+
+    assert [p["id"] for page in forward for p in page.items] == expected
+    assert [[p["id"] for p in page.items] for page in backward] == \
+        [[p["id"] for p in page.items] for page in forward]
+    assert all(page.total == len(expected) for page in forward)
+    assert forward[0].prev_cursor is None and forward[-1].next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_project_page_filters_by_user_and_restarts_on_stale_cursor():
+    projects = [{"id": i, "user_id": 7, "status": "offered"} for i in range(1, 4)]
+    repo = ProjectRepository(FakeDb(projects=projects))
+
+    page = await repo.get_projects_page(["offered"], user_id=7, after="1", limit=5)
+
+    assert [p["id"] for p in page.items] == [3, 2, 1]
+    assert page.prev_cursor is None
+    assert page.restarted
+
+
+@pytest.mark.asyncio
+async def test_payment_pages_put_pending_first_and_join_projects():
+    payments = [
+        {
+            "id": i,
+            "project_id": 100 + i,
+            "status": "pending" if i in (2, 5, 9) else "accepted",
+        }
+        for i in range(1, 12)
+    ]
+    projects = [{"id": 100 + i, "subject_name": f"S{i}"} for i in range(1, 12)]
+    repo = PaymentRepository(FakeDb(payments=payments, projects=projects))
+
+    forward, backward = await _walk(repo.get_page, limit=4)
+
+    ids = [p["id"] for page in forward for p in page.items]
+    assert ids == [9, 5, 2, 11, 10, 8, 7, 6, 4, 3, 1]
+    assert [[p["id"] for p in page.items] for page in backward] == \
+        [[p["id"] for p in page.items] for page in forward]
+    first = forward[0].items[0]
+    assert first["project_name"] == "S9" and first["is_pending"] == 1
+    assert decode_cursor(forward[0].next_cursor) == (0, 11)
+
+
+@pytest.mark.asyncio
+async def test_payment_page_restarts_on_stale_cursor():
+    payments = [
+        {"id": i, "project_id": 100 + i, "status": "accepted"} for i in range(5, 8)
+    ]
+    repo = PaymentRepository(FakeDb(payments=payments, projects=[]))
+
+    page = await repo.get_page(after=encode_cursor(0, 5), limit=5)
+
+    assert [p["id"] for p in page.items] == [7, 6, 5]
+    assert page.restarted
+
+
+def _callback(user_id=1):
+    callback = MagicMock()
+    callback.from_user.id = user_id
+    callback.message.edit_text = AsyncMock()
+    callback.answer = AsyncMock()
+    return callback
+
+
+def _nav_row(callback):
+    markup = callback.message.edit_text.await_args.kwargs["reply_markup"]
+    return markup.inline_keyboard[-2]
+
+
+def _projects_repo(status):
+    return ProjectRepository(FakeDb(projects=[
+        {"id": i, "user_id": 1, "status": status, "subject_name": "S"}
+        for i in range(2, 40)
+    ]))
+
+
+def _payments_repo():
+    return PaymentRepository(FakeDb(
+        payments=[
+            {"id": i, "project_id": i, "status": "accepted"} for i in range(2, 40)
+        ],
+        projects=[],
+    ))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("render, repo, stale", [
+    (_render_history, lambda: _projects_repo("finished"), "2"),
+    (_render_my_projects, lambda: _projects_repo("pending"), "2"),
+    (_render_payments, _payments_repo, encode_cursor(0, 2)),
+])
+async def test_views_relabel_restarted_page_as_first(render, repo, stale):
+    callback = _callback()
+
+    await render(callback, repo(), 6, after=stale)
+
+    nav = _nav_row(callback)
+    assert nav[0].text.startswith("📄 1/")
+    assert PageCallback.unpack(nav[1].callback_data).page == 1
+
+
+def _master_repo():
+    statuses = ["pending"] * 3 + ["offered"] * 4 + ["finished"] * 5
+    return ProjectRepository(FakeDb(projects=[
+        {"id": i, "user_id": 1, "status": status, "subject_name": "S"}
+        for i, status in enumerate(statuses, start=1)
+    ]))
+
+
+@pytest.mark.asyncio
+async def test_master_report_pages_span_categories_in_order():
+    repo = _master_repo()
+
+    pages = [await repo.get_master_report(page=n, page_size=5) for n in range(3)]
+
+    assert [[p["id"] for p in page.items] for page in pages] == \
+        [[3, 2, 1, 7, 6], [5, 4, 12, 11, 10], [9, 8]]
+    assert pages[1].items[1]["category"] == "Offered / Waiting"
+    assert pages[1].items[2]["category"] == "History"
+    assert pages[0].counts == {
+        "New / Pending": 3, "Offered / Waiting": 4, "Ongoing": 0, "History": 5,
+    }
+    assert [page.page for page in pages] == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_master_report_past_the_end_returns_last_page():
+    repo = _master_repo()
+
+    page = await repo.get_master_report(page=7, page_size=5)
+
+    assert [p["id"] for p in page.items] == [9, 8]
+    assert page.page == 2
+
+    callback = _callback()
+    await _render_master_page(callback, repo, page=7)
+    nav = _nav_row(callback)
+    assert PageCallback.unpack(nav[0].callback_data).page == 1  # prev of the last page
+    assert nav[1].text == "📄 3/3"
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(1, 42)) == (1, 42)
+    assert decode_cursor("") is None
+    assert decode_cursor("x.1") is None
+
+
+def test_nav_keyboard_carries_cursors():
+    kb = build_nav_keyboard(
+        "pending", page=1, total_pages=3, next_cursor="40", prev_cursor="46"
+    )
+    prev_btn, _, next_btn = kb.inline_keyboard[0]
+
+    assert PageCallback.unpack(prev_btn.callback_data).before == "46"
+    nxt = PageCallback.unpack(next_btn.callback_data)
+    assert (nxt.page, nxt.after) == (2, "40")
+    assert len(next_btn.callback_data.encode()) <= 64
+
+
+def test_nav_keyboard_keyset_hides_missing_direction():
+    kb = build_nav_keyboard("pending", page=0, total_pages=3, next_cursor="40")
+    assert len(kb.inline_keyboard[0]) == 2  # page indicator + next
@@ -0,0 +1,82 @@
+import io
+import logging
+import time
+
+import structlog
+
+from utils.logger import AsyncLogSink, SamplingProcessor
+
+
+def run(processor, event, method="info", **kw):
+    try:
+        return processor(None, method, {"event": event, **kw})
+    except structlog.DropEvent:
+        return None
+
+
+def test_chatty_events_sampled_per_correlation_id():
+    sampler = SamplingProcessor(sample_rate=0.5)
+    kept = [
+        cid
+        for cid in map(str, range(200))
+        if run(sampler, "Incoming message", correlation_id=cid)
+    ]
+
+    assert 0 < len(kept) < 200
+    # Both lines of an update share the decision.
+    for cid in map(str, range(200)):
+        kept_again = bool(run(sampler, "Update processed", correlation_id=cid))
+        assert kept_again == (cid in kept)
+    assert sampler.dropped["sampled"] == 2 * (200 - len(kept))
+
+
+def test_warnings_and_business_events_never_sampled():
+    sampler = SamplingProcessor(sample_rate=0.0)
+
+    assert run(sampler, "Incoming message", method="warning", correlation_id="x")
+    assert run(sampler, "Payment status updated in DB", correlation_id="x")
+
+
+def test_info_rate_limit():
+    sampler = SamplingProcessor(info_rate_limit=3)
+    results = [run(sampler, "Ticket closed") for _ in range(5)]
+
+    assert sum(r is not None for r in results) <= 4  # may straddle a second boundary
+    assert sampler.dropped["rate_limited"] >= 1
+    assert run(sampler, "boom", method="error")
+
+
+def _record(msg):
+    return logging.LogRecord("t", logging.INFO, __file__, 1, msg, None, None)
+
+
+def test_sink_writes_batches_off_thread():
+    class Stream(io.StringIO):
+        writes = 0
+
+        def write(self, s):
+            Stream.writes += 1
+            return super().write(s)
+
+    stream = Stream()
+    sink = AsyncLogSink(stream, batch_size=100)
+    for i in range(50):
+        sink.emit(_record(f"line {i}"))
+    sink.close()
+
+    assert stream.getvalue().splitlines() == [f"line {i}" for i in range(50)]
+    assert Stream.writes < 50
+
+
+def test_sink_drops_when_queue_full():
+    class SlowStream(io.StringIO):
+        def write(self, s):
+            time.sleep(0.05)
+            return super().write(s)
+
+    sink = AsyncLogSink(SlowStream(), queue_size=2, batch_size=1)
+    for i in range(20):
+        sink.emit(_record(f"line {i}"))
+    sink.close()
+
+    assert sink.dropped()["queue_full"] > 0
@@ -27,12 +27,14 @@ async def test_create_team_request(mock_database, mock_db):
     )
     assert req_id == 1
     mock_db.team_requests.insert_one.assert_called_once()
+    doc = mock_db.team_requests.insert_one.call_args.args[0]
+    assert (doc["course_key"], doc["doctor_key"]) == ("c", "d")
 
 @pytest.mark.asyncio
 async def test_get_by_id(mock_db):
     repo = TeamRequestRepository(mock_db)
     await repo.get_by_id(1)
-    mock_db.team_requests.find_one.assert_called_with({"id": 1})
+    mock_db.team_requests.find_one.assert_called_with({"id": 1}, None)
 
 @pytest.mark.asyncio
 async def test_get_open_teams_for_specialization(mock_db):
@@ -103,6 +105,22 @@ async def test_boolean_checks(mock_db):
     mock_db.team_requests.find_one.return_value = None
     assert await repo.has_join_request(1, 1) is False
 
+
+@pytest.mark.asyncio
+async def test_subject_checks_match_normalized_keys(mock_db):
+    repo = TeamRequestRepository(mock_db)
+    mock_db.team_requests.find_one.return_value = None
+
+    await repo.has_global_open_team_for_subject("  Data  Structures ", "د. أحمد")
+    query = mock_db.team_requests.find_one.call_args.args[0]
+    assert query["course_key"] == "data structures"
+    assert query["doctor_key"] == "د. احمد"
+
+    await repo.has_active_involvement_for_course(1, "DATA structures")
+    query = mock_db.team_requests.find_one.call_args.args[0]
+    assert query["course_key"] == "data structures"
+    assert "course_name" not in query
+
 @pytest.mark.asyncio
 async def test_reject_all_pending_joins(mock_db):
     repo = TeamRequestRepository(mock_db)
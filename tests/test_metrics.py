@@ -0,0 +1,74 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.methods import SendMessage
+from prometheus_client import REGISTRY
+
+from middlewares.metrics import HandlerMetricsMiddleware, TelegramApiMetricsMiddleware
+from utils.metrics import handle_metrics, instrument_repository
+
+
+def sample(name, labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class FakeRepo:
+    table = "fake"
+
+    async def get_thing(self, thing_id):
+        return {"id": thing_id}
+
+
+async def some_handler(message):
+    pass
+
+
+@pytest.mark.asyncio
+async def test_instrumented_repository_times_coroutines():
+    labels = {"repository": "FakeRepo", "method": "get_thing"}
+    before = sample("bot_mongo_duration_seconds_count", labels)
+    repo = instrument_repository(FakeRepo())
+
+    assert await repo.get_thing(3) == {"id": 3}
+    assert repo.table == "fake"
+    assert sample("bot_mongo_duration_seconds_count", labels) == before + 1
+
+
+@pytest.mark.asyncio
+async def test_handler_metrics_labels_resolved_handler():
+    labels = {
+        "handler": f"{some_handler.__module__}.some_handler",
+        "event_type": "MagicMock",
+    }
+    before = sample("bot_update_duration_seconds_count", labels)
+    middleware = HandlerMetricsMiddleware()
+
+    await middleware(
+        AsyncMock(), MagicMock(), {"handler": HandlerObject(callback=some_handler)}
+    )
+
+    assert sample("bot_update_duration_seconds_count", labels) == before + 1
+
+
+@pytest.mark.asyncio
+async def test_telegram_api_metrics_records_errors():
+    labels = {"method": "SendMessage", "outcome": "error"}
+    before = sample("bot_telegram_api_duration_seconds_count", labels)
+    middleware = TelegramApiMetricsMiddleware()
+
+    with pytest.raises(RuntimeError):
+        await middleware(
+            AsyncMock(side_effect=RuntimeError("boom")),
+            MagicMock(),
+            SendMessage(chat_id=1, text="hi"),
+        )
+
+    assert sample("bot_telegram_api_duration_seconds_count", labels) == before + 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_exposes_text_format():
+    response = await handle_metrics(MagicMock())
+    assert response.status == 200
+    assert b"bot_update_duration_seconds" in response.body
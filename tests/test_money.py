@@ -0,0 +1,28 @@
+from decimal import Decimal
+
+from bson import Decimal128
+
+from domain.money import parse_price
+
+
+def test_numbers_pass_through_as_whole_units():
+    assert parse_price(150) == 150
+    assert parse_price(150.7) == 150
+    assert parse_price(True) is None
+    assert parse_price(None) is None
+
+
+def test_strings():
+    assert parse_price("150") == 150
+    assert parse_price(" 150.0 ") == 150
+    assert parse_price("150,000 SP") == 150000
+    assert parse_price("$100") == 100
+    assert parse_price("free") is None
+    assert parse_price("nan") is None
+
+
+def test_decimals():
+    assert parse_price(Decimal128("150")) == 150
+    assert parse_price(Decimal128("150.75")) == 150
+    assert parse_price(Decimal128("NaN")) is None
+    assert parse_price(Decimal("99.9")) == 99
@@ -1,6 +1,16 @@
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
-from infrastructure.mongo_db import Database, get_db, init_db
+from pymongo import ReadPreference
+
+from infrastructure.mongo_db import (
+    Database,
+    client_options,
+    get_analytics_db,
+    get_db,
+    init_db,
+)
 
 @pytest.fixture
 def reset_db():
@@ -9,45 +19,83 @@ def reset_db():
     Database.client = MagicMock()
     
     mock_db = MagicMock()
-    mock_db.projects.create_index = AsyncMock()
-    mock_db.payments.create_index = AsyncMock()
-    mock_db.fsm_states.create_index = AsyncMock()
-    mock_db.tickets.create_index = AsyncMock()
-    mock_db.tickets.drop_index = AsyncMock()
-    mock_db.tickets.update_many = AsyncMock()
-    mock_db.team_requests.create_index = AsyncMock()
-    
     mock_db.counters.find_one_and_update = AsyncMock()
     
     Database.client.__getitem__.return_value = mock_db
     Database.db = None
-    
-    yield mock_db
+    Database.analytics_db = None
+    Database._id_blocks = {}
+    Database._id_locks = {}
+
+    with patch(
+        "infrastructure.mongo_db.ensure_schema", new_callable=AsyncMock
+    ) as ensure:
+        mock_db.ensure_schema = ensure
+        yield mock_db
     
     Database.client = original_client
     Database.db = original_db
+    Database.analytics_db = None
 
 @pytest.mark.asyncio
 async def test_connect(reset_db):
     await Database.connect()
     assert Database.db is not None
-    reset_db.projects.create_index.assert_called()
-    reset_db.payments.create_index.assert_called()
-    reset_db.tickets.drop_index.assert_called_with("message_thread_id_1")
+    reset_db.ensure_schema.assert_awaited_once_with(reset_db)
+
 
 @pytest.mark.asyncio
-async def test_connect_drop_index_fails(reset_db):
-    reset_db.tickets.drop_index.side_effect = Exception("not found")
-    await Database.connect()
-    assert Database.db is not None
-    reset_db.tickets.create_index.assert_called()
+async def test_connect_creates_secondary_preferred_analytics_handle(reset_db):
+    await get_analytics_db()
+
+    kwargs = Database.client.get_database.call_args.kwargs
+    assert kwargs["read_preference"] == ReadPreference.SECONDARY_PREFERRED
+    assert kwargs["read_concern"].level == "local"
+    assert Database.analytics_db is Database.client.get_database.return_value
+
+
+def test_client_options_from_settings(monkeypatch):
+    from config import settings
+    monkeypatch.setattr(settings, "MONGO_MAX_POOL_SIZE", 20)
+    monkeypatch.setattr(settings, "MONGO_COMPRESSORS", "zstd, snappy")
+    options = client_options()
+    assert options["maxPoolSize"] == 20
+    assert options["compressors"] == ["zstd", "snappy"]
+
+    monkeypatch.setattr(settings, "MONGO_COMPRESSORS", "")
+    assert "compressors" not in client_options()
+
+@pytest.mark.asyncio
+async def test_get_next_sequence(reset_db, monkeypatch):
+    monkeypatch.setattr(Database, "id_block_size", 3)
+    reset_db.counters.find_one_and_update.side_effect = [{"seq": 5}, {"seq": 11}]
+
+    ids = [await Database.get_next_sequence("test_seq") for _ in range(4)]
+
+    # First block is 3..5; the fourth call reserves 9..11 (another replica took 6..8).
+    assert ids == [3, 4, 5, 9]
+    assert reset_db.counters.find_one_and_update.await_count == 2
+    assert reset_db.counters.find_one_and_update.call_args[0][1] == {"$inc": {"seq": 3}}
+
 
 @pytest.mark.asyncio
-async def test_get_next_sequence(reset_db):
-    reset_db.counters.find_one_and_update.return_value = {"seq": 5}
-    seq = await Database.get_next_sequence("test_seq")
-    assert seq == 5
-    reset_db.counters.find_one_and_update.assert_called_once()
+async def test_get_next_sequence_concurrent_callers_share_one_block(
+    reset_db, monkeypatch
+):
+    monkeypatch.setattr(Database, "id_block_size", 50)
+
+    async def slow_reserve(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return {"seq": 50}
+
+    reset_db.counters.find_one_and_update.side_effect = slow_reserve
+
+    ids = await asyncio.gather(
+        *(Database.get_next_sequence("test_seq") for _ in range(10))
+    )
+
+    assert sorted(ids) == list(range(1, 11))
+    reset_db.counters.find_one_and_update.assert_awaited_once()
 
 @pytest.mark.asyncio
 async def test_get_db(reset_db):
@@ -38,7 +38,7 @@ async def test_send_offer_service():
     repo.get_project_by_id.return_value = {"user_id": 123, "subject_name": "S"}
     result = await service.execute(1, "100", "tomorrow", "notes")
     assert result.user_id == 123
-    repo.update_offer.assert_called_once_with(1, "100", "tomorrow")
+    repo.update_offer.assert_called_once_with(1, 100, "tomorrow")
     repo.update_status.assert_called_once_with(1, ProjectStatus.OFFERED)
 
 @pytest.mark.asyncio
@@ -1,7 +1,9 @@
 import pytest
+from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 from infrastructure.repositories.project import ProjectRepository
 from domain.enums import ProjectStatus
+from infrastructure.projections import projection
 
 @pytest.fixture
 def mock_db():
@@ -9,6 +11,14 @@ def mock_db():
     db.projects.insert_one = AsyncMock()
     db.projects.find_one = AsyncMock()
     db.projects.update_one = AsyncMock()
+    db.projects.find_one_and_update = AsyncMock(
+        return_value={
+            "status": "pending",
+            "price": None,
+            "created_at": datetime(2030, 1, 2),
+        }
+    )
+    db.project_daily_stats.bulk_write = AsyncMock()
     db.projects.distinct = AsyncMock()
     
     cursor = MagicMock()
@@ -36,6 +46,7 @@ async def test_add_project(mock_database, mock_db):
     )
     assert project_id == 1
     mock_db.projects.insert_one.assert_called_once()
+    mock_db.project_daily_stats.bulk_write.assert_called_once()
 
 @pytest.mark.asyncio
 async def test_get_project_by_id(mock_db):
@@ -43,41 +54,80 @@ async def test_get_project_by_id(mock_db):
     mock_db.projects.find_one.return_value = {"id": 1}
     result = await repo.get_project_by_id(1)
     assert result["id"] == 1
-    mock_db.projects.find_one.assert_called_with({"id": 1})
+    mock_db.projects.find_one.assert_called_with({"id": 1}, None)
 
 @pytest.mark.asyncio
 async def test_get_user_projects(mock_db):
     repo = ProjectRepository(mock_db)
     result = await repo.get_user_projects(123)
     assert result == [{"id": 1, "created_at": "old"}]
-    mock_db.projects.find.assert_called_with({"user_id": 123})
+    mock_db.projects.find.assert_called_with(
+        {"user_id": 123}, projection("projects", "list")
+    )
 
 @pytest.mark.asyncio
 async def test_update_status(mock_db):
     repo = ProjectRepository(mock_db)
     await repo.update_status(1, "new_status")
-    mock_db.projects.update_one.assert_called_with({"id": 1}, {"$set": {"status": "new_status"}})
+    call = mock_db.projects.find_one_and_update.call_args
+    assert call.args == (
+        {"id": 1},
+        [
+            {"$set": {"status": "new_status"}},
+            {"$unset": ["attention_at", "attention_reason"]},
+        ],
+    )
+    old, new = mock_db.project_daily_stats.bulk_write.call_args.args[0]
+    assert old._filter == {"_id": "2030-01-02|pending"}
+    assert new._filter == {"_id": "2030-01-02|new_status"}
 
 @pytest.mark.asyncio
 async def test_get_projects_by_status(mock_db):
     repo = ProjectRepository(mock_db)
     result = await repo.get_projects_by_status(["s1"], user_id=123)
     assert result == [{"id": 1, "created_at": "old"}]
-    mock_db.projects.find.assert_called_with({"status": {"$in": ["s1"]}, "user_id": 123})
+    mock_db.projects.find.assert_called_with(
+        {"status": {"$in": ["s1"]}, "user_id": 123}, projection("projects", "list")
+    )
 
 @pytest.mark.asyncio
 async def test_update_offer(mock_db):
     repo = ProjectRepository(mock_db)
     await repo.update_offer(1, "100", "tmrw")
-    mock_db.projects.update_one.assert_called_once()
+    mock_db.projects.find_one_and_update.assert_called_once()
+    new = mock_db.project_daily_stats.bulk_write.call_args.args[0][1]
+    assert new._doc["$inc"] == {"count": 1, "revenue": 100.0}
+
+@pytest.mark.asyncio
+async def test_get_master_report(mock_db):
+    repo = ProjectRepository(mock_db)
+    mock_db.projects.count_documents = AsyncMock(side_effect=[2, 0, 0, 7])
+    mock_db.projects.find.return_value.to_list = AsyncMock(
+        return_value=[{"id": 9, "status": "pending"}]
+    )
+    res = await repo.get_master_report(page=0)
+    assert res.total == 9
+    assert res.counts == {
+        "New / Pending": 2,
+        "Offered / Waiting": 0,
+        "Ongoing": 0,
+        "History": 7,
+    }
+    assert res.items[0] == {"id": 9, "status": "pending", "category": "New / Pending"}
+    # Index walks per category; no in-memory sort over a computed field.
+    mock_db.projects.aggregate.assert_not_called()
+    mock_db.projects.find.return_value.sort.assert_called_with("id", -1)
+
 
 @pytest.mark.asyncio
-async def test_get_all_categorized(mock_db):
+async def test_get_master_report_past_last_page(mock_db):
     repo = ProjectRepository(mock_db)
-    mock_db.projects.find.return_value.to_list = AsyncMock(return_value=[])
-    res = await repo.get_all_categorized()
-    assert "New / Pending" in res
-    assert "History" in res
+    mock_db.projects.count_documents = AsyncMock(side_effect=[6, 0, 0, 0])
+    mock_db.projects.find.return_value.to_list = AsyncMock(return_value=[{"id": 1}])
+    res = await repo.get_master_report(page=4, page_size=5)
+    assert [p["id"] for p in res.items] == [1]
+    assert res.page == 1
+    mock_db.projects.find.return_value.skip.assert_called_once_with(5)
 
 @pytest.mark.asyncio
 async def test_get_all_user_ids(mock_db):
@@ -90,4 +140,41 @@ async def test_get_all_user_ids(mock_db):
 async def test_get_urgent_projects(mock_db):
     repo = ProjectRepository(mock_db)
     res = await repo.get_urgent_projects()
-    assert len(res) == 2
+    assert res == [{"id": 1, "created_at": "old"}]
+    query = mock_db.projects.find.call_args.args[0]
+    assert list(query) == ["attention_at"]
+    mock_db.projects.find.return_value.sort.assert_called_with("attention_at", 1)
+    mock_db.projects.aggregate.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch("infrastructure.repositories.project.Database")
+async def test_add_project_is_pending_review(mock_database, mock_db):
+    mock_database.get_next_sequence = AsyncMock(return_value=1)
+    repo = ProjectRepository(mock_db)
+    await repo.add_project(
+        user_id=1, username="u", user_full_name="U", subject="S", tutor="T",
+        deadline="2030-01-01", details="d", attachments=[],
+    )
+    doc = mock_db.projects.insert_one.call_args.args[0]
+    assert doc["attention_at"] == doc["created_at"] + timedelta(hours=6)
+    assert doc["attention_reason"] == "pending_review"
+
+
+@pytest.mark.asyncio
+async def test_update_offer_recomputes_attention(mock_db):
+    repo = ProjectRepository(mock_db)
+    await repo.update_offer(1, "$100", "2030-01-10")
+    pipeline = mock_db.projects.find_one_and_update.call_args.args[1]
+    assert pipeline[0]["$set"]["price"] == 100
+    assert pipeline[0]["$set"]["currency"] == "SYP"
+    assert pipeline[-1]["$set"]["attention_reason"]["$cond"][1] == "delivery_due"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("price", ["soon", -5, None])
+async def test_update_offer_rejects_invalid_price(mock_db, price):
+    repo = ProjectRepository(mock_db)
+    with pytest.raises(ValueError):
+        await repo.update_offer(1, price, "2030-01-10")
+    mock_db.projects.find_one_and_update.assert_not_called()
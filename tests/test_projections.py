@@ -0,0 +1,27 @@
+import pytest
+
+from infrastructure.projections import PROFILES, projection
+
+
+def test_detail_is_whole_document():
+    for collection in PROFILES:
+        assert projection(collection, "detail") is None
+
+
+def test_list_profiles_skip_embedded_arrays():
+    assert "attachments" not in projection("projects", "list")
+    assert "join_requests" not in projection("team_requests", "list")
+    assert "last_message" in projection("tickets", "list")
+
+
+def test_card_profiles_exclude_heavy_arrays():
+    assert projection("projects", "card") == {"attachments": 0}
+    assert projection("team_requests", "card") == {"join_requests": 0}
+    assert projection("tickets", "card") == {"last_message": 0}
+
+
+def test_unknown_profile_raises():
+    with pytest.raises(ValueError):
+        projection("projects", "summary")
+    with pytest.raises(ValueError):
+        projection("payments", "list")
@@ -0,0 +1,188 @@
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.redis import RedisStorage
+from aiogram.types import CallbackQuery, Message
+
+from middlewares.maintenance import MaintenanceMiddleware
+from middlewares.request_context import RequestContext, RequestContextMiddleware
+from middlewares.throttling import DEFAULT_COSTS, LocalTokenBucket, ThrottlingMiddleware
+
+
+def make_redis(script_result):
+    redis = MagicMock()
+    script = AsyncMock(return_value=script_result)
+    redis.register_script.return_value = script
+    return redis, script
+
+
+def make_message(user_id=555, text="hello"):
+    event = MagicMock(spec=Message)
+    event.from_user = MagicMock()
+    event.from_user.id = user_id
+    event.text = text
+    event.answer = AsyncMock()
+    return event
+
+
+def make_callback(data, user_id=555):
+    event = MagicMock(spec=CallbackQuery)
+    event.from_user = MagicMock()
+    event.from_user.id = user_id
+    event.data = data
+    event.answer = AsyncMock()
+    return event
+
+
+@pytest.mark.asyncio
+async def test_context_single_script_call():
+    redis, script = make_redis([1, "0"])
+    middleware = RequestContextMiddleware(redis, capacity=5, refill_per_second=2)
+    handler = AsyncMock(return_value="ok")
+    data = {}
+
+    result = await middleware(handler, make_message(), data)
+
+    assert result == "ok"
+    script.assert_awaited_once()
+    kwargs = script.call_args.kwargs
+    assert kwargs["keys"] == ["throttle:bucket:555", "settings:maintenance_mode"]
+    assert kwargs["args"] == [1.0, 5, 2]
+    assert data["request_context"] == RequestContext(
+        user_id=555, throttled=False, maintenance_mode=False
+    )
+
+
+@pytest.mark.asyncio
+async def test_context_refreshes_fsm_data_ttl():
+    redis, script = make_redis([1, "0"])
+    middleware = RequestContextMiddleware(redis)
+    storage = RedisStorage(MagicMock(), data_ttl=timedelta(minutes=20))
+    state = FSMContext(storage, StorageKey(bot_id=1, chat_id=42, user_id=555))
+
+    await middleware(AsyncMock(), make_message(), {"state": state})
+
+    kwargs = script.call_args.kwargs
+    assert kwargs["keys"][2] == "fsm:42:555:data"
+    assert kwargs["args"][3] == 1200
+
+
+@pytest.mark.asyncio
+async def test_context_reports_throttled_and_missing_flag():
+    redis, _ = make_redis([0, None])
+    middleware = RequestContextMiddleware(redis)
+    data = {}
+
+    await middleware(AsyncMock(), make_message(), data)
+
+    assert data["request_context"].throttled is True
+    assert data["request_context"].maintenance_mode is None
+
+
+@pytest.mark.asyncio
+async def test_context_redis_failure_fails_open():
+    redis = MagicMock()
+    redis.register_script.return_value = AsyncMock(side_effect=ConnectionError("down"))
+    middleware = RequestContextMiddleware(redis)
+    handler = AsyncMock(return_value="ok")
+    data = {}
+
+    assert await middleware(handler, make_message(), data) == "ok"
+    assert data["request_context"].throttled is False
+    assert data["request_context"].maintenance_mode is None
+
+
+@pytest.mark.asyncio
+async def test_local_bucket_rejects_flood_without_redis():
+    redis, script = make_redis([1, "0"])
+    middleware = RequestContextMiddleware(redis, capacity=1, refill_per_second=0.001)
+    data = {}
+
+    # Local capacity is 2x the Redis one: two requests pass, the third is local.
+    for _ in range(3):
+        data = {}
+        await middleware(AsyncMock(), make_message(), data)
+
+    assert script.await_count == 2
+    assert data["request_context"].throttled is True
+
+
+def test_costs_prefer_longest_callback_prefix():
+    def cost(data):
+        return DEFAULT_COSTS.cost_for(make_callback(data), "callback_query")
+
+    assert cost("page:pending:2") == 0.5
+    assert cost("pay:confirm:7") == 2.0
+    assert cost("menu:help") == 1.0
+    assert DEFAULT_COSTS.cost_for(make_message(), "edited_message") == 0.0
+
+
+def test_local_token_bucket_refills():
+    bucket = LocalTokenBucket(capacity=2, refill_per_second=1000)
+    assert bucket.consume(1, 2)
+    assert bucket.consume(2, 2)  # independent per key
+
+
+@pytest.mark.asyncio
+async def test_throttling_drops_and_answers_callbacks():
+    throttle = ThrottlingMiddleware()
+    handler = AsyncMock()
+    callback = make_callback("page:pending:2")
+    data = {
+        "request_context": RequestContext(555, throttled=True, maintenance_mode=False)
+    }
+
+    assert await throttle(handler, callback, data) is None
+    handler.assert_not_called()
+    callback.answer.assert_awaited_once_with()
+
+
+@pytest.mark.asyncio
+async def test_throttling_passes_when_allowed():
+    throttle = ThrottlingMiddleware()
+    handler = AsyncMock(return_value="ok")
+    data = {
+        "request_context": RequestContext(555, throttled=False, maintenance_mode=False)
+    }
+
+    assert await throttle(handler, make_message(), data) == "ok"
+
+
+@pytest.mark.asyncio
+async def test_maintenance_uses_cached_flag():
+    settings_repo = MagicMock()
+    settings_repo.get_maintenance_mode = AsyncMock()
+    middleware = MaintenanceMiddleware()
+    event = make_message()
+    handler = AsyncMock()
+    data = {
+        "request_context": RequestContext(555, throttled=False, maintenance_mode=True),
+        "settings_repo": settings_repo,
+    }
+
+    assert await middleware(handler, event, data) is None
+    event.answer.assert_awaited_once()
+    settings_repo.get_maintenance_mode.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_maintenance_cache_miss_reads_mongo_and_caches():
+    settings_repo = MagicMock()
+    settings_repo.get_maintenance_mode = AsyncMock(return_value=False)
+    redis = MagicMock()
+    redis.set = AsyncMock()
+    middleware = MaintenanceMiddleware(redis)
+    handler = AsyncMock(return_value="ok")
+    data = {
+        "request_context": RequestContext(555, throttled=False, maintenance_mode=None),
+        "settings_repo": settings_repo,
+    }
+
+    assert await middleware(handler, make_message(), data) == "ok"
+    settings_repo.get_maintenance_mode.assert_awaited_once()
+    redis.set.assert_awaited_once()
+    assert redis.set.call_args[0][:2] == ("settings:maintenance_mode", "0")
@@ -0,0 +1,99 @@
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+from domain.enums import ProjectStatus
+from infrastructure.rollups import (
+    price_value, reconcile_daily_stats, record_transition, rollup_day, rollup_ops,
+)
+
+CREATED = datetime(2030, 1, 2, 23, 30)
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self._docs = list(docs)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self._docs:
+            raise StopAsyncIteration
+        return self._docs.pop(0)
+
+
+def test_price_value():
+    assert price_value(200) == 200.0
+    assert price_value(99.5) == 99.5
+    assert price_value("150") == 150.0
+    assert price_value("150 SP") == 0.0
+    assert price_value(True) == 0.0
+    assert price_value(None) == 0.0
+
+
+def test_rollup_day():
+    assert rollup_day(CREATED) == "2030-01-02"
+    assert rollup_day("2030-01-02T10:00:00Z") == "2030-01-02"
+    assert rollup_day(None) == "unknown"
+
+
+def test_new_project_increments_one_bucket():
+    (op,) = rollup_ops(CREATED, new=(ProjectStatus.PENDING, None))
+    assert op._filter == {"_id": "2030-01-02|pending"}
+    assert op._doc["$inc"] == {"count": 1, "revenue": 0.0}
+    assert op._doc["$setOnInsert"] == {"day": "2030-01-02", "status": "pending"}
+
+
+def test_transition_moves_between_buckets():
+    old, new = rollup_ops(
+        CREATED, old=("offered", 100), new=(ProjectStatus.ACCEPTED, 100)
+    )
+    assert (old._filter["_id"], old._doc["$inc"]) == (
+        "2030-01-02|offered",
+        {"count": -1, "revenue": -100.0},
+    )
+    assert (new._filter["_id"], new._doc["$inc"]) == (
+        "2030-01-02|accepted",
+        {"count": 1, "revenue": 100.0},
+    )
+
+
+def test_unchanged_state_writes_nothing():
+    assert (
+        rollup_ops(CREATED, old=("accepted", 100), new=(ProjectStatus.ACCEPTED, 100.0))
+        == []
+    )
+
+
+@pytest.mark.asyncio
+async def test_record_transition_swallows_errors():
+    db = MagicMock()
+    db.project_daily_stats.bulk_write = AsyncMock(side_effect=Exception("down"))
+    await record_transition(db, CREATED, new=("pending", None))
+    db.project_daily_stats.bulk_write.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_reconcile_rewrites_only_drifted_buckets():
+    db = MagicMock()
+    pending = {"day": "2030-01-02", "status": "pending"}
+    accepted = {"day": "2030-01-02", "status": "accepted"}
+    db.projects.aggregate.return_value = _Cursor([
+        {"_id": pending, "count": 2, "revenue": 0},
+        {"_id": accepted, "count": 1, "revenue": 100},
+    ])
+    rollups = db.project_daily_stats
+    rollups.find.return_value = _Cursor([
+        {"_id": "2030-01-02|pending", "count": 2, "revenue": 0.0},
+        {"_id": "2030-01-02|accepted", "count": 2, "revenue": 200.0},
+        {"_id": "2030-01-01|offered", "count": 0, "revenue": 0.0},
+    ])
+    rollups.bulk_write = AsyncMock()
+
+    assert await reconcile_daily_stats(db) == 2
+
+    ops = rollups.bulk_write.await_args.args[0]
+    assert ops[0]._filter == {"_id": "2030-01-02|accepted"}
+    assert ops[0]._doc["count"] == 1
+    assert ops[1]._filter == {"_id": "2030-01-01|offered"}
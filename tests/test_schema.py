@@ -0,0 +1,326 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from bson import Decimal128
+
+from infrastructure import schema
+from infrastructure.schema import INDEXES, SCHEMA_VERSION, IndexSpec, ensure_schema
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self._docs = list(docs)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self._docs:
+            raise StopAsyncIteration
+        return self._docs.pop(0)
+
+
+def make_db(meta=None, existing=None, collection_infos=None):
+    """Fake db whose collections are created on first access (item or attribute)."""
+    existing = existing or {}
+    collections = {}
+
+    def collection(name):
+        if name not in collections:
+            coll = MagicMock()
+            coll.find_one = AsyncMock(return_value=meta)
+            coll.update_one = AsyncMock()
+            coll.update_many = AsyncMock()
+            coll.bulk_write = AsyncMock()
+            coll.find.return_value.limit.return_value.to_list = AsyncMock(
+                return_value=[]
+            )
+            coll.drop_index = AsyncMock()
+            coll.index_information = AsyncMock(return_value={})
+            coll.create_indexes = AsyncMock(
+                side_effect=lambda models: [m.document["name"] for m in models]
+            )
+            coll.list_indexes = MagicMock(
+                side_effect=lambda: _Cursor(
+                    {"name": n} for n in existing.get(name, ["_id_"])
+                )
+            )
+            collections[name] = coll
+        return collections[name]
+
+    class _Db:
+        __getitem__ = staticmethod(collection)
+        __getattr__ = staticmethod(collection)
+
+    db = _Db()
+    infos = MagicMock()
+    infos.to_list = AsyncMock(return_value=list(collection_infos or []))
+    db.list_collections = AsyncMock(return_value=infos)
+    db.create_collection = AsyncMock()
+    return db, collections
+
+
+def test_index_names_match_mongodb_defaults():
+    assert IndexSpec("projects", "id").name == "id_1"
+    assert IndexSpec("projects", [("created_at", -1)]).name == "created_at_-1"
+    assert IndexSpec("t", [("user_id", 1), ("status", 1)]).name == "user_id_1_status_1"
+
+
+@pytest.mark.asyncio
+async def test_current_version_skips_everything():
+    db, collections = make_db(meta={"_id": "schema", "version": SCHEMA_VERSION})
+
+    assert await ensure_schema(db) is False
+    assert set(collections) == {"schema_meta"}
+    collections["schema_meta"].update_one.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_newer_stored_version_is_left_alone():
+    db, collections = make_db(meta={"_id": "schema", "version": SCHEMA_VERSION + 1})
+
+    assert await ensure_schema(db) is False
+    collections["schema_meta"].update_one.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_fresh_database_applies_migrations_and_indexes():
+    db, collections = make_db(meta=None)
+
+    assert await ensure_schema(db) is True
+
+    collections["tickets"].update_many.assert_awaited_once()
+    created = {
+        (name, model.document["name"])
+        for name, coll in collections.items()
+        for call in coll.create_indexes.await_args_list
+        for model in call.args[0]
+    }
+    assert created == {(spec.collection, spec.name) for spec in INDEXES}
+    last = collections["schema_meta"].update_one.await_args_list[-1]
+    assert last.args[1]["$set"]["version"] == SCHEMA_VERSION
+
+
+@pytest.mark.asyncio
+async def test_only_missing_indexes_and_migrations_applied():
+    migration = AsyncMock()
+    existing = {spec.collection: [] for spec in INDEXES}
+    for spec in INDEXES:
+        if spec.collection != "payments":
+            existing[spec.collection].append(spec.name)
+    db, collections = make_db(
+        meta={
+            "_id": "schema",
+            "version": 0,
+            "applied_migrations": ["tickets_sparse_thread_id"],
+        },
+        existing=existing,
+    )
+    schema.MIGRATIONS.append(schema.Migration("new_one", migration))
+    try:
+        await ensure_schema(db)
+    finally:
+        schema.MIGRATIONS.pop()
+
+    migration.assert_awaited_once_with(db)
+    collections["tickets"].update_many.assert_not_called()
+    assert collections["payments"].create_indexes.await_count == 1
+    collections["projects"].create_indexes.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_bucket_messages_migration():
+    from domain.entities import MESSAGE_BUCKET_SIZE
+
+    db, collections = make_db()
+    messages = [
+        {"sender": "user", "text": str(i)} for i in range(MESSAGE_BUCKET_SIZE + 2)
+    ]
+    ticket = {"_id": "a", "ticket_id": 7, "messages": messages}
+    db.tickets.find = MagicMock(return_value=_Cursor([ticket]))
+    db.ticket_messages.replace_one = AsyncMock()
+
+    await schema._tickets_bucket_messages(db)
+
+    buckets = [call.args[1] for call in db.ticket_messages.replace_one.await_args_list]
+    assert [(b["bucket"], b["count"]) for b in buckets] == [
+        (0, MESSAGE_BUCKET_SIZE),
+        (1, 2),
+    ]
+    assert buckets[1]["messages"][-1]["seq"] == MESSAGE_BUCKET_SIZE + 1
+    update = db.tickets.update_one.await_args.args[1]
+    assert update["$set"]["message_count"] == MESSAGE_BUCKET_SIZE + 2
+    assert update["$set"]["last_message"]["text"] == str(MESSAGE_BUCKET_SIZE + 1)
+    assert update["$unset"] == {"messages": ""}
+
+
+@pytest.mark.asyncio
+async def test_team_request_keys_migration():
+    db, collections = make_db()
+    db.team_requests.find = MagicMock(return_value=_Cursor([
+        {"_id": "a", "course_name": " Data Structures", "doctor_name": "أحمد"},
+    ]))
+
+    await schema._team_requests_match_keys(db)
+
+    update = db.team_requests.update_one.await_args.args[1]
+    assert update["$set"] == {"course_key": "data structures", "doctor_key": "احمد"}
+    db.team_requests.drop_index.assert_awaited_once_with("course_name_1_status_1")
+
+
+def _audit_db(infos, legacy_batches=()):
+    db, collections = make_db(collection_infos=infos)
+    legacy = db["audit_logs_legacy"]
+    legacy.find.return_value.limit.return_value.to_list = AsyncMock(
+        side_effect=list(legacy_batches) + [[]]
+    )
+    legacy.delete_many = AsyncMock()
+    legacy.count_documents = AsyncMock(return_value=0)
+    legacy.drop = AsyncMock()
+    db.audit_logs.rename = AsyncMock()
+    db.audit_logs.insert_many = AsyncMock()
+    db.audit_logs.distinct = AsyncMock(return_value=[])
+    return db, legacy
+
+
+@pytest.mark.asyncio
+async def test_audit_timeseries_migration_fresh_database():
+    db, legacy = _audit_db([])
+
+    await schema._audit_logs_timeseries(db)
+
+    kwargs = db.create_collection.await_args.kwargs
+    assert kwargs["timeseries"]["timeField"] == "created_at"
+    assert kwargs["timeseries"]["metaField"] == "entity_id"
+    assert kwargs["expireAfterSeconds"] > 0
+    db.audit_logs.rename.assert_not_called()
+    legacy.drop.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_audit_timeseries_migration_copies_regular_collection():
+    from datetime import datetime, timezone
+    from bson import ObjectId
+
+    oid = ObjectId.from_datetime(datetime(2030, 1, 2, tzinfo=timezone.utc))
+    created = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    batch = [
+        {"_id": 1, "id": "a", "entity_id": 5, "created_at": created},
+        {"_id": 2, "id": "b", "entity_id": 5, "created_at": "2030-01-03T10:00:00Z"},
+        {"_id": oid, "id": "c", "entity_id": 5, "created_at": "yesterday"},
+    ]
+    db, legacy = _audit_db([{"name": "audit_logs", "type": "collection"}], [batch])
+
+    await schema._audit_logs_timeseries(db)
+
+    db.audit_logs.rename.assert_awaited_once_with("audit_logs_legacy")
+    db.create_collection.assert_awaited_once()
+    copied = db.audit_logs.insert_many.await_args.args[0]
+    assert [doc["_id"] for doc in copied] == [1, 2, oid]
+    assert copied[0] == batch[0]
+    assert copied[1]["created_at"] == datetime(2030, 1, 3, 10, tzinfo=timezone.utc)
+    assert copied[1]["created_at_raw"] == "2030-01-03T10:00:00Z"
+    assert copied[2]["created_at"] == oid.generation_time
+    legacy.delete_many.assert_awaited_once_with({"_id": {"$in": [1, 2, oid]}})
+    legacy.drop.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_audit_timeseries_migration_resumes_copy():
+    db, legacy = _audit_db([
+        {"name": "audit_logs", "type": "timeseries"},
+        {"name": "audit_logs_legacy", "type": "collection"},
+    ])
+
+    await schema._audit_logs_timeseries(db)
+
+    db.create_collection.assert_not_called()
+    legacy.drop.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_audit_timeseries_migration_skips_already_copied_batch():
+    batch = [{"_id": 1, "id": "a"}, {"_id": 2, "id": "b"}]
+    db, legacy = _audit_db([
+        {"name": "audit_logs", "type": "timeseries"},
+        {"name": "audit_logs_legacy", "type": "collection"},
+    ], [batch])
+    db.audit_logs.distinct = AsyncMock(return_value=[1])
+
+    await schema._audit_logs_timeseries(db)
+
+    assert [doc["_id"] for doc in db.audit_logs.insert_many.await_args.args[0]] == [2]
+    legacy.delete_many.assert_awaited_once_with({"_id": {"$in": [1, 2]}})
+
+
+@pytest.mark.asyncio
+async def test_audit_timeseries_migration_keeps_non_empty_legacy():
+    db, legacy = _audit_db([
+        {"name": "audit_logs", "type": "timeseries"},
+        {"name": "audit_logs_legacy", "type": "collection"},
+    ])
+    legacy.count_documents = AsyncMock(return_value=3)
+
+    await schema._audit_logs_timeseries(db)
+
+    legacy.drop.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_projects_numeric_price_migration(monkeypatch):
+    reconcile = AsyncMock()
+    monkeypatch.setattr(schema, "reconcile_daily_stats", reconcile)
+    db, collections = make_db()
+    db.projects.find.return_value.limit.return_value.to_list = AsyncMock(
+        side_effect=[
+            [
+                {"_id": "a", "price": "50,000"},
+                {"_id": "b", "price": 99.6},
+                {"_id": "c", "price": "soon"},
+                {"_id": "d", "price": Decimal128("150")},
+            ],
+            [],
+        ]
+    )
+
+    await schema._projects_numeric_price(db)
+
+    ops = db.projects.bulk_write.await_args.args[0]
+    assert [op._doc["$set"] for op in ops] == [
+        {"price": 50000, "currency": "SYP"},
+        {"price": 99, "currency": "SYP"},
+        {"price": None, "price_raw": "soon"},
+        {"price": 150, "currency": "SYP"},
+    ]
+    db.projects.update_many.assert_awaited_once()
+    reconcile.assert_awaited_once_with(db)
+
+
+@pytest.mark.asyncio
+async def test_background_migrations_run_outside_ensure_schema():
+    background, startup = AsyncMock(), AsyncMock()
+    db, collections = make_db(
+        meta={
+            "_id": "schema",
+            "version": 0,
+            "applied_migrations": [m.name for m in schema.MIGRATIONS],
+        }
+    )
+    schema.MIGRATIONS.extend([
+        schema.Migration("late_backfill", background, background=True),
+        schema.Migration("early_fix", startup),
+    ])
+    try:
+        await ensure_schema(db)
+        startup.assert_awaited_once_with(db)
+        background.assert_not_called()
+
+        await schema.run_background_migrations(db)
+    finally:
+        del schema.MIGRATIONS[-2:]
+
+    background.assert_awaited_once_with(db)
+    assert startup.await_count == 1
+    recorded = [
+        c.args[1] for c in collections["schema_meta"].update_one.await_args_list
+    ]
+    assert {"$addToSet": {"applied_migrations": "late_backfill"}} in recorded
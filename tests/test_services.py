@@ -181,10 +181,10 @@ async def test_send_offer_service_updates_and_returns_result(mock_project_repo):
     result = await SendOfferService(mock_project_repo).execute(
         proj_id=1, price="50,000", delivery="2030-06-01", notes="—"
     )
-    mock_project_repo.update_offer.assert_called_once_with(1, "50,000", "2030-06-01")
+    mock_project_repo.update_offer.assert_called_once_with(1, 50000, "2030-06-01")
     mock_project_repo.update_status.assert_called_once_with(1, ProjectStatus.OFFERED)
     assert result.user_id == 7
-    assert result.price == "50,000"
+    assert result.price == 50000
 
 
 @pytest.mark.asyncio
@@ -1,6 +1,9 @@
 import pytest
 from unittest.mock import AsyncMock, MagicMock
-from infrastructure.repositories.settings import SettingsRepository
+from infrastructure.repositories.settings import (
+    CachedSettingsRepository,
+    SettingsRepository,
+)
 
 @pytest.fixture
 def mock_db():
@@ -34,3 +37,35 @@ async def test_set_maintenance_mode(mock_db):
         {"$set": {"maintenance_mode": True}},
         upsert=True,
     )
+
+
+@pytest.mark.asyncio
+async def test_cached_settings_serves_snapshot(mock_db):
+    mock_db.settings.find_one.return_value = {"maintenance_mode": True}
+    repo = CachedSettingsRepository(SettingsRepository(mock_db), ttl=60)
+
+    assert await repo.get_maintenance_mode() is True
+    assert await repo.get_maintenance_mode() is True
+    mock_db.settings.find_one.assert_awaited_once()
+
+    repo.invalidate()
+    await repo.get_maintenance_mode()
+    assert mock_db.settings.find_one.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_settings_write_publishes(mock_db):
+    redis = MagicMock()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    redis.pipeline.return_value = pipe
+    repo = CachedSettingsRepository(SettingsRepository(mock_db), redis)
+
+    await repo.set_maintenance_mode(True)
+
+    mock_db.settings.update_one.assert_awaited_once()
+    pipe.set.assert_called_once_with("settings:maintenance_mode", "1", ex=15)
+    pipe.publish.assert_called_once_with("settings:invalidate", "1")
+    # Local snapshot is updated without another read
+    assert await repo.get_maintenance_mode() is True
+    mock_db.settings.find_one.assert_not_called()
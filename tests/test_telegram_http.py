@@ -0,0 +1,97 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from utils.telegram_http import TelegramHTTPClient
+
+
+class _Response:
+    def __init__(self, body, status=200):
+        self.status = status
+        self._body = body
+
+    async def json(self, content_type=None):
+        if isinstance(self._body, str):
+            raise ValueError("not json")
+        return self._body
+
+    async def text(self):
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def make_client(*replies, **kwargs):
+    client = TelegramHTTPClient(**kwargs)
+    client._token = "tok"
+    client._session = MagicMock(closed=False)
+    client._session.post = MagicMock(side_effect=list(replies))
+    return client
+
+
+@pytest.mark.asyncio
+async def test_call_posts_json_to_method_url():
+    client = make_client(_Response({"ok": True, "result": 1}))
+
+    assert await client.call("sendMessage", {"chat_id": 1}) == {"ok": True, "result": 1}
+    url = client._session.post.call_args.args[0]
+    assert url == "https://api.telegram.org/bottok/sendMessage"
+    assert client._session.post.call_args.kwargs == {"json": {"chat_id": 1}}
+
+
+@pytest.mark.asyncio
+@patch("utils.telegram_http.asyncio.sleep", new_callable=AsyncMock)
+async def test_call_retries_after_rate_limit(mock_sleep):
+    limited = {"ok": False, "error_code": 429, "parameters": {"retry_after": 3}}
+    client = make_client(_Response(limited, 429), _Response({"ok": True}))
+
+    assert await client.call("sendMessage", {"chat_id": 1}) == {"ok": True}
+    mock_sleep.assert_awaited_once_with(3)
+    assert client._session.post.call_count == 2
+
+
+@pytest.mark.asyncio
+@patch("utils.telegram_http.asyncio.sleep", new_callable=AsyncMock)
+async def test_call_gives_up_on_long_or_repeated_rate_limits(mock_sleep):
+    long_wait = {"ok": False, "parameters": {"retry_after": 600}}
+    client = make_client(_Response(long_wait, 429))
+    assert await client.call("sendMessage") == long_wait
+    mock_sleep.assert_not_awaited()
+
+    limited = {"ok": False, "parameters": {"retry_after": 1}}
+    client = make_client(*[_Response(limited, 429) for _ in range(3)], max_retries=2)
+    assert await client.call("sendMessage") == limited
+    assert client._session.post.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_call_uploads_files_and_wraps_non_json_errors(tmp_path):
+    archive = tmp_path / "backup.tar.gz"
+    archive.write_bytes(b"data")
+    client = make_client(_Response("Bad Gateway", 502))
+
+    reply = await client.call(
+        "sendDocument", {"chat_id": 1}, files={"document": archive}
+    )
+
+    assert reply == {"ok": False, "error_code": 502, "description": "Bad Gateway"}
+    assert "data" in client._session.post.call_args.kwargs
+
+
+@pytest.mark.asyncio
+async def test_start_and_close():
+    client = TelegramHTTPClient()
+    with pytest.raises(RuntimeError):
+        client.session
+
+    client.start("tok")
+    assert client.running
+    # Uploads / downloads are bounded per read, not in total.
+    assert client.session.timeout.total is None
+    assert client.session.timeout.sock_read == client.read_timeout
+    assert client.file_url("a/b.jpg") == "https://api.telegram.org/file/bottok/a/b.jpg"
+    await client.close()
+    assert not client.running
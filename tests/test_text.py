@@ -0,0 +1,21 @@
+from domain.text import normalize_key
+
+
+def test_case_and_whitespace():
+    assert normalize_key("  Data \t Structures ") == "data structures"
+    assert normalize_key("DATA STRUCTURES") == normalize_key("data structures")
+
+
+def test_arabic_letter_forms_unified():
+    assert normalize_key("أحمد") == normalize_key("احمد") == normalize_key("إحمد")
+    assert normalize_key("مكتبة") == normalize_key("مكتبه")
+    assert normalize_key("على") == normalize_key("علي")
+
+
+def test_tashkeel_and_tatweel_stripped():
+    assert normalize_key("مُقَرَّر") == "مقرر"
+    assert normalize_key("عـــلم") == "علم"
+
+
+def test_regex_metacharacters_are_plain_text():
+    assert normalize_key(".*") == ".*"
@@ -1,5 +1,6 @@
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
+from domain.entities import MESSAGE_BUCKET_SIZE
 from infrastructure.repositories.ticket import TicketRepository
 from domain.enums import TicketStatus
 
@@ -10,6 +11,9 @@ def mock_db():
     db.tickets.find_one = AsyncMock()
     db.tickets.update_one = AsyncMock()
     db.tickets.count_documents = AsyncMock(return_value=1)
+    db.tickets.find_one_and_update = AsyncMock(return_value={"message_count": 1})
+    db.ticket_messages.insert_one = AsyncMock()
+    db.ticket_messages.update_one = AsyncMock()
     
     cursor = MagicMock()
     cursor.sort.return_value = cursor
@@ -30,7 +34,12 @@ async def test_create_ticket(mock_database, mock_db):
     mock_db.tickets.insert_one.assert_called_once()
     args, _ = mock_db.tickets.insert_one.call_args
     assert args[0]["user_id"] == 123
-    assert args[0]["messages"][0]["text"] == "Hello"
+    assert args[0]["message_count"] == 1
+    assert args[0]["last_message"]["text"] == "Hello"
+    assert "messages" not in args[0]
+    bucket = mock_db.ticket_messages.insert_one.call_args.args[0]
+    assert (bucket["ticket_id"], bucket["bucket"], bucket["count"]) == (1, 0, 1)
+    assert bucket["messages"][0]["seq"] == 0
 
 @pytest.mark.asyncio
 async def test_get_ticket_by_id(mock_db):
@@ -59,23 +68,61 @@ async def test_get_all_active_tickets(mock_db):
     assert count == 1
     assert len(tickets) == 1
 
+
+def _bucket_cursor(mock_db, total):
+    """ticket_messages.find returning the requested buckets of `total` messages."""
+    def find(query, projection):
+        buckets = query["bucket"]["$in"]
+        docs = [
+            {
+                "messages": [
+                    {"seq": seq}
+                    for seq in range(
+                        b * MESSAGE_BUCKET_SIZE,
+                        min(total, (b + 1) * MESSAGE_BUCKET_SIZE),
+                    )
+                ]
+            }
+            for b in buckets
+        ]
+        cursor = MagicMock()
+        cursor.to_list = AsyncMock(return_value=docs)
+        return cursor
+    mock_db.ticket_messages.find = MagicMock(side_effect=find)
+
 @pytest.mark.asyncio
 async def test_get_recent_messages(mock_db):
     repo = TicketRepository(mock_db)
-    # no messages
+    # no ticket
     mock_db.tickets.find_one.return_value = None
     res = await repo.get_recent_messages(1)
     assert res == []
-    
-    # some messages
-    mock_db.tickets.find_one.return_value = {"messages": [1, 2, 3]}
+
+    mock_db.tickets.find_one.return_value = {"message_count": 3}
+    _bucket_cursor(mock_db, 3)
     res = await repo.get_recent_messages(1, page=0, page_size=2)
-    assert res == [3, 2]
+    assert [m["seq"] for m in res] == [2, 1]
+    res = await repo.get_recent_messages(1, page=1, page_size=2)
+    assert [m["seq"] for m in res] == [0]
+    assert await repo.get_recent_messages(1, page=2, page_size=2) == []
+
+
+@pytest.mark.asyncio
+async def test_get_recent_messages_reads_only_overlapping_buckets(mock_db):
+    repo = TicketRepository(mock_db)
+    total = MESSAGE_BUCKET_SIZE * 3 + 5
+    _bucket_cursor(mock_db, total)
+
+    res = await repo.get_recent_messages(1, page=0, page_size=10, total=total)
+    assert [m["seq"] for m in res] == list(range(total - 1, total - 11, -1))
+    query = mock_db.ticket_messages.find.call_args.args[0]
+    assert query == {"ticket_id": 1, "bucket": {"$in": [2, 3]}}
+    mock_db.tickets.find_one.assert_not_called()
 
 @pytest.mark.asyncio
 async def test_get_message_count(mock_db):
     repo = TicketRepository(mock_db)
-    mock_db.tickets.find_one.return_value = {"messages": [1, 2]}
+    mock_db.tickets.find_one.return_value = {"message_count": 2}
     assert await repo.get_message_count(1) == 2
     
     mock_db.tickets.find_one.return_value = None
@@ -90,8 +137,25 @@ async def test_set_thread_id(mock_db):
 @pytest.mark.asyncio
 async def test_add_message(mock_db):
     repo = TicketRepository(mock_db)
+    mock_db.tickets.find_one_and_update.return_value = {
+        "message_count": MESSAGE_BUCKET_SIZE + 1
+    }
+    await repo.add_message(1, sender="user", text="hello")
+
+    query, update = mock_db.ticket_messages.update_one.call_args.args
+    assert query == {"ticket_id": 1, "bucket": 1}
+    assert update["$push"]["messages"]["seq"] == MESSAGE_BUCKET_SIZE
+    assert mock_db.ticket_messages.update_one.call_args.kwargs["upsert"] is True
+    last = mock_db.tickets.update_one.call_args.args[1]["$set"]["last_message"]
+    assert last["text"] == "hello"
+
+
+@pytest.mark.asyncio
+async def test_add_message_unknown_ticket(mock_db):
+    repo = TicketRepository(mock_db)
+    mock_db.tickets.find_one_and_update.return_value = None
     await repo.add_message(1, sender="user", text="hello")
-    mock_db.tickets.update_one.assert_called_once()
+    mock_db.ticket_messages.update_one.assert_not_called()
 
 @pytest.mark.asyncio
 async def test_close_reopen_ticket(mock_db):
@@ -219,8 +219,10 @@ async def test_read_helpers(ticket_service, mock_ticket_repo):
     mock_ticket_repo.get_closed_tickets.assert_called_once_with(1)
     
     await ticket_service.get_conversation_history(1)
-    mock_ticket_repo.get_recent_messages.assert_called_once_with(1, page=0, page_size=10)
-    
+    mock_ticket_repo.get_recent_messages.assert_called_once_with(
+        1, page=0, page_size=10, total=None
+    )
+
     await ticket_service.get_message_count(1)
     mock_ticket_repo.get_message_count.assert_called_once_with(1)
     
@@ -0,0 +1,68 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from aiogram.dispatcher.event.bases import UNHANDLED
+from aiogram.types import CallbackQuery
+
+from middlewares.tracing import CallbackTracingMiddleware
+from utils.tracing import CallbackTracer, make_trace
+
+
+def make_callback(data="page:pending:1", user_id=555):
+    event = MagicMock(spec=CallbackQuery)
+    event.from_user = MagicMock()
+    event.from_user.id = user_id
+    event.data = data
+    return event
+
+
+def test_ring_buffer_keeps_most_recent():
+    tracer = CallbackTracer(buffer_size=3)
+    for i in range(5):
+        tracer.record(make_trace(i, f"d{i}", 0.0, "handled"))
+
+    assert [t.user_id for t in tracer.recent()] == [2, 3, 4]
+    assert [t.user_id for t in tracer.recent(2)] == [3, 4]
+
+
+def test_sampling_and_opt_in():
+    tracer = CallbackTracer(sample_rate=0.0)
+    assert tracer.should_record(1) is False
+
+    tracer.enable_user(1)
+    assert tracer.should_record(1) is True
+    tracer.disable_user(1)
+    assert tracer.should_record(1) is False
+
+    assert CallbackTracer(sample_rate=1.0).should_record(2) is True
+
+
+@pytest.mark.asyncio
+async def test_unsampled_callback_is_not_recorded():
+    tracer = CallbackTracer(sample_rate=0.0)
+    middleware = CallbackTracingMiddleware(tracer)
+    handler = AsyncMock(return_value="ok")
+
+    assert await middleware(handler, make_callback(), {}) == "ok"
+    assert tracer.recent() == []
+
+
+@pytest.mark.asyncio
+async def test_records_outcome_for_traced_user():
+    tracer = CallbackTracer(sample_rate=0.0)
+    tracer.enable_user(555)
+    middleware = CallbackTracingMiddleware(tracer)
+
+    await middleware(AsyncMock(return_value=UNHANDLED), make_callback("stale:1"), {})
+    with pytest.raises(ValueError):
+        await middleware(
+            AsyncMock(side_effect=ValueError("boom")),
+            make_callback("pay:confirm:2"),
+            {},
+        )
+
+    traces = tracer.recent()
+    assert [(t.data, t.outcome) for t in traces] == [
+        ("stale:1", "unhandled"),
+        ("pay:confirm:2", "ValueError"),
+    ]
@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from utils.webhook import SECRET_HEADER, WebhookIngestor
+
+UPDATE_PAYLOAD = {
+    "update_id": 1,
+    "message": {
+        "message_id": 10,
+        "date": 0,
+        "chat": {"id": 5, "type": "private"},
+        "from": {"id": 5, "is_bot": False, "first_name": "T"},
+        "text": "hi",
+    },
+}
+
+
+def make_request(payload, secret="s3cret"):
+    request = MagicMock()
+    request.headers = {SECRET_HEADER: secret} if secret is not None else {}
+    request.json = AsyncMock(return_value=payload)
+    return request
+
+
+@pytest.fixture
+def ingestor():
+    dp = MagicMock()
+    dp.feed_update = AsyncMock()
+    return WebhookIngestor(MagicMock(), dp, secret="s3cret", queue_size=1, max_tasks=2)
+
+
+@pytest.mark.asyncio
+async def test_rejects_invalid_secret(ingestor):
+    response = await ingestor.handle(make_request(UPDATE_PAYLOAD, secret="wrong"))
+    assert response.status == 401
+    assert ingestor.queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_enqueues_and_acknowledges(ingestor):
+    response = await ingestor.handle(make_request(UPDATE_PAYLOAD))
+    assert response.status == 200
+    assert ingestor.queue.qsize() == 1
+
+
+@pytest.mark.asyncio
+async def test_full_queue_returns_503(ingestor):
+    await ingestor.handle(make_request(UPDATE_PAYLOAD))
+    response = await ingestor.handle(make_request(UPDATE_PAYLOAD))
+    assert response.status == 503
+
+
+@pytest.mark.asyncio
+async def test_malformed_payload_is_acknowledged(ingestor):
+    response = await ingestor.handle(make_request({"not": "an update"}))
+    assert response.status == 200
+    assert ingestor.queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_workers_feed_dispatcher(ingestor):
+    await ingestor.start()
+    await ingestor.handle(make_request(UPDATE_PAYLOAD))
+    await asyncio.wait_for(ingestor.queue.join(), timeout=1)
+    await ingestor.stop()
+
+    ingestor.dp.feed_update.assert_awaited_once()
+    assert ingestor.dp.feed_update.call_args[0][1].update_id == 1
+
+
+@pytest.mark.asyncio
+async def test_blocked_update_does_not_stall_others():
+    release = asyncio.Event()
+    fed = []
+
+    async def feed_update(bot, update):
+        fed.append(update.update_id)
+        if update.update_id == 1:
+            await release.wait()
+
+    dp = MagicMock()
+    dp.feed_update = feed_update
+    ingestor = WebhookIngestor(
+        MagicMock(), dp, secret="s3cret", queue_size=10, max_tasks=2
+    )
+    await ingestor.start()
+    for update_id in (1, 2, 3):
+        await ingestor.handle(make_request({**UPDATE_PAYLOAD, "update_id": update_id}))
+
+    # Update 1 blocks; 2 and 3 still run through the second slot.
+    for _ in range(20):
+        await asyncio.sleep(0)
+    assert fed == [1, 2, 3]
+
+    release.set()
+    await asyncio.wait_for(ingestor.queue.join(), timeout=1)
+    await ingestor.stop()
@@ -79,6 +79,10 @@ MSG_STATS_REPORT = _msgs["messages"]["stats_report"]
 MSG_MAINTENANCE_ON = _msgs["messages"]["maintenance_on"]
 MSG_MAINTENANCE_OFF = _msgs["messages"]["maintenance_off"]
 MSG_MAINTENANCE_ACTIVE = _msgs["messages"]["maintenance_active"]
+MSG_TRACE_ENABLED = _msgs["messages"]["trace_enabled"]
+MSG_TRACE_DISABLED = _msgs["messages"]["trace_disabled"]
+MSG_TRACE_USAGE = _msgs["messages"]["trace_usage"]
+MSG_TRACES_EMPTY = _msgs["messages"]["traces_empty"]
 MSG_GENERIC_ERROR = _msgs["messages"]["generic_error"]
 MSG_GENERIC_ERROR_SHORT = _msgs["messages"]["generic_error_short"]
 MSG_PERMISSION_DENIED = _msgs["messages"]["permission_denied"]
@@ -124,6 +128,8 @@ CMD_ADMIN = _msgs["commands"]["admin"]
 CMD_STATS = _msgs["commands"]["stats"]
 CMD_MAINTENANCE_ON = _msgs["commands"]["maintenance_on"]
 CMD_MAINTENANCE_OFF = _msgs["commands"]["maintenance_off"]
+CMD_TRACE = _msgs["commands"]["trace"]
+CMD_TRACES = _msgs["commands"]["traces"]
 
 # --- MENU BUTTONS ---
 BTN_NEW_PROJECT = _msgs["buttons"]["new_project"]
@@ -4,6 +4,10 @@ Formatters
 All list-returning formatters produce a (text, total_pages) tuple so every
 caller can attach the standard pagination keyboard.  Single-item formatters
 (e.g. format_admin_notification) are unchanged.
+
+List formatters accept either the full list (sliced here) or, when
+``total`` is passed, a single page already fetched by a keyset-paged
+repository read.
 """
 from __future__ import annotations
 
@@ -26,6 +30,17 @@ from utils.pagination import paginate, PAGE_SIZE
 _SEP = "━━━━━━━━━━━━━"
 
 
+def _page_of(
+    items: list, page: int, page_size: int, total: int | None
+) -> tuple[list, int, int, int]:
+    """(page_items, total_pages, clamped_page, total) for either input shape."""
+    if total is None:
+        slice_, total_pages, page = paginate(items, page, page_size)
+        return slice_, total_pages, page, len(items)
+    total_pages = max(1, -(-total // page_size))
+    return items, total_pages, max(0, min(page, total_pages - 1)), total
+
+
 # ---------------------------------------------------------------------------
 # Date / time helper
 # ---------------------------------------------------------------------------
@@ -68,6 +83,7 @@ def format_project_list(
     title: str = "📂 قائمة المشاريع",
     page: int = 0,
     page_size: int = PAGE_SIZE,
+    total: int | None = None,
 ) -> tuple[str, int]:
     """Standard paginated list for Pending or Ongoing projects.
 
@@ -76,8 +92,7 @@ def format_project_list(
     if not projects:
         return "لا توجد مشاريع. ✅", 1
 
-    slice_, total_pages, page = paginate(projects, page, page_size)
-    total = len(projects)
+    slice_, total_pages, page, total = _page_of(projects, page, page_size, total)
 
     header = f"**{title}**\n{_SEP}\nإجمالي: {total} | صفحة {page + 1}/{total_pages}\n"
     lines = [header]
@@ -102,6 +117,7 @@ def format_project_history(
     projects: list,
     page: int = 0,
     page_size: int = PAGE_SIZE,
+    total: int | None = None,
 ) -> tuple[str, int]:
     """History list with icons based on status.
 
@@ -110,8 +126,7 @@ def format_project_history(
     if not projects:
         return "السجل فارغ. 📭", 1
 
-    slice_, total_pages, page = paginate(projects, page, page_size)
-    total = len(projects)
+    slice_, total_pages, page, total = _page_of(projects, page, page_size, total)
 
     header = f"📜 **سجل المشاريع:**\n{_SEP}\nإجمالي: {total} | صفحة {page + 1}/{total_pages}\n"
     lines = [header]
@@ -132,41 +147,53 @@ def format_project_history(
 # Admin – master report (all categories flattened)
 # ---------------------------------------------------------------------------
 
+_MASTER_META = {
+    "New / Pending":     {"icon": "🆕", "label": "طلب جديد"},
+    "Offered / Waiting": {"icon": "📨", "label": "عرض مرسل"},
+    "Ongoing":           {"icon": "🚀", "label": "جارٍ"},
+    "History":           {"icon": "📜", "label": "أرشيف"},
+}
+
+
 def format_master_report(
-    categorized_data: dict,
+    projects: list,
     page: int = 0,
     page_size: int = PAGE_SIZE,
+    total: int | None = None,
+    counts: dict | None = None,
 ) -> tuple[str, int]:
     """Paginated all-projects report.
 
+    ``projects`` are display rows carrying a ``category`` key, as returned
+    by ``ProjectRepository.get_master_report``; ``counts`` maps each
+    category to its size for the summary line.
+
     Returns (text, total_pages).
     """
-    meta = {
-        "New / Pending":     {"icon": "🆕", "label": "طلب جديد"},
-        "Offered / Waiting": {"icon": "📨", "label": "عرض مرسل"},
-        "Ongoing":           {"icon": "🚀", "label": "جارٍ"},
-        "History":           {"icon": "📜", "label": "أرشيف"},
-    }
-
-    flat: list[tuple[dict, dict]] = []
-    for key, projects in categorized_data.items():
-        cfg = meta.get(key, {"icon": "🔹", "label": key})
+    if counts is None:
+        counts = {}
         for item in projects:
-            flat.append((cfg, item))
+            counts[item["category"]] = counts.get(item["category"], 0) + 1
 
-    total = len(flat)
-    if total == 0:
+    if not projects:
         return f"📑 **تقارير المشاريع الشاملة**\n{_SEP}\n_لا توجد مشاريع حالياً._", 1
 
-    slice_, total_pages, page = paginate(flat, page, page_size)
+    slice_, total_pages, page, total = _page_of(projects, page, page_size, total)
 
+    summary = " | ".join(
+        f"{cfg['icon']} {counts.get(key, 0)}" for key, cfg in _MASTER_META.items()
+    )
     header = (
         f"📑 **تقارير المشاريع الشاملة**\n{_SEP}\n"
+        f"{summary}\n"
         f"إجمالي: {total} | صفحة {page + 1}/{total_pages}\n"
     )
     lines: list[str] = [header]
 
-    for cfg, item in slice_:
+    for item in slice_:
+        cfg = _MASTER_META.get(
+            item["category"], {"icon": "🔹", "label": item["category"]}
+        )
         p_id = item["id"]
         sub  = escape_md(item.get("subject_name", "—"))
         u_id = item.get("user_id")
@@ -201,6 +228,7 @@ def format_payment_list(
     payments: list,
     page: int = 0,
     page_size: int = PAGE_SIZE,
+    total: int | None = None,
 ) -> tuple[str, int]:
     """Paginated payment history log.
 
@@ -209,8 +237,7 @@ def format_payment_list(
     if not payments:
         return "سجل المدفوعات فارغ. 📭", 1
 
-    slice_, total_pages, page = paginate(payments, page, page_size)
-    total = len(payments)
+    slice_, total_pages, page, total = _page_of(payments, page, page_size, total)
 
     header = f"💰 **سجل المدفوعات**\n{_SEP}\nإجمالي: {total} | صفحة {page + 1}/{total_pages}\n"
     lines = [header]
@@ -228,6 +255,7 @@ def format_student_projects(
     projects: list,
     page: int = 0,
     page_size: int = PAGE_SIZE,
+    total: int | None = None,
 ) -> tuple[str, int]:
     """Paginated student project list.
 
@@ -236,8 +264,7 @@ def format_student_projects(
     if not projects:
         return MSG_NO_PROJECTS, 1
 
-    slice_, total_pages, page = paginate(projects, page, page_size)
-    total = len(projects)
+    slice_, total_pages, page, total = _page_of(projects, page, page_size, total)
 
     header = (
         f"📋 **حالة مشاريعك:**\n{_SEP}\n"
@@ -275,6 +302,7 @@ def format_offer_list(
     offers: list,
     page: int = 0,
     page_size: int = PAGE_SIZE,
+    total: int | None = None,
 ) -> tuple[str, int]:
     """Paginated list of pending offers for the student.
 
@@ -283,8 +311,7 @@ def format_offer_list(
     if not offers:
         return MSG_NO_OFFERS, 1
 
-    slice_, total_pages, page = paginate(offers, page, page_size)
-    total = len(offers)
+    slice_, total_pages, page, total = _page_of(offers, page, page_size, total)
 
     header = (
         f"🎁 **العروض المعلقة**\n{_SEP}\n"
@@ -1,32 +1,256 @@
+"""
+Logging setup
+=============
+structlog on top of stdlib logging, with rendering and IO moved off the
+event loop.
+
+Pipeline
+--------
+1. **On the calling thread** (cheap): context vars, level, logger name,
+   timestamp, exception formatting and :class:`SamplingProcessor`, which
+   drops chatty info-level events before anything is rendered.
+2. ``ProcessorFormatter.wrap_for_formatter`` hands the event dict to
+   stdlib logging; :class:`AsyncLogSink` (the only root handler) puts the
+   record on a bounded queue and returns immediately.
+3. **On the sink thread**: records are rendered (JSON, or the console
+   renderer on a TTY) and written in batches — one ``write`` + ``flush``
+   per batch — so a slow log drain never blocks update handling.
+
+Nothing is dropped silently: events removed by sampling, by the info
+rate limit or because the queue was full are counted in
+``bot_log_events_dropped_total{reason}`` and summarised in a periodic
+"Log events dropped" warning. Warnings and errors are never sampled.
+"""
+import atexit
 import logging
+import queue
+import random
 import sys
+import threading
+import time
+import zlib
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional, TextIO
+
 import structlog
 from config import settings
+from utils.metrics import LOG_EVENTS_DROPPED
+
+# Logged at least once per update; sampled as a pair (see SamplingProcessor).
+CHATTY_EVENTS = frozenset({
+    "Incoming message",
+    "Incoming callback query",
+    "Incoming update",
+    "Update processed",
+})
+
+_SAMPLED_LEVELS = frozenset({"debug", "info"})
+
+
+class SamplingProcessor:
+    """
+    structlog processor that sheds low-value info/debug events.
+
+    * Events in ``chatty_events`` are kept for ``sample_rate`` of updates.
+      The decision hashes ``correlation_id``, so an update's "Incoming …"
+      and "Update processed" lines are kept or dropped together.
+    * At most ``info_rate_limit`` info/debug events per second pass in
+      total (0 disables the limit).
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 1.0,
+        info_rate_limit: int = 0,
+        chatty_events: Iterable[str] = CHATTY_EVENTS,
+    ) -> None:
+        self.sample_rate = sample_rate
+        self.info_rate_limit = info_rate_limit
+        self.chatty_events = frozenset(chatty_events)
+        self.dropped: Counter = Counter()
+        self._window = 0
+        self._window_count = 0
+
+    def _keep_sampled(self, event_dict: Dict[str, Any]) -> bool:
+        if self.sample_rate >= 1:
+            return True
+        correlation_id = event_dict.get("correlation_id")
+        if correlation_id is None:
+            return random.random() < self.sample_rate
+        return (
+            zlib.crc32(str(correlation_id).encode()) % 10_000
+            < self.sample_rate * 10_000
+        )
+
+    def _drop(self, reason: str) -> None:
+        self.dropped[reason] += 1
+        LOG_EVENTS_DROPPED.labels(reason).inc()
+        raise structlog.DropEvent
+
+    def __call__(
+        self, logger: Any, method_name: str, event_dict: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        if method_name not in _SAMPLED_LEVELS:
+            return event_dict
+        chatty = event_dict.get("event") in self.chatty_events
+        if chatty and not self._keep_sampled(event_dict):
+            self._drop("sampled")
+        if self.info_rate_limit:
+            window = int(time.monotonic())
+            if window != self._window:
+                self._window, self._window_count = window, 0
+            self._window_count += 1
+            if self._window_count > self.info_rate_limit:
+                self._drop("rate_limited")
+        return event_dict
+
+
+class AsyncLogSink(logging.Handler):
+    """
+    Root logging handler that renders and writes records on a background
+    thread.
+
+    ``emit`` only enqueues (never blocks); when the queue is full the
+    record is dropped and counted. The worker drains up to ``batch_size``
+    records at a time and writes them with a single ``write`` + ``flush``.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        stream: TextIO,
+        queue_size: int = 10_000,
+        batch_size: int = 256,
+        report_interval: float = 60.0,
+        sampler: Optional[SamplingProcessor] = None,
+    ) -> None:
+        super().__init__()
+        self.stream = stream
+        self.batch_size = batch_size
+        self.report_interval = report_interval
+        self.sampler = sampler
+        self.dropped_queue_full = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._reported: Counter = Counter()
+        self._thread = threading.Thread(target=self._run, name="log-sink", daemon=True)
+        self._thread.start()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped_queue_full += 1
+            LOG_EVENTS_DROPPED.labels("queue_full").inc()
+
+    def _render(self, record: logging.LogRecord) -> str:
+        try:
+            return self.format(record)
+        except Exception:
+            return f"log render error: {record.getMessage()!r}"
+
+    def _run(self) -> None:
+        next_report = time.monotonic() + self.report_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=self.report_interval)
+            except queue.Empty:
+                item = None
+            batch = [] if item is None else [item]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = any(rec is self._STOP for rec in batch)
+            lines = [self._render(rec) for rec in batch if rec is not self._STOP]
+            if lines:
+                try:
+                    self.stream.write("\n".join(lines) + "\n")
+                    self.stream.flush()
+                except Exception:
+                    pass  # Nowhere left to report a broken log stream.
+            if stop:
+                return
+            if time.monotonic() >= next_report:
+                next_report = time.monotonic() + self.report_interval
+                self._report_dropped()
+
+    def dropped(self) -> Dict[str, int]:
+        counts = dict(self.sampler.dropped) if self.sampler is not None else {}
+        counts["queue_full"] = self.dropped_queue_full
+        return counts
+
+    def _report_dropped(self) -> None:
+        counts = Counter(self.dropped())
+        delta = counts - self._reported
+        self._reported = counts
+        if delta:
+            structlog.get_logger(__name__).warning(
+                "Log events dropped", interval_s=self.report_interval, **delta
+            )
+
+    def close(self) -> None:
+        """Flushes everything queued so far and stops the worker."""
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join(timeout=5)
+        super().close()
+
+
+_sink: Optional[AsyncLogSink] = None
+
 
 def setup_logger():
     """
     Configures structlog and standard logging.
     """
-    # Configure standard logging to redirect to structlog if desired,
-    # or just set the root logger level.
-    logging.basicConfig(
-        format="%(message)s",
-        stream=sys.stdout,
-        level=logging.INFO,
-    )
+    global _sink
 
-    processors = [
+    shared_processors = [
         structlog.contextvars.merge_contextvars,
         structlog.stdlib.add_log_level,
         structlog.stdlib.add_logger_name,
         structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
-        structlog.dev.ConsoleRenderer() if sys.stdout.isatty() else structlog.processors.JSONRenderer(),
     ]
-    
+    sampler = SamplingProcessor(
+        sample_rate=settings.LOG_SAMPLE_RATE,
+        info_rate_limit=settings.LOG_INFO_RATE_LIMIT,
+    )
+    renderer = (
+        structlog.dev.ConsoleRenderer()
+        if sys.stdout.isatty()
+        else structlog.processors.JSONRenderer()
+    )
+
+    if _sink is not None:
+        logging.getLogger().removeHandler(_sink)
+        _sink.close()
+    _sink = AsyncLogSink(
+        sys.stdout, queue_size=settings.LOG_QUEUE_SIZE, sampler=sampler
+    )
+    # Third-party stdlib loggers (aiogram, aiohttp, …) go through the
+    # same sink and get the shared processors applied on the sink thread.
+    _sink.setFormatter(structlog.stdlib.ProcessorFormatter(
+        processors=[
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            renderer,
+        ],
+        foreign_pre_chain=shared_processors,
+    ))
+    root = logging.getLogger()
+    root.handlers = [_sink]
+    root.setLevel(logging.INFO)
+    atexit.register(_sink.close)
+
     structlog.configure(
-        processors=processors,
+        processors=shared_processors + [
+            sampler,
+            structlog.processors.StackInfoRenderer(),
+            structlog.processors.format_exc_info,
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+        ],
         logger_factory=structlog.stdlib.LoggerFactory(),
         wrapper_class=structlog.stdlib.BoundLogger,
         cache_logger_on_first_use=True,
@@ -34,4 +258,3 @@ def setup_logger():
 
     # Return a structlog bound logger
     return structlog.get_logger()
-
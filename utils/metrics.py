@@ -0,0 +1,126 @@
+"""
+Prometheus metrics
+==================
+Process-wide metric definitions plus the small helpers that feed them.
+Scraped from ``GET /metrics`` on a separate aiohttp listener
+(``METRICS_HOST:METRICS_PORT``, localhost by default), never on the
+public keep-alive / webhook server.
+
+Metrics
+-------
+bot_update_duration_seconds{handler, event_type}      – whole inner chain + handler
+bot_update_wait_seconds                                – executor queueing time
+bot_updates_in_flight / bot_updates_waiting            – executor gauges
+bot_mongo_duration_seconds{repository, method}         – per repository method
+bot_redis_duration_seconds{operation}                  – per Redis call site
+bot_telegram_api_duration_seconds{method, outcome}     – per Bot API method
+bot_log_events_dropped_total{reason}                   – log events shed by utils.logger
+bot_audit_events_total{outcome}                        – audit writes by outcome
+
+Label values are bounded (handler / repository / API method names), so
+cardinality stays fixed no matter how many users or projects exist.
+"""
+import functools
+import inspect
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from aiohttp import web
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+UPDATE_DURATION = Histogram(
+    "bot_update_duration_seconds",
+    "Time spent handling an update, by resolved handler",
+    ["handler", "event_type"],
+)
+UPDATE_WAIT = Histogram(
+    "bot_update_wait_seconds",
+    "Time an update waited in the executor before its handler started",
+)
+UPDATES_IN_FLIGHT = Gauge("bot_updates_in_flight", "Handlers currently running")
+UPDATES_WAITING = Gauge(
+    "bot_updates_waiting", "Updates queued on a user lane or a global slot"
+)
+MONGO_DURATION = Histogram(
+    "bot_mongo_duration_seconds",
+    "MongoDB latency per repository method",
+    ["repository", "method"],
+)
+REDIS_DURATION = Histogram(
+    "bot_redis_duration_seconds",
+    "Redis latency per call site",
+    ["operation"],
+)
+TELEGRAM_API_DURATION = Histogram(
+    "bot_telegram_api_duration_seconds",
+    "Telegram Bot API latency per method",
+    ["method", "outcome"],
+)
+LOG_EVENTS_DROPPED = Counter(
+    "bot_log_events_dropped",
+    "Log events not written, by reason (sampled, rate_limited, queue_full)",
+    ["reason"],
+)
+AUDIT_EVENTS = Counter(
+    "bot_audit_events",
+    "Audit events by write-behind outcome (written, dropped, failed)",
+    ["outcome"],
+)
+
+
+@contextmanager
+def observe_redis(operation: str) -> Iterator[None]:
+    """Times a Redis call (errors included) under ``operation``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        REDIS_DURATION.labels(operation).observe(time.perf_counter() - start)
+
+
+class InstrumentedRepository:
+    """
+    Transparent proxy that times every coroutine method of a repository
+    into ``bot_mongo_duration_seconds``. Non-coroutine attributes are
+    returned untouched.
+    """
+
+    def __init__(self, repo: Any) -> None:
+        self._repo = repo
+        self._name = type(repo).__name__
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._repo, name)
+        if not inspect.iscoroutinefunction(attr):
+            return attr
+        histogram = MONGO_DURATION.labels(self._name, name)
+
+        @functools.wraps(attr)
+        async def timed(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return await attr(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - start)
+
+        # Cache so later lookups skip __getattr__ entirely.
+        self.__dict__[name] = timed
+        return timed
+
+
+def instrument_repository(repo: Any) -> Any:
+    return InstrumentedRepository(repo)
+
+
+async def handle_metrics(request: web.Request) -> web.Response:
+    """aiohttp handler exposing the default registry in text format."""
+    return web.Response(
+        body=generate_latest(), headers={"Content-Type": CONTENT_TYPE_LATEST}
+    )
@@ -3,6 +3,10 @@ Pagination helpers
 ==================
 Generic utilities for slicing lists into fixed-size pages and building the
 shared ⬅️ / 📄 X/N / ➡️ navigation keyboard used throughout the bot.
+
+Views backed by keyset-paged repository reads (``domain.pagination.Page``)
+pass the page's cursors to ``build_nav_keyboard``; the buttons then carry
+the cursor instead of relying on the page number alone.
 """
 from __future__ import annotations
 
@@ -41,10 +45,14 @@ def build_nav_keyboard(
     back_action: Any = MenuAction.back_to_admin,
     builder: InlineKeyboardBuilder | None = None,
     back_callback_data: str | None = None,
+    next_cursor: str | None = None,
+    prev_cursor: str | None = None,
 ) -> types.InlineKeyboardMarkup:
     """
     Build a standard navigation row + back button.
     If 'builder' is provided, append the rows to it.
+    If either cursor is given, the ⬅️ / ➡️ buttons are shown exactly when
+    their cursor is set and carry it in the callback.
 
     ⬅️ السابق  |  📄 X/N  |  التالي ➡️
               ⬅️ رجوع
@@ -53,12 +61,17 @@ def build_nav_keyboard(
         builder = InlineKeyboardBuilder()
 
     nav: list[types.InlineKeyboardButton] = []
+    keyset = next_cursor is not None or prev_cursor is not None
+    has_prev = prev_cursor is not None if keyset else page > 0
+    has_next = next_cursor is not None if keyset else page < total_pages - 1
 
-    if page > 0:
+    if has_prev:
         nav.append(
             types.InlineKeyboardButton(
                 text="⬅️ السابق",
-                callback_data=PageCallback(action=action, page=page - 1).pack(),
+                callback_data=PageCallback(
+                    action=action, page=max(0, page - 1), before=prev_cursor
+                ).pack(),
             )
         )
 
@@ -69,11 +82,13 @@ def build_nav_keyboard(
         )
     )
 
-    if page < total_pages - 1:
+    if has_next:
         nav.append(
             types.InlineKeyboardButton(
                 text="التالي ➡️",
-                callback_data=PageCallback(action=action, page=page + 1).pack(),
+                callback_data=PageCallback(
+                    action=action, page=page + 1, after=next_cursor
+                ).pack(),
             )
         )
 
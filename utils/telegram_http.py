@@ -0,0 +1,176 @@
+"""
+Telegram Bot API – Shared HTTP Client
+=====================================
+One pooled ``aiohttp`` session for the Bot API calls made outside aiogram
+(dashboard notifications and file proxy, backup reports). Calls reuse
+kept-alive connections to api.telegram.org instead of paying a TCP + TLS
+handshake each.
+
+* Connection pool of ``limit`` sockets; idle ones are kept ``keepalive`` s.
+* DNS answers cached for ``dns_ttl`` seconds.
+* Connecting is bounded by ``connect_timeout`` and every socket read by
+  ``read_timeout`` seconds. There is no total limit, so a backup upload
+  or a 20 MB file download can take as long as it keeps making progress;
+  callers that need a hard bound wrap the call in ``asyncio.wait_for``.
+* ``429 Too Many Requests`` is retried after the ``retry_after`` Telegram
+  sends, up to ``max_retries`` times; a longer wait than
+  ``max_retry_wait`` is returned to the caller as a failure instead.
+
+Imports nothing from the project: the backup image copies this file next
+to the ``backup`` package.
+
+Usage
+-----
+::
+
+    telegram_http.start(bot_token)      # dashboard lifespan / backup main
+    reply = await telegram_http.call("sendMessage", {"chat_id": 1, "text": "hi"})
+    ...
+    await telegram_http.close()
+"""
+import asyncio
+import json
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import aiohttp
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+API_BASE = "https://api.telegram.org"
+
+
+class TelegramHTTPClient:
+    def __init__(
+        self,
+        *,
+        limit: int = 20,
+        keepalive: float = 60.0,
+        dns_ttl: int = 300,
+        connect_timeout: float = 10.0,
+        read_timeout: float = 60.0,
+        max_retries: int = 3,
+        max_retry_wait: float = 30.0,
+    ) -> None:
+        self.limit = limit
+        self.keepalive = keepalive
+        self.dns_ttl = dns_ttl
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.max_retry_wait = max_retry_wait
+        self._token: Optional[str] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def running(self) -> bool:
+        return self._session is not None and not self._session.closed
+
+    def start(self, bot_token: str) -> None:
+        """Opens the session; call from inside the event loop that will use it."""
+        if self.running:
+            return
+        self._token = bot_token
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            keepalive_timeout=self.keepalive,
+            ttl_dns_cache=self.dns_ttl,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(
+                total=None,
+                sock_connect=self.connect_timeout,
+                sock_read=self.read_timeout,
+            ),
+        )
+        logger.info("Telegram HTTP client started", pool=self.limit)
+
+    async def close(self) -> None:
+        if self._session is None:
+            return
+        await self._session.close()
+        self._session = None
+        logger.info("Telegram HTTP client closed")
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The pooled session, for requests ``call`` does not cover (file downloads)."""
+        if not self.running:
+            raise RuntimeError("Telegram HTTP client is not started")
+        return self._session
+
+    def file_url(self, file_path: str) -> str:
+        """Download URL for a ``file_path`` returned by ``getFile``."""
+        return f"{API_BASE}/file/bot{self._token}/{file_path}"
+
+    async def call(
+        self,
+        method: str,
+        payload: Optional[Dict[str, Any]] = None,
+        *,
+        files: Optional[Dict[str, Path]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Calls Bot API ``method`` and returns Telegram's JSON reply, which is
+        ``{"ok": False, ...}`` for API errors. ``payload`` is sent as JSON,
+        or as multipart form fields together with ``files`` when given.
+
+        Raises:
+            aiohttp.ClientError, asyncio.TimeoutError: the request itself failed.
+        """
+        url = f"{API_BASE}/bot{self._token}/{method}"
+        attempt = 0
+        while True:
+            if files:
+                with ExitStack() as stack:
+                    # A FormData can only be sent once; rebuild it (and reopen the
+                    # files) per attempt.
+                    form = aiohttp.FormData()
+                    for name, value in (payload or {}).items():
+                        if isinstance(value, (dict, list)):
+                            value = json.dumps(value)
+                        form.add_field(name, str(value))
+                    for name, path in files.items():
+                        form.add_field(
+                            name,
+                            stack.enter_context(path.open("rb")),
+                            filename=path.name,
+                        )
+                    reply = await self._post(url, data=form)
+            else:
+                reply = await self._post(url, json=payload or {})
+
+            retry_after = (reply.get("parameters") or {}).get("retry_after")
+            if (
+                reply.get("ok")
+                or retry_after is None
+                or attempt >= self.max_retries
+                or retry_after > self.max_retry_wait
+            ):
+                return reply
+            attempt += 1
+            logger.warning(
+                "Telegram rate limit, retrying",
+                method=method,
+                retry_after=retry_after,
+                attempt=attempt,
+            )
+            await asyncio.sleep(retry_after)
+
+    async def _post(self, url: str, **kwargs: Any) -> Dict[str, Any]:
+        async with self.session.post(url, **kwargs) as response:
+            try:
+                return await response.json(content_type=None)
+            except ValueError:
+                return {
+                    "ok": False,
+                    "error_code": response.status,
+                    "description": await response.text(),
+                }
+
+
+# One client per process, started by its entry point.
+telegram_http = TelegramHTTPClient()
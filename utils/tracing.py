@@ -0,0 +1,82 @@
+"""
+Callback tracing
+================
+Keeps a bounded, in-memory record of recent callback queries so admins
+can see what users actually pressed without logging every click.
+
+* A fraction ``sample_rate`` of all callbacks is recorded.
+* Callbacks from users an admin opted in (``/trace <user_id> on``) are
+  always recorded **and** logged.
+* Records live in a ring buffer of ``buffer_size`` entries, dumped with
+  ``/traces``.
+
+State is per process: with several replicas, opt-in and dump apply to
+the replica that handles the admin command.
+"""
+import random
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Deque, List, Optional, Set
+
+
+@dataclass(frozen=True)
+class CallbackTrace:
+    at: datetime
+    user_id: int
+    data: Optional[str]
+    duration_ms: float
+    outcome: str  # "handled", "unhandled" or the exception class name
+
+    def format(self) -> str:
+        return (
+            f"{self.at:%H:%M:%S} {self.user_id} {self.data!r} "
+            f"{self.outcome} {self.duration_ms:.0f}ms"
+        )
+
+
+class CallbackTracer:
+    """Sampling decision, per-user opt-in and the ring buffer of traces."""
+
+    def __init__(self, sample_rate: float = 0.0, buffer_size: int = 200) -> None:
+        self.sample_rate = sample_rate
+        self._traces: Deque[CallbackTrace] = deque(maxlen=buffer_size)
+        self._traced_users: Set[int] = set()
+
+    def enable_user(self, user_id: int) -> None:
+        self._traced_users.add(user_id)
+
+    def disable_user(self, user_id: int) -> None:
+        self._traced_users.discard(user_id)
+
+    def is_traced_user(self, user_id: int) -> bool:
+        return user_id in self._traced_users
+
+    @property
+    def traced_users(self) -> List[int]:
+        return sorted(self._traced_users)
+
+    def should_record(self, user_id: int) -> bool:
+        return user_id in self._traced_users or (
+            self.sample_rate > 0 and random.random() < self.sample_rate
+        )
+
+    def record(self, trace: CallbackTrace) -> None:
+        self._traces.append(trace)
+
+    def recent(self, limit: Optional[int] = None) -> List[CallbackTrace]:
+        """Most recent traces, oldest first."""
+        traces = list(self._traces)
+        return traces[-limit:] if limit else traces
+
+
+def make_trace(
+    user_id: int, data: Optional[str], duration: float, outcome: str
+) -> CallbackTrace:
+    return CallbackTrace(
+        at=datetime.now(timezone.utc),
+        user_id=user_id,
+        data=data,
+        duration_ms=duration * 1000,
+        outcome=outcome,
+    )
@@ -0,0 +1,156 @@
+"""
+Webhook ingestion
+=================
+Receives Telegram updates on the keep-alive aiohttp server instead of
+long polling.
+
+Flow per request:
+  1. Telegram POSTs to ``/webhook/<secret>`` with the same secret in the
+     ``X-Telegram-Bot-Api-Secret-Token`` header.
+  2. The update is validated and pushed onto a bounded ``asyncio.Queue``.
+  3. We answer ``200`` immediately — Telegram never waits on a handler.
+  4. A feeder task drains the queue and runs each update in its own
+     task (``Dispatcher.feed_update``), as long polling does — at most
+     ``max_tasks`` at once.
+
+Per-user ordering and the handler concurrency cap are left to
+``UpdateExecutorMiddleware``: an update waiting on its user's lane only
+holds one of the ``max_tasks`` tasks, so a burst from one user cannot
+stall everyone else. ``max_tasks`` only bounds how many updates are
+accepted into the process; once it is reached the queue fills and we
+answer ``503`` so Telegram re-delivers the update later instead of us
+buffering without bound.
+"""
+import asyncio
+import hmac
+from typing import Optional, Set
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+from aiohttp import web
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+class WebhookIngestor:
+    """
+    Bridges aiohttp webhook requests to the aiogram dispatcher.
+
+    Usage in main.py
+    ----------------
+    ::
+
+        ingestor = WebhookIngestor(bot, dp, secret=settings.WEBHOOK_SECRET)
+        ingestor.register(app)
+        await ingestor.start()
+        ...
+        await ingestor.stop()
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        dp: Dispatcher,
+        *,
+        secret: str,
+        queue_size: int = 1000,
+        max_tasks: int = 1000,
+    ) -> None:
+        self.bot = bot
+        self.dp = dp
+        self.secret = secret
+        self.max_tasks = max_tasks
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._slots = asyncio.Semaphore(max_tasks)
+        self._feeder: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def path(self) -> str:
+        return f"/webhook/{self.secret}"
+
+    def register(self, app: web.Application) -> None:
+        """Adds the webhook route to an existing aiohttp application."""
+        app.router.add_post(self.path, self.handle)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        """Validates, enqueues and acknowledges a single update."""
+        header = request.headers.get(SECRET_HEADER, "")
+        if not hmac.compare_digest(header, self.secret):
+            logger.warning("Webhook request with invalid secret token")
+            return web.Response(status=401)
+
+        try:
+            payload = await request.json()
+            update = Update.model_validate(payload, context={"bot": self.bot})
+        except Exception as e:
+            logger.warning("Malformed webhook payload", error=str(e))
+            # 200 so Telegram does not keep re-delivering a payload we can't parse.
+            return web.Response(status=200)
+
+        try:
+            self.queue.put_nowait(update)
+        except asyncio.QueueFull:
+            logger.warning(
+                "Webhook queue full, asking Telegram to retry",
+                update_id=update.update_id,
+                queue_size=self.queue.maxsize,
+            )
+            return web.Response(status=503)
+
+        return web.Response(status=200)
+
+    async def _feed(self) -> None:
+        while True:
+            await self._slots.acquire()
+            try:
+                update: Update = await self.queue.get()
+            except BaseException:
+                self._slots.release()
+                raise
+            task = asyncio.create_task(
+                self._process(update), name=f"webhook_update_{update.update_id}"
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _process(self, update: Update) -> None:
+        try:
+            await self.dp.feed_update(self.bot, update)
+        except Exception as e:
+            # Handler errors are already caught by GlobalErrorHandler;
+            # this only guards the task against anything that escapes it.
+            logger.error(
+                "Error while feeding webhook update",
+                update_id=update.update_id,
+                error=str(e),
+                exc_info=True,
+            )
+        finally:
+            self._slots.release()
+            self.queue.task_done()
+
+    async def start(self) -> None:
+        """Spawns the feeder task."""
+        self._feeder = asyncio.create_task(self._feed(), name="webhook_feeder")
+        logger.info("Webhook feeder started", max_tasks=self.max_tasks, path=self.path)
+
+    async def stop(self, drain_timeout: Optional[float] = 10.0) -> None:
+        """Waits (bounded) for queued updates to finish, then cancels what is left."""
+        if drain_timeout:
+            try:
+                await asyncio.wait_for(self.queue.join(), timeout=drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "Webhook queue not drained before shutdown",
+                    pending=self.queue.qsize(),
+                )
+        tasks = [self._feeder, *self._tasks] if self._feeder else list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._feeder = None
+        self._tasks.clear()